@@ -1,13 +1,15 @@
 import streamlit as st
-import duckdb
 import pandas as pd
-import plotly.express as px
-import numpy as np
 import os
 import json
-import requests
 from datetime import datetime, date
+import uuid
 import dotenv
+from snapshot import DB_PATH, snapshot_version, connect as connect_snapshot
+from result_store import ResultStore
+import charts
+import report_queries
+import query_templates
 # Load environment variables from .env file
 dotenv.load_dotenv()    
 
@@ -17,20 +19,47 @@ st.set_page_config(layout="wide")
 st.title("📊 Employee Reports Dashboard")
 
 
-if 'current_df' not in st.session_state:
-    st.session_state.current_df = pd.DataFrame()
+@st.cache_resource
+def get_result_store():
+    """Result sets shared by all sessions under one memory budget"""
+    return ResultStore(
+        memory_budget_mb=int(os.getenv("RESULT_STORE_BUDGET_MB", "256")),
+        idle_ttl_seconds=int(os.getenv("RESULT_STORE_IDLE_SECONDS", "1800"))
+    )
+
+
+result_store = get_result_store()
 
+# Each session's latest result lives in the shared store; analysis tools re-read it with
+# result_store.get(st.session_state.result_key)
+if 'result_key' not in st.session_state:
+    st.session_state.result_key = uuid.uuid4().hex
 
-db_path = "employee_reports.duckdb"
+
+db_path = DB_PATH
 if not os.path.exists(db_path):
     st.error(f"Database file '{db_path}' not found. Please ensure the database is created first.")
     st.stop()
 
 
+@st.cache_resource(max_entries=1)
+def get_connection(version):
+    """Open the published snapshot; a newly published version is a new file and gets a new connection"""
+    return connect_snapshot(version)
+
+
+def open_cursor():
+    """Cursor on the currently published snapshot"""
+    return get_connection(snapshot_version(db_path)).cursor()
+
+
 try:
-    con = duckdb.connect(db_path, read_only=True)
+    # Each rerun checks the published version and takes a cursor on the matching snapshot
+    snapshot = snapshot_version(db_path)
+    con = get_connection(snapshot).cursor()
     # Test connection
     con.execute("SELECT 1").fetchone()
+    st.caption(f"Data snapshot: {datetime.fromtimestamp(snapshot[1] / 1e9):%Y-%m-%d %H:%M:%S}")
 except Exception as e:
     st.error(f"Failed to connect to database: {e}")
     st.stop()
@@ -61,573 +90,552 @@ except Exception as e:
 
 
 
-tab1, tab2, tab3 = st.tabs(["📋 Predefined Reports", "🔍 Custom Queries", "🤖 AI Query Assistant"])
+tab1, tab2, tab3, tab4 = st.tabs(["📋 Predefined Reports", "🔍 Custom Queries", "🤖 AI Query Assistant", "📈 Charts"])
 
-with tab1:
 
-    report_options = [
-        "Employee Roster",
-        "Exit Report", 
-        "Work Profile",
-        "Experience Summary",
-        "Daily Attendance with Timesheet Verification",
-        "Project Master Report",
-        "Employee Project Summary"
-    ]
+# Each tab is a fragment: interacting with a widget only reruns its own tab
+# against a fresh cursor, not the whole script
 
-    choice = st.selectbox("Select a report", report_options)
+@st.cache_data(max_entries=4)
+def load_filter_options(version):
+    """Distinct employees, departments and projects for the custom query filters"""
+    con = get_connection(version).cursor()
+    try:
+        # Get list of employee names with null handling
+        employee_query = """
+            SELECT DISTINCT "Employee Name" 
+            FROM employee_master 
+            WHERE "Employee Name" IS NOT NULL AND "Employee Name" != ''
+            ORDER BY "Employee Name"
+        """
+        employee_names = [name[0] for name in con.execute(employee_query).fetchall()]
+
+        # Get list of departments with null handling
+        dept_query = """
+            SELECT DISTINCT Department 
+            FROM employee_master 
+            WHERE Department IS NOT NULL AND Department != ''
+            ORDER BY Department
+        """
+        departments = [dept[0] for dept in con.execute(dept_query).fetchall()]
+
+        # Get list of projects with null handling
+        proj_query = """
+            SELECT DISTINCT "Project Name" 
+            FROM timesheets 
+            WHERE "Project Name" IS NOT NULL AND "Project Name" != ''
+            ORDER BY "Project Name"
+        """
+        projects = [proj[0] for proj in con.execute(proj_query).fetchall()]
+
+        return employee_names, departments, projects
+    finally:
+        con.close()
 
 
+@st.cache_data(max_entries=4)
+def load_unbound_values(version):
+    """Distinct business units and designations, which no assistant template can filter on"""
+    con = get_connection(version).cursor()
     try:
-        if choice == "Employee Roster":
-            df = con.execute("SELECT * FROM employee_master").df()
-            if df.empty:
-                st.warning("No employee data found.")
-            else:
-                st.dataframe(df)
-                st.session_state.current_df = df
+        values_query = """
+            SELECT DISTINCT value FROM (
+                SELECT "Business Unit" AS value FROM employee_master
+                UNION ALL
+                SELECT Designation FROM employee_master
+            )
+            WHERE value IS NOT NULL AND value != ''
+        """
+        return [value[0] for value in con.execute(values_query).fetchall()]
+    finally:
+        con.close()
 
-        elif choice == "Exit Report":
-            df = con.execute("SELECT * FROM employee_exit_report").df()
-            if df.empty:
-                st.warning("No exit report data found.")
-            else:
-                st.dataframe(df)
-                st.session_state.current_df = df
 
-        elif choice == "Work Profile":
-            df = con.execute("SELECT * FROM employee_work_profile").df()
-            if df.empty:
-                st.warning("No work profile data found.")
-            else:
-                st.dataframe(df) 
-                st.session_state.current_df = df
+@st.fragment
+def predefined_reports_tab():
+    """Predefined reports"""
+    con = open_cursor()
+    try:
+        report_options = [
+            "Employee Roster",
+            "Exit Report", 
+            "Work Profile",
+            "Experience Summary",
+            "Daily Attendance with Timesheet Verification",
+            "Project Master Report",
+            "Employee Project Summary"
+        ]
 
-        elif choice == "Experience Summary":
-            df = con.execute("SELECT * FROM employee_experience_report").df()
-            if df.empty:
-                st.warning("No experience data found.")
-            else:
-                st.dataframe(df)
-                st.session_state.current_df = df
-
-        elif choice == "Daily Attendance with Timesheet Verification":
-            query = """
-                SELECT
-                    a."Employee Code",
-                    a."Date",
-                    a."Clock-In Time",
-                    a."Clock-Out Time",
-                    a."Total Hours" as "Attendance Hours",
-                    COALESCE(t."Project Name", 'No Project') as "Project Name",
-                    COALESCE(t."Hours Worked", 0) as "Hours Worked"
-                FROM daily_attendance a
-                LEFT JOIN timesheets t
-                ON a."Employee Code" = t."Employee Code" AND a."Date" = t."Date"
-                ORDER BY a."Date", a."Employee Code"
-            """
-            df = con.execute(query).df()
-            if df.empty:
-                st.warning("No attendance data found.")
-            else:
-                st.dataframe(df)
-                st.session_state.current_df = df
+        choice = st.selectbox("Select a report", report_options)
+
+
+        try:
+            if choice == "Employee Roster":
+                df = con.execute(report_queries.table_report_query(choice)).df()
+                if df.empty:
+                    st.warning("No employee data found.")
+                else:
+                    st.dataframe(df)
+                    result_store.put(st.session_state.result_key, df)
+
+            elif choice == "Exit Report":
+                df = con.execute(report_queries.table_report_query(choice)).df()
+                if df.empty:
+                    st.warning("No exit report data found.")
+                else:
+                    st.dataframe(df)
+                    result_store.put(st.session_state.result_key, df)
+
+            elif choice == "Work Profile":
+                df = con.execute(report_queries.table_report_query(choice)).df()
+                if df.empty:
+                    st.warning("No work profile data found.")
+                else:
+                    st.dataframe(df) 
+                    result_store.put(st.session_state.result_key, df)
+
+            elif choice == "Experience Summary":
+                df = con.execute(report_queries.table_report_query(choice)).df()
+                if df.empty:
+                    st.warning("No experience data found.")
+                else:
+                    st.dataframe(df)
+                    result_store.put(st.session_state.result_key, df)
+
+            elif choice == "Daily Attendance with Timesheet Verification":
+                if 'attendance_reconciliation' not in existing_table_names:
+                    st.warning("Reconciliation data not found. Please re-run init_db.py to build it.")
+                else:
+                    # Discrepancy filters run against the pre-aggregated employee-day table
+                    col1, col2 = st.columns(2)
+                    with col1:
+                        only_discrepancies = st.checkbox("Only show discrepancies", value=False)
+                    with col2:
+                        tolerance = st.number_input("Discrepancy tolerance (hours)", min_value=0.0, value=0.5, step=0.25)
+
+                    query, params = report_queries.reconciliation_query(only_discrepancies, tolerance)
+
+                    df = con.execute(query, params).df()
+                    if df.empty:
+                        st.warning("No attendance data found.")
+                    else:
+                        st.dataframe(df)
+                        result_store.put(st.session_state.result_key, df)
             
-        elif choice == "Project Master Report":
-            # Check if timesheets table has data
-            timesheet_count = con.execute("SELECT COUNT(*) FROM timesheets").fetchone()[0]
-            if timesheet_count == 0:
-                st.warning("No timesheet data found.")
-            else:
-                # Comprehensive report about all projects
-                query = """
-                    SELECT 
-                        DISTINCT t."Project ID",
-                        t."Project Name",
-                        COUNT(DISTINCT t."Employee Code") as "Total Employees",
-                        ROUND(SUM(t."Hours Worked"), 2) as "Total Hours",
-                        MIN(t."Date") as "Start Date",
-                        MAX(t."Date") as "Latest Activity Date",
-                        COUNT(DISTINCT t."Date") as "Active Days"
-                    FROM timesheets t
-                    GROUP BY t."Project ID", t."Project Name"
-                    ORDER BY t."Project ID"
-                """
-                
-                # Execute the project summary query
-                project_summary_df = con.execute(query).df()
-                
-                if project_summary_df.empty:
-                    st.warning("No project data found.")
+            elif choice == "Project Master Report":
+                # Check if timesheets table has data
+                timesheet_count = con.execute("SELECT COUNT(*) FROM timesheets").fetchone()[0]
+                if timesheet_count == 0:
+                    st.warning("No timesheet data found.")
                 else:
-                    # Get project details for each project
-                    for i, row in project_summary_df.iterrows():
-                        project_id = row["Project ID"]
-                        st.subheader(f"Project: {row['Project Name']} ({project_id})")
+                    # Comprehensive report about all projects
+                    project_summary_df = con.execute(report_queries.PROJECT_SUMMARY_QUERY).df()
+                
+                    if project_summary_df.empty:
+                        st.warning("No project data found.")
+                    else:
+                        # Get project details for each project
+                        for i, row in project_summary_df.iterrows():
+                            project_id = row["Project ID"]
+                            st.subheader(f"Project: {row['Project Name']} ({project_id})")
                         
-                        # Display project summary
-                        summary_metrics = {
-                            "Total Employees": int(row["Total Employees"]),
-                            "Total Hours": f"{row['Total Hours']:.1f}",
-                            "Start Date": str(row["Start Date"]),
-                            "Latest Activity": str(row["Latest Activity Date"]),
-                            "Active Days": int(row["Active Days"])
-                        }
+                            # Display project summary
+                            summary_metrics = {
+                                "Total Employees": int(row["Total Employees"]),
+                                "Total Hours": f"{row['Total Hours']:.1f}",
+                                "Start Date": str(row["Start Date"]),
+                                "Latest Activity": str(row["Latest Activity Date"]),
+                                "Active Days": int(row["Active Days"])
+                            }
                         
-                        # Show summary metrics in columns
-                        cols = st.columns(len(summary_metrics))
-                        for col, (metric_name, metric_value) in zip(cols, summary_metrics.items()):
-                            col.metric(metric_name, metric_value)
+                            # Show summary metrics in columns
+                            cols = st.columns(len(summary_metrics))
+                            for col, (metric_name, metric_value) in zip(cols, summary_metrics.items()):
+                                col.metric(metric_name, metric_value)
                         
-                        # Get employee details for this project - fixed SQL injection vulnerability
-                        emp_query = """
-                            SELECT 
-                                e."Employee Name",
-                                e."Department",
-                                ROUND(SUM(t."Hours Worked"), 2) as "Total Hours",
-                                COUNT(DISTINCT t."Date") as "Days Worked",
-                                MIN(t."Date") as "First Day",
-                                MAX(t."Date") as "Last Day"
-                            FROM timesheets t
-                            JOIN employee_master e ON t."Employee Code" = e."Employee Code"
-                            WHERE t."Project ID" = ?
-                            GROUP BY e."Employee Name", e."Department"
-                            ORDER BY "Total Hours" DESC
-                        """
-                        project_employees_df = con.execute(emp_query, [project_id]).df()
+                            # Get employee details for this project - fixed SQL injection vulnerability
+                            project_employees_df = con.execute(report_queries.PROJECT_EMPLOYEES_QUERY, [project_id]).df()
                         
-                        # Display employees on this project
-                        if not project_employees_df.empty:
-                            st.dataframe(project_employees_df)
-                        else:
-                            st.info("No employee data found for this project.")
+                            # Display employees on this project
+                            if not project_employees_df.empty:
+                                st.dataframe(project_employees_df)
+                            else:
+                                st.info("No employee data found for this project.")
                         
-                        # Add a separator between projects
-                        st.markdown("---")
+                            # Add a separator between projects
+                            st.markdown("---")
                 
-                # Store for analysis tools
-                st.session_state.current_df = project_summary_df
+                    # Store for analysis tools
+                    result_store.put(st.session_state.result_key, project_summary_df)
             
-        elif choice == "Employee Project Summary":
-            # Check if we have employee data
-            emp_count = con.execute("SELECT COUNT(*) FROM employee_master").fetchone()[0]
-            if emp_count == 0:
-                st.warning("No employee data found.")
-            else:
-                # Comprehensive report about employees and their projects
-                query = """
-                    SELECT
-                        e.*,
-                        COALESCE((SELECT COUNT(DISTINCT t."Project ID") 
-                                 FROM timesheets t 
-                                 WHERE t."Employee Code" = e."Employee Code"), 0) as "Projects Count",
-                        COALESCE((SELECT ROUND(SUM(t."Hours Worked"), 2) 
-                                 FROM timesheets t 
-                                 WHERE t."Employee Code" = e."Employee Code"), 0) as "Total Hours Worked"
-                    FROM employee_master e
-                    ORDER BY e."Employee Code"
-                """
-                
-                # Execute the employee master query with project summary
-                emp_master_df = con.execute(query).df()
-                
-                if emp_master_df.empty:
+            elif choice == "Employee Project Summary":
+                # Check if we have employee data
+                emp_count = con.execute("SELECT COUNT(*) FROM employee_master").fetchone()[0]
+                if emp_count == 0:
                     st.warning("No employee data found.")
                 else:
-                    # Create expandable sections for each employee
-                    for i, row in emp_master_df.iterrows():
-                        emp_code = row["Employee Code"]
-                        emp_name = row["Employee Name"]
+                    # Comprehensive report about employees and their projects, one row per employee
+                    emp_master_df = con.execute(report_queries.EMPLOYEE_PROJECT_SUMMARY_QUERY).df()
+                
+                    if emp_master_df.empty:
+                        st.warning("No employee data found.")
+                    else:
+                        # Create expandable sections for each employee
+                        for i, row in emp_master_df.iterrows():
+                            emp_code = row["Employee Code"]
+                            emp_name = row["Employee Name"]
                         
-                        with st.expander(f"{emp_name} ({emp_code}) - {row['Department']} - {row['Projects Count']} Projects"):
-                            # Show employee details
-                            st.write(f"**Email:** {row.get('Email', 'N/A')}")
-                            st.write(f"**Mobile Number:** {row.get('Mobile Number', 'N/A')}")
-                            st.write(f"**Total Hours:** {row['Total Hours Worked']:.1f}")
+                            with st.expander(f"{emp_name} ({emp_code}) - {row['Department']} - {row['Projects Count']} Projects"):
+                                # Show employee details
+                                st.write(f"**Email:** {row.get('Email', 'N/A')}")
+                                st.write(f"**Mobile Number:** {row.get('Mobile Number', 'N/A')}")
+                                st.write(f"**Total Hours:** {row['Total Hours Worked']:.1f}")
                             
-                            # Get project details for this employee - fixed SQL injection
-                            proj_query = """
-                                SELECT 
-                                    t."Project ID",
-                                    t."Project Name",
-                                    ROUND(SUM(t."Hours Worked"), 2) as "Total Hours",
-                                    COUNT(DISTINCT t."Date") as "Days Worked",
-                                    MIN(t."Date") as "First Day",
-                                    MAX(t."Date") as "Last Day"
-                                FROM timesheets t
-                                WHERE t."Employee Code" = ?
-                                GROUP BY t."Project ID", t."Project Name"
-                                ORDER BY "Total Hours" DESC
-                            """
-                            emp_projects_df = con.execute(proj_query, [emp_code]).df()
+                                # Get project details for this employee - fixed SQL injection
+                                emp_projects_df = con.execute(report_queries.EMPLOYEE_PROJECTS_QUERY, [emp_code]).df()
                             
-                            # Display projects for this employee
-                            if not emp_projects_df.empty:
-                                st.dataframe(emp_projects_df)
-                            else:
-                                st.info("No project assignments found for this employee.")
+                                # Display projects for this employee
+                                if not emp_projects_df.empty:
+                                    st.dataframe(emp_projects_df)
+                                else:
+                                    st.info("No project assignments found for this employee.")
                 
-                # Store for analysis tools
-                st.session_state.current_df = emp_master_df
+                    # Store for analysis tools
+                    result_store.put(st.session_state.result_key, emp_master_df)
             
-    except Exception as e:
-        st.error(f"Error executing query: {e}")
-        st.error(f"Query details: {str(e)}")
+        except Exception as e:
+            st.error(f"Error executing query: {e}")
+            st.error(f"Query details: {str(e)}")
+    finally:
+        con.close()
 
 
-with tab2:
-    st.header("Custom Query Builder")
-    
+@st.fragment
+def custom_queries_tab():
+    """Custom query builder"""
+    con = open_cursor()
     try:
-        # Get list of employee names with null handling
-        employee_query = """
-            SELECT DISTINCT "Employee Name" 
-            FROM employee_master 
-            WHERE "Employee Name" IS NOT NULL AND "Employee Name" != ''
-            ORDER BY "Employee Name"
-        """
-        employee_names_result = con.execute(employee_query).fetchall()
-        employee_names = [name[0] for name in employee_names_result]
-        
-        # Get list of departments with null handling
-        dept_query = """
-            SELECT DISTINCT Department 
-            FROM employee_master 
-            WHERE Department IS NOT NULL AND Department != ''
-            ORDER BY Department
-        """
-        departments_result = con.execute(dept_query).fetchall()
-        departments = [dept[0] for dept in departments_result]
-        
-        # Get list of projects with null handling
-        proj_query = """
-            SELECT DISTINCT "Project Name" 
-            FROM timesheets 
-            WHERE "Project Name" IS NOT NULL AND "Project Name" != ''
-            ORDER BY "Project Name"
-        """
-        projects_result = con.execute(proj_query).fetchall()
-        projects = [proj[0] for proj in projects_result]
-        
-    except Exception as e:
-        st.error(f"Error loading filter options: {e}")
-        employee_names, departments, projects = [], [], []
+        st.header("Custom Query Builder")
     
-    # Create filter columns
-    col1, col2, col3 = st.columns(3)
+        try:
+            # Filter options only change with a new snapshot, so they are cached per version
+            employee_names, departments, projects = load_filter_options(snapshot_version(db_path))
+        except Exception as e:
+            st.error(f"Error loading filter options: {e}")
+            employee_names, departments, projects = [], [], []
     
-    with col1:
-        selected_employees = st.multiselect("Select Employees", options=["All"] + employee_names, default=["All"])
+        # Create filter columns
+        col1, col2, col3 = st.columns(3)
     
-    with col2:
-        selected_departments = st.multiselect("Select Departments", options=["All"] + departments, default=["All"])
+        with col1:
+            selected_employees = st.multiselect("Select Employees", options=["All"] + employee_names, default=["All"])
     
-    with col3:
-        selected_projects = st.multiselect("Select Projects", options=["All"] + projects, default=["All"])
+        with col2:
+            selected_departments = st.multiselect("Select Departments", options=["All"] + departments, default=["All"])
     
-    # Create date range filter
-    col4, col5 = st.columns(2)
-    with col4:
-        start_date = st.date_input("Start Date", value=None)
-    with col5:
-        end_date = st.date_input("End Date", value=None)
+        with col3:
+            selected_projects = st.multiselect("Select Projects", options=["All"] + projects, default=["All"])
     
-    # Report type selection for custom query
-    report_type = st.selectbox(
-        "Select Report Type", 
-        ["Employee Details", "Project Assignments", "Attendance Records", "Timesheet Summary"]
-    )
+        # Create date range filter
+        col4, col5 = st.columns(2)
+        with col4:
+            start_date = st.date_input("Start Date", value=None)
+        with col5:
+            end_date = st.date_input("End Date", value=None)
     
-    # Build the query
-    if st.button("Generate Report", key="custom_query_report"):
-        try:
-            df = pd.DataFrame()  # Initialize empty dataframe
-            
-            if report_type == "Employee Details":
-                query = "SELECT * FROM employee_master WHERE 1=1"
-                params = []
-                
-                if "All" not in selected_employees and selected_employees:
-                    placeholders = ",".join(["?" for _ in selected_employees])
-                    query += f" AND \"Employee Name\" IN ({placeholders})"
-                    params.extend(selected_employees)
-                
-                if "All" not in selected_departments and selected_departments:
-                    placeholders = ",".join(["?" for _ in selected_departments])
-                    query += f" AND Department IN ({placeholders})"
-                    params.extend(selected_departments)
-                
-                df = con.execute(query, params).df()
-                
-            elif report_type == "Project Assignments":
-                query = """
-                    SELECT 
-                        t."Date",
-                        t."Employee Code",
-                        e."Employee Name",
-                        e.Department,
-                        t."Project ID",
-                        t."Project Name",
-                        t."Hours Worked"
-                    FROM timesheets t
-                    JOIN employee_master e ON t."Employee Code" = e."Employee Code"
-                    WHERE 1=1
-                """
-                params = []
-                
-                if "All" not in selected_employees and selected_employees:
-                    placeholders = ",".join(["?" for _ in selected_employees])
-                    query += f" AND e.\"Employee Name\" IN ({placeholders})"
-                    params.extend(selected_employees)
-                
-                if "All" not in selected_departments and selected_departments:
-                    placeholders = ",".join(["?" for _ in selected_departments])
-                    query += f" AND e.Department IN ({placeholders})"
-                    params.extend(selected_departments)
-                
-                if "All" not in selected_projects and selected_projects:
-                    placeholders = ",".join(["?" for _ in selected_projects])
-                    query += f" AND t.\"Project Name\" IN ({placeholders})"
-                    params.extend(selected_projects)
-                
-                if start_date:
-                    query += " AND t.\"Date\" >= ?"
-                    params.append(start_date.strftime('%Y-%m-%d'))
-            
-                if end_date:
-                    query += " AND t.\"Date\" <= ?"
-                    params.append(end_date.strftime('%Y-%m-%d'))
-                
-                query += " ORDER BY t.\"Date\", e.\"Employee Name\""
-                
-                df = con.execute(query, params).df()
-                
-            elif report_type == "Attendance Records":
-                query = """
-                    SELECT 
-                        a."Date",
-                        a."Employee Code", 
-                        e."Employee Name",
-                        e.Department,
-                        a."Clock-In Time",
-                        a."Clock-Out Time",
-                        a."Total Hours"
-                    FROM daily_attendance a
-                    JOIN employee_master e ON a."Employee Code" = e."Employee Code"
-                    WHERE 1=1
-                """
-                params = []
-                
-                if "All" not in selected_employees and selected_employees:
-                    placeholders = ",".join(["?" for _ in selected_employees])
-                    query += f" AND e.\"Employee Name\" IN ({placeholders})"
-                    params.extend(selected_employees)
-                
-                if "All" not in selected_departments and selected_departments:
-                    placeholders = ",".join(["?" for _ in selected_departments])
-                    query += f" AND e.Department IN ({placeholders})"
-                    params.extend(selected_departments)
-                
-                if start_date:
-                    query += " AND a.\"Date\" >= ?"
-                    params.append(start_date.strftime('%Y-%m-%d'))
-            
-                if end_date:
-                    query += " AND a.\"Date\" <= ?"
-                    params.append(end_date.strftime('%Y-%m-%d'))
-                
-                query += " ORDER BY a.\"Date\", e.\"Employee Name\""
-                
-                df = con.execute(query, params).df()
-                
-            elif report_type == "Timesheet Summary":
-                query = """
-                    SELECT 
-                        e."Employee Name",
-                        e.Department,
-                        t."Project Name", 
-                        ROUND(SUM(t."Hours Worked"), 2) as "Total Hours"
-                    FROM timesheets t
-                    JOIN employee_master e ON t."Employee Code" = e."Employee Code"
-                    WHERE 1=1
-                """
-                params = []
-                
-                if "All" not in selected_employees and selected_employees:
-                    placeholders = ",".join(["?" for _ in selected_employees])
-                    query += f" AND e.\"Employee Name\" IN ({placeholders})"
-                    params.extend(selected_employees)
-                
-                if "All" not in selected_departments and selected_departments:
-                    placeholders = ",".join(["?" for _ in selected_departments])
-                    query += f" AND e.Department IN ({placeholders})"
-                    params.extend(selected_departments)
-                
-                if "All" not in selected_projects and selected_projects:
-                    placeholders = ",".join(["?" for _ in selected_projects])
-                    query += f" AND t.\"Project Name\" IN ({placeholders})"
-                    params.extend(selected_projects)
-                
-                if start_date:
-                    query += " AND t.\"Date\" >= ?"
-                    params.append(start_date.strftime('%Y-%m-%d'))
-            
-                if end_date:
-                    query += " AND t.\"Date\" <= ?"
-                    params.append(end_date.strftime('%Y-%m-%d'))
-                
-                query += " GROUP BY e.\"Employee Name\", e.Department, t.\"Project Name\""
-                query += " ORDER BY e.\"Employee Name\", t.\"Project Name\""
-                
+        # Report type selection for custom query
+        report_type = st.selectbox(
+            "Select Report Type", 
+            report_queries.CUSTOM_REPORT_TYPES
+        )
+    
+        # Build the query
+        if st.button("Generate Report", key="custom_query_report"):
+            try:
+                query, params = report_queries.custom_report_query(
+                    report_type,
+                    selected_employees,
+                    selected_departments,
+                    selected_projects,
+                    start_date,
+                    end_date
+                )
                 df = con.execute(query, params).df()
             
-            # Store the dataframe in session state and display it
-            if not df.empty:
-                st.session_state.current_df = df
-                st.dataframe(df)
-                st.success(f"Report generated successfully! Found {len(df)} records.")
-            else:
-                st.warning("No data found matching the selected criteria.")
+                # Store the dataframe in session state and display it
+                if not df.empty:
+                    result_store.put(st.session_state.result_key, df)
+                    st.dataframe(df)
+                    st.success(f"Report generated successfully! Found {len(df)} records.")
+                else:
+                    st.warning("No data found matching the selected criteria.")
             
-        except Exception as e:
-            st.error(f"Error generating report: {e}")
-            df = pd.DataFrame()
-
+            except Exception as e:
+                st.error(f"Error generating report: {e}")
+                df = pd.DataFrame()
+    finally:
+        con.close()
 
 
-with tab3:
-    st.header("AI Query Assistant")
-    st.info("Describe what you want to find out in plain English, and let AI generate the SQL query for you.")
+@st.fragment
+def ai_assistant_tab():
+    """Natural-language query assistant"""
+    con = open_cursor()
+    try:
+        st.header("AI Query Assistant")
+        st.info("Describe what you want to find out in plain English, and let AI generate the SQL query for you.")
     
-    user_query = st.text_area("What would you like to know?", 
-        placeholder="Example: Show me all employees in the Marketing department who worked on Project PRJ003 in June 2025")
+        user_query = st.text_area("What would you like to know?", 
+            placeholder="Example: Show me all employees in the Marketing department who worked on Project PRJ003 in June 2025")
     
-    if st.button("Generate Report", key="ai_query_report"):
-        if not user_query:
-            st.warning("Please enter a query description.")
-        else:
-            with st.spinner("Generating SQL query..."):
+        if st.button("Generate Report", key="ai_query_report"):
+            if not user_query:
+                st.warning("Please enter a query description.")
+            else:
+                # Common pivot questions are answered from local templates without an LLM round trip
                 try:
-                    # Get database schema information for context
-                    table_schema = {}
-                    for table in required_tables:
-                        schema_query = f"DESCRIBE SELECT * FROM {table} LIMIT 0"
-                        table_schema[table] = con.execute(schema_query).df().to_dict(orient='records')
+                    version = snapshot_version(db_path)
+                    employee_names, departments, projects = load_filter_options(version)
+                    template_match = query_templates.match(
+                        user_query, departments, projects,
+                        other_values=employee_names + load_unbound_values(version)
+                    )
+                except Exception:
+                    template_match = None
+
+                if template_match:
+                    st.subheader(f"Matched template: {template_match['name']}")
+                    st.code(template_match['sql'], language="sql")
+                    try:
+                        result_df = con.execute(template_match['sql']).df()
+                        result_store.put(st.session_state.result_key, result_df)
+                        st.subheader("Query Results:")
+                        st.dataframe(result_df)
+                        st.success(f"Query executed successfully! Found {len(result_df)} records.")
+                    except Exception as e:
+                        st.error(f"Error executing query: {str(e)}")
+                else:
+                    with st.spinner("Generating SQL query..."):
+                        try:
+                            # Get database schema information for context
+                            table_schema = {}
+                            for table in required_tables:
+                                schema_query = f"DESCRIBE SELECT * FROM {table} LIMIT 0"
+                                table_schema[table] = con.execute(schema_query).df().to_dict(orient='records')
                     
-                    # Sample data for each table (first 5 rows)
-                    sample_data = {}
-                    for table in required_tables:
-                        sample_query = f"SELECT * FROM {table} LIMIT 5"
-                        sample_data[table] = con.execute(sample_query).df().to_dict(orient='records')
+                            # Sample data for each table (first 5 rows)
+                            sample_data = {}
+                            for table in required_tables:
+                                sample_query = f"SELECT * FROM {table} LIMIT 5"
+                                sample_data[table] = con.execute(sample_query).df().to_dict(orient='records')
                     
-                    # Create context message
-                     # Create context message
-                    context = {
-                        "database_tables": required_tables,
-                        "table_schemas": table_schema,
-                        "sample_data": sample_data,
-                        "query_requirement": user_query
-                    }
+                            # Create context message
+                             # Create context message
+                            context = {
+                                "database_tables": required_tables,
+                                "table_schemas": table_schema,
+                                "sample_data": sample_data,
+                                "query_requirement": user_query
+                            }
                     
-                    # Custom JSON encoder to handle timestamps and dates
-                    class CustomJSONEncoder(json.JSONEncoder):
-                        def default(self, obj):
-                            if isinstance(obj, (datetime, date)):
-                                return obj.isoformat()
-                            if pd.isna(obj):
-                                return None
-                            try:
-                                return super().default(obj)
-                            except TypeError:
-                                return str(obj)
+                            # Custom JSON encoder to handle timestamps and dates
+                            class CustomJSONEncoder(json.JSONEncoder):
+                                def default(self, obj):
+                                    if isinstance(obj, (datetime, date)):
+                                        return obj.isoformat()
+                                    if pd.isna(obj):
+                                        return None
+                                    try:
+                                        return super().default(obj)
+                                    except TypeError:
+                                        return str(obj)
                     
-                    # Prepare API request
-                    api_key = GEMINI_API_KEY
-                    url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={api_key}"
+                            # Prepare API request
+                            api_key = GEMINI_API_KEY
+                            url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent?key={api_key}"
                     
-                    prompt = f"""
-                    You are a database expert who helps convert natural language queries to SQL queries.
-
-                    Here are the tables in the database:
-                    {json.dumps(context['table_schemas'], indent=2, cls=CustomJSONEncoder)}
-
-                    Here's a sample of each table's data:
-                    {json.dumps(context['sample_data'], indent=2, cls=CustomJSONEncoder)}
-
-                    The user wants the following information:
-                    {user_query}
-
-                    IMPORTANT: Before writing your query, carefully check which columns exist in which tables.
-                    - The employee_master table contains "Employee Name" and basic employee information
-                    - The timesheets table contains project assignments and hours but NOT employee names
-                    - Join tables appropriately to get the information needed
-
-                    Please generate a valid SQL query that can be executed against a DuckDB database.
-                    Make sure to use DISTINCT or appropriate GROUP BY clauses to avoid duplicate rows.
-                    Return only the SQL query without any explanation or additional text.
-                    Your SQL query should be wrapped in triple backticks like this:
-                    ```
-                    SELECT * FROM table;
-                    ```
-                    """
+                            prompt = f"""
+                            You are a database expert who helps convert natural language queries to SQL queries.
+
+                            Here are the tables in the database:
+                            {json.dumps(context['table_schemas'], indent=2, cls=CustomJSONEncoder)}
+
+                            Here's a sample of each table's data:
+                            {json.dumps(context['sample_data'], indent=2, cls=CustomJSONEncoder)}
+
+                            The user wants the following information:
+                            {user_query}
+
+                            IMPORTANT: Before writing your query, carefully check which columns exist in which tables.
+                            - The employee_master table contains "Employee Name" and basic employee information
+                            - The timesheets table contains project assignments and hours but NOT employee names
+                            - Join tables appropriately to get the information needed
+
+                            Please generate a valid SQL query that can be executed against a DuckDB database.
+                            Make sure to use DISTINCT or appropriate GROUP BY clauses to avoid duplicate rows.
+                            Return only the SQL query without any explanation or additional text.
+                            Your SQL query should be wrapped in triple backticks like this:
+                            ```
+                            SELECT * FROM table;
+                            ```
+                            """
                     
-                    headers = {
-                        'Content-Type': 'application/json'
-                    }
+                            headers = {
+                                'Content-Type': 'application/json'
+                            }
                     
-                    payload = {
-                        "contents": [
-                            {
-                                "parts": [
+                            payload = {
+                                "contents": [
                                     {
-                                        "text": prompt
+                                        "parts": [
+                                            {
+                                                "text": prompt
+                                            }
+                                        ]
                                     }
                                 ]
                             }
-                        ]
-                    }
                     
-                    # Make API request
-                    response = requests.post(url, headers=headers, json=payload)
+                            # Make API request; requests is only imported when the assistant is used
+                            import requests
+                            response = requests.post(url, headers=headers, json=payload)
                     
-                    if response.status_code == 200:
-                        response_data = response.json()
-                        response_text = response_data['candidates'][0]['content']['parts'][0]['text']
+                            if response.status_code == 200:
+                                response_data = response.json()
+                                response_text = response_data['candidates'][0]['content']['parts'][0]['text']
                         
-                        # Extract SQL query from response
-                        import re
-                        sql_match = re.search(r"```(?:sql)?\n([\s\S]*?)\n```", response_text)
+                                # Extract SQL query from response
+                                import re
+                                sql_match = re.search(r"```(?:sql)?\n([\s\S]*?)\n```", response_text)
                         
-                        if sql_match:
-                            sql_query = sql_match.group(1).strip()
+                                if sql_match:
+                                    sql_query = sql_match.group(1).strip()
                             
-                            # Display the generated SQL
-                            st.subheader("Generated SQL Query:")
-                            st.code(sql_query, language="sql")
+                                    # Display the generated SQL
+                                    st.subheader("Generated SQL Query:")
+                                    st.code(sql_query, language="sql")
                             
-                            # Execute the query
-                            with st.spinner("Executing query..."):
-                                try:
-                                    result_df = con.execute(sql_query).df()
+                                    # Execute the query
+                                    with st.spinner("Executing query..."):
+                                        try:
+                                            result_df = con.execute(sql_query).df()
                                     
-                                    # Store results and display
-                                    st.session_state.current_df = result_df
-                                    st.subheader("Query Results:")
-                                    st.dataframe(result_df)
-                                    st.success(f"Query executed successfully! Found {len(result_df)} records.")
-                                except Exception as e:
-                                    st.error(f"Error executing query: {str(e)}")
-                        else:
-                            st.error("Could not extract SQL query from API response")
-                    else:
-                        st.error(f"API request failed with status code {response.status_code}")
-                        st.error(response.text)
+                                            # Store results and display
+                                            result_store.put(st.session_state.result_key, result_df)
+                                            st.subheader("Query Results:")
+                                            st.dataframe(result_df)
+                                            st.success(f"Query executed successfully! Found {len(result_df)} records.")
+                                        except Exception as e:
+                                            st.error(f"Error executing query: {str(e)}")
+                                else:
+                                    st.error("Could not extract SQL query from API response")
+                            else:
+                                st.error(f"API request failed with status code {response.status_code}")
+                                st.error(response.text)
                         
-                except Exception as e:
-                    st.error(f"Error: {str(e)}")
+                        except Exception as e:
+                            st.error(f"Error: {str(e)}")
+    finally:
+        con.close()
+
+
+@st.cache_data(max_entries=32)
+def load_chart_data(version, chart, start, end, bucket, top_projects):
+    """Aggregated chart series for one snapshot; only the bounded result is cached"""
+    con = get_connection(version).cursor()
+    try:
+        if chart == "Hours per Project":
+            return charts.hours_trend(con, start, end, bucket, top_projects)
+        if chart == "Department x Project":
+            return charts.department_project_heatmap(con, start, end, top_projects)
+        return charts.attendance_hours_histogram(con, start, end)
+    finally:
+        con.close()
+
+
+@st.fragment
+def charts_tab():
+    """Trend, heatmap and distribution charts"""
+    # Tabs are not lazy: this fragment runs on every full rerun, so plotly and the chart queries
+    # wait until the charts are switched on; the toggle keeps its state across reruns
+    if not st.toggle("Show charts", key="show_charts"):
+        st.caption("Switch on to load the charts.")
+        return
+
+    import plotly.express as px
+
+    version = snapshot_version(db_path)
+    con = get_connection(version).cursor()
+    try:
+        first, last = charts.date_bounds(con)
+    finally:
+        con.close()
+
+    if first is None:
+        st.warning("No timesheet data found.")
+        return
+
+    chart = st.selectbox("Chart", ["Hours per Project", "Department x Project", "Attendance Hours Distribution"])
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        date_range = st.date_input(
+            "Date range",
+            value=charts.default_range(first, last),
+            min_value=first,
+            max_value=last,
+            key="chart_date_range"
+        )
+    with col2:
+        bucket = st.selectbox("Time bucket", ["Auto"] + list(charts.BUCKETS), key="chart_bucket")
+    with col3:
+        top_projects = st.slider("Projects shown", min_value=3, max_value=30, value=8, key="chart_top_projects")
+
+    if not isinstance(date_range, tuple) or len(date_range) != 2:
+        st.info("Select a start and end date.")
+        return
+
+    start, end = date_range
+    if bucket == "Auto":
+        bucket = charts.choose_bucket(start, end)
+
+    try:
+        df = load_chart_data(version, chart, start, end, bucket, top_projects)
+    except Exception as e:
+        st.error(f"Error building chart: {e}")
+        return
+
+    if df.empty:
+        st.warning("No data in the selected date range.")
+        return
+
+    if chart == "Hours per Project":
+        fig = px.line(df, x="Period", y="Hours", color="Project", markers=len(df) <= 200)
+    elif chart == "Department x Project":
+        pivot = df.pivot(index="Department", columns="Project", values="Hours").fillna(0)
+        fig = px.imshow(pivot, aspect="auto", color_continuous_scale="Blues", labels={"color": "Hours"})
+    else:
+        fig = px.bar(df, x="Bin Start", y="Days", hover_data=["Bin End"])
+        fig.update_layout(bargap=0)
+
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"{len(df)} aggregated points")
+
+
+with tab1:
+    predefined_reports_tab()
+
+with tab2:
+    custom_queries_tab()
+
+with tab3:
+    ai_assistant_tab()
+
+with tab4:
+    charts_tab()
 
 
-# Close database connection
+# Close this rerun's cursor; the snapshot connection stays cached for the next rerun
 try:
     con.close()
 except:
@@ -0,0 +1,197 @@
+import argparse
+import functools
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+from loadtest_dashboard import build_test_database, widget
+
+
+QUESTIONS = [
+    "Show hours worked per project last month",
+    "Which employees in IT joined this year?",
+    "List attendance discrepancies for Sales"
+]
+
+REPORTS = ["Employee Roster", "Exit Report", "Work Profile", "Experience Summary"]
+
+CUSTOM_REPORTS = ["Employee Details", "Project Assignments", "Attendance Records", "Timesheet Summary"]
+
+
+def type_question(app, rng):
+    widget(app.text_area, "What would you like to know?").input(rng.choice(QUESTIONS))
+
+
+def switch_report(app, rng):
+    widget(app.selectbox, "Select a report").set_value(rng.choice(REPORTS))
+
+
+def generate_custom_report(app, rng):
+    widget(app.selectbox, "Select Report Type").set_value(rng.choice(CUSTOM_REPORTS))
+    app.button(key="custom_query_report").click()
+
+
+# Each interaction as (name, the fragment that owns its widgets, how to perform it)
+INTERACTIONS = [
+    ("Type in AI assistant", 'ai_assistant_tab', type_question),
+    ("Switch predefined report", 'predefined_reports_tab', switch_report),
+    ("Generate custom report", 'custom_queries_tab', generate_custom_report)
+]
+
+
+def time_fragments(section_times):
+    """Wrap st.fragment so each fragment run records its duration by function name; returns the original"""
+    import streamlit as st
+
+    fragment = st.fragment
+
+    def timed_fragment(func=None, **kwargs):
+        if func is None:
+            return lambda decorated: timed_fragment(decorated, **kwargs)
+
+        @functools.wraps(func)
+        def timed(*args, **func_kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **func_kwargs)
+            finally:
+                section_times[func.__name__] = time.perf_counter() - start
+
+        return fragment(timed, **kwargs)
+
+    st.fragment = timed_fragment
+    return fragment
+
+
+def cold_start(app_path, timeout):
+    """Time the first run of the app; called in a fresh interpreter so the app's imports are not cached"""
+    from streamlit.testing.v1 import AppTest
+
+    start = time.perf_counter()
+    app = AppTest.from_file(app_path, default_timeout=timeout)
+    app.run()
+    return {'ms': (time.perf_counter() - start) * 1000, 'error': bool(app.exception)}
+
+
+def bench_cold_start(app_path, runs, timeout):
+    """Median first-run time of the app over several fresh processes"""
+    timings = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--cold-start-child', app_path, '--timeout', str(timeout)],
+            capture_output=True, text=True, check=True
+        )
+        run = json.loads(result.stdout.strip().splitlines()[-1])
+        if run['error']:
+            raise RuntimeError(f"{app_path} raised an exception on its first run")
+        timings.append(run['ms'])
+    return {'median_ms': statistics.median(timings), 'min_ms': min(timings)}
+
+
+def bench_interactions(app_path, repeat, seed, timeout):
+    """Time each interaction's full rerun and, if the app uses fragments, the rerun of its own fragment"""
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    section_times = {}
+    fragment = time_fragments(section_times)
+    try:
+        rng = random.Random(seed)
+        app = AppTest.from_file(app_path, default_timeout=timeout)
+        app.run()
+
+        results = {}
+        for name, section, interact in INTERACTIONS:
+            full, own = [], []
+            for _ in range(repeat):
+                interact(app, rng)
+                section_times.clear()
+                start = time.perf_counter()
+                app.run()
+                full.append(time.perf_counter() - start)
+                if app.exception:
+                    raise RuntimeError(f"{app_path} raised an exception during '{name}'")
+                if section in section_times:
+                    own.append(section_times[section])
+
+            # AppTest always reruns the whole script; a served app reruns only the fragment owning the widget
+            results[name] = {
+                'full_rerun_ms': statistics.median(full) * 1000,
+                'fragment_ms': statistics.median(own) * 1000 if own else None,
+                'interaction_ms': statistics.median(own or full) * 1000
+            }
+        return results
+    finally:
+        st.fragment = fragment
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure dashboard cold start and per-interaction rerun time")
+    parser.add_argument('--apps', default='app.py', help="Comma-separated app scripts to compare")
+    parser.add_argument('--before', help="Also measure app.py as of this git revision, e.g. 1a0103d~1")
+    parser.add_argument('--db', default='bench_dashboard.duckdb', help="Generated database path")
+    parser.add_argument('--employees', type=int, default=2000)
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--reuse-db', action='store_true', help="Skip generation if the database exists")
+    parser.add_argument('--cold-runs', type=int, default=5, help="Fresh processes per cold start measurement")
+    parser.add_argument('--repeat', type=int, default=5, help="Reruns per interaction")
+    parser.add_argument('--timeout', type=float, default=120, help="Per-rerun timeout in seconds")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', help="Write results to this JSON file")
+    parser.add_argument('--cold-start-child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cold_start_child:
+        print(json.dumps(cold_start(args.cold_start_child, args.timeout)))
+        return 0
+
+    # The dashboard resolves its database path from the environment on import; child processes inherit it
+    os.environ['DUCKDB_PATH'] = os.path.abspath(args.db)
+
+    if not (args.reuse_db and os.path.exists(args.db)):
+        print(f"Generating {args.employees} employees x {args.days} days into {args.db}...")
+        build_test_database(args.db, args.employees, args.days)
+
+    apps = args.apps.split(',')
+    before_path = None
+    if args.before:
+        # Kept next to app.py so it imports the same sibling modules
+        before_path = f"app_before_{args.before.replace('~', '_').replace('/', '_')}.py"
+        source = subprocess.run(['git', 'show', f"{args.before}:app.py"], capture_output=True, text=True, check=True)
+        with open(before_path, 'w') as f:
+            f.write(source.stdout)
+        apps.insert(0, before_path)
+
+    results = {'employees': args.employees, 'days': args.days, 'apps': {}}
+    try:
+        for app_path in apps:
+            print(f"\n{app_path}")
+            cold = bench_cold_start(app_path, args.cold_runs, args.timeout)
+            print(f"  {'cold start':<28} {cold['median_ms']:>10.0f} ms (min {cold['min_ms']:.0f})")
+
+            # Interactions run in this process, after its own warm-up run of the app
+            interactions = bench_interactions(app_path, args.repeat, args.seed, args.timeout)
+            print(f"  {'interaction':<28} {'full ms':>10} {'fragment ms':>12} {'effective ms':>13}")
+            for name, stats in interactions.items():
+                fragment_ms = f"{stats['fragment_ms']:.0f}" if stats['fragment_ms'] is not None else '-'
+                print(f"  {name:<28} {stats['full_rerun_ms']:>10.0f} {fragment_ms:>12} "
+                      f"{stats['interaction_ms']:>13.0f}")
+            results['apps'][app_path] = {'cold_start': cold, 'interactions': interactions}
+    finally:
+        if before_path and os.path.exists(before_path):
+            os.remove(before_path)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from datetime import date
+
+import duckdb
+
+import report_queries
+from loadtest_dashboard import build_test_database, current_rss_mb
+
+
+def report_workloads():
+    """Every dashboard report as (name, function running it the way app.py does)"""
+    def run(query, params=None):
+        return lambda con: len(con.execute(query, params or []).df())
+
+    def project_master(con):
+        # Summary plus one employee breakdown per project, as rendered by the dashboard
+        summary = con.execute(report_queries.PROJECT_SUMMARY_QUERY).df()
+        for project_id in summary["Project ID"]:
+            con.execute(report_queries.PROJECT_EMPLOYEES_QUERY, [project_id]).df()
+        return len(summary)
+
+    def employee_project_summary(con):
+        # Summary plus one project breakdown per employee
+        summary = con.execute(report_queries.EMPLOYEE_PROJECT_SUMMARY_QUERY).df()
+        for employee_code in summary["Employee Code"]:
+            con.execute(report_queries.EMPLOYEE_PROJECTS_QUERY, [employee_code]).df()
+        return len(summary)
+
+    workloads = [(report, run(report_queries.table_report_query(report))) for report in report_queries.TABLE_REPORTS]
+    workloads.append(("Attendance Reconciliation", run(*report_queries.reconciliation_query())))
+    workloads.append(("Attendance Discrepancies", run(*report_queries.reconciliation_query(True, 0.5))))
+    workloads.append(("Project Master Report", project_master))
+    workloads.append(("Employee Project Summary", employee_project_summary))
+
+    for report_type in report_queries.CUSTOM_REPORT_TYPES:
+        workloads.append((f"Custom: {report_type}", run(*report_queries.custom_report_query(report_type, ["All"]))))
+        workloads.append((f"Custom: {report_type} (filtered)", run(*report_queries.custom_report_query(
+            report_type,
+            departments=["IT"],
+            start_date=date(2025, 1, 15),
+            end_date=date(2025, 2, 15)
+        ))))
+
+    return workloads
+
+
+class PeakMemory:
+    # Samples RSS in a background thread while a query runs
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.peak = 0
+        self.stop_event = threading.Event()
+
+    def sample(self):
+        while not self.stop_event.is_set():
+            self.peak = max(self.peak, current_rss_mb())
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self.baseline = current_rss_mb()
+        self.peak = self.baseline
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop_event.set()
+        self.thread.join()
+        self.peak = max(self.peak, current_rss_mb())
+
+    @property
+    def delta_mb(self):
+        return self.peak - self.baseline
+
+
+def bench_report(con, workload, warmup, repeat):
+    """Time one report after warm-up runs; returns timing and memory stats"""
+    for _ in range(warmup):
+        workload(con)
+
+    timings = []
+    peak_mb = 0
+    rows = 0
+    for _ in range(repeat):
+        with PeakMemory() as memory:
+            start = time.perf_counter()
+            rows = workload(con)
+            timings.append(time.perf_counter() - start)
+        peak_mb = max(peak_mb, memory.delta_mb)
+
+    return {
+        'rows': rows,
+        'min_ms': min(timings) * 1000,
+        'median_ms': statistics.median(timings) * 1000,
+        'max_ms': max(timings) * 1000,
+        'peak_mem_mb': peak_mb
+    }
+
+
+def compare(results, baseline, threshold, noise_ms):
+    """List (scale, report, baseline ms, current ms) for reports slower than baseline by more than threshold"""
+    regressions = []
+    for scale, reports in results['scales'].items():
+        for report, stats in reports.items():
+            previous = baseline.get('scales', {}).get(scale, {}).get(report)
+            if not previous:
+                continue
+            before, after = previous['median_ms'], stats['median_ms']
+            if after > before * (1 + threshold) and after - before > noise_ms:
+                regressions.append((scale, report, before, after))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every dashboard report query against generated databases")
+    parser.add_argument('--scales', default='500x30,2000x90,10000x365',
+                        help="Comma-separated <employees>x<days> database sizes")
+    parser.add_argument('--db-dir', default='.', help="Where generated databases are kept")
+    parser.add_argument('--reuse-db', action='store_true', help="Skip generation if a scale's database exists")
+    parser.add_argument('--warmup', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--reports', help="Only run reports whose name contains this text")
+    parser.add_argument('--json', help="Write results to this JSON file")
+    parser.add_argument('--baseline', help="Compare against a previous --json result")
+    parser.add_argument('--threshold', type=float, default=0.25, help="Allowed median slowdown (0.25 = 25%%)")
+    parser.add_argument('--noise-ms', type=float, default=5.0, help="Ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    workloads = [(name, workload) for name, workload in report_workloads()
+                 if not args.reports or args.reports.lower() in name.lower()]
+
+    os.makedirs(args.db_dir, exist_ok=True)
+    results = {'warmup': args.warmup, 'repeat': args.repeat, 'duckdb': duckdb.__version__, 'scales': {}}
+    for scale in args.scales.split(','):
+        employees, days = (int(part) for part in scale.split('x'))
+        db_path = os.path.join(args.db_dir, f"bench_reports_{scale}.duckdb")
+        if not (args.reuse_db and os.path.exists(db_path)):
+            print(f"Generating {employees} employees x {days} days into {db_path}...")
+            build_test_database(db_path, employees, days)
+
+        print(f"\n{scale}")
+        print(f"  {'report':<44} {'rows':>9} {'median ms':>10} {'min ms':>9} {'peak MB':>8}")
+        con = duckdb.connect(db_path, read_only=True)
+        scale_results = {}
+        try:
+            for name, workload in workloads:
+                stats = bench_report(con, workload, args.warmup, args.repeat)
+                scale_results[name] = stats
+                print(f"  {name:<44} {stats['rows']:>9} {stats['median_ms']:>10.1f} "
+                      f"{stats['min_ms']:>9.1f} {stats['peak_mem_mb']:>8.1f}")
+        finally:
+            con.close()
+        results['scales'][scale] = scale_results
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.noise_ms)
+        if regressions:
+            print(f"\n{len(regressions)} report(s) regressed by more than {args.threshold:.0%}:")
+            for scale, report, before, after in regressions:
+                print(f"  {scale} {report}: {before:.1f} ms -> {after:.1f} ms ({after / before - 1:+.0%})")
+            return 1
+        print(f"\nNo regressions against {args.baseline}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+from datetime import timedelta
+
+# Chart data is aggregated inside DuckDB so only a bounded number of points ever
+# reaches the browser, whatever the size of the underlying tables
+
+BUCKETS = {
+    "Day": ("1 day", 1),
+    "Week": ("1 week", 7),
+    "Month": ("1 month", 30)
+}
+
+
+def date_bounds(con):
+    """First and last timesheet date, or (None, None) when there are no timesheets"""
+    return con.execute('SELECT MIN(CAST("Date" AS DATE)), MAX(CAST("Date" AS DATE)) FROM timesheets').fetchone()
+
+
+def choose_bucket(start, end, max_points=120):
+    """Smallest bucket that keeps a series within max_points over the date range"""
+    days = (end - start).days + 1
+    for name, (_, bucket_days) in BUCKETS.items():
+        if days / bucket_days <= max_points:
+            return name
+    return "Month"
+
+
+def hours_trend(con, start, end, bucket="Week", top_projects=8):
+    """Hours per project per time bucket; projects outside the top N are folded into 'Other'"""
+    interval, _ = BUCKETS[bucket]
+    return con.execute(f"""
+        WITH filtered AS (
+            SELECT CAST("Date" AS DATE) AS day, "Project Name", "Hours Worked"
+            FROM timesheets
+            WHERE CAST("Date" AS DATE) BETWEEN ? AND ?
+        ),
+        top AS (
+            SELECT "Project Name"
+            FROM filtered
+            GROUP BY "Project Name"
+            ORDER BY SUM("Hours Worked") DESC
+            LIMIT ?
+        )
+        SELECT
+            time_bucket(INTERVAL '{interval}', f.day) AS "Period",
+            COALESCE(top."Project Name", 'Other') AS "Project",
+            ROUND(SUM(f."Hours Worked"), 2) AS "Hours"
+        FROM filtered f
+        LEFT JOIN top ON f."Project Name" = top."Project Name"
+        GROUP BY ALL
+        ORDER BY "Period", "Project"
+    """, [start, end, top_projects]).df()
+
+
+def department_project_heatmap(con, start, end, top_projects=25):
+    """Department x project hours for the busiest projects in the date range"""
+    return con.execute("""
+        WITH hours AS (
+            SELECT COALESCE(e."Department", 'Unknown') AS "Department", t."Project Name" AS "Project",
+                   SUM(t."Hours Worked") AS "Hours"
+            FROM timesheets t
+            LEFT JOIN employee_master e ON t."Employee Code" = e."Employee Code"
+            WHERE CAST(t."Date" AS DATE) BETWEEN ? AND ?
+            GROUP BY ALL
+        ),
+        top AS (
+            SELECT "Project"
+            FROM hours
+            GROUP BY "Project"
+            ORDER BY SUM("Hours") DESC
+            LIMIT ?
+        )
+        SELECT h."Department", h."Project", ROUND(h."Hours", 2) AS "Hours"
+        FROM hours h
+        JOIN top USING ("Project")
+        ORDER BY h."Department", h."Project"
+    """, [start, end, top_projects]).df()
+
+
+def attendance_hours_histogram(con, start, end, bins=40):
+    """Daily attendance hours binned into equal-width buckets"""
+    return con.execute("""
+        WITH filtered AS (
+            SELECT "Total Hours" AS hours
+            FROM daily_attendance
+            WHERE CAST("Date" AS DATE) BETWEEN ? AND ? AND "Total Hours" IS NOT NULL
+        ),
+        bounds AS (
+            SELECT MIN(hours) AS low, GREATEST(MAX(hours) - MIN(hours), 0.01) / ? AS width
+            FROM filtered
+        )
+        SELECT
+            ROUND(low + bin * width, 2) AS "Bin Start",
+            ROUND(low + (bin + 1) * width, 2) AS "Bin End",
+            COUNT(*) AS "Days"
+        FROM (
+            SELECT low, width, LEAST(CAST(FLOOR((hours - low) / width) AS INTEGER), ? - 1) AS bin
+            FROM filtered, bounds
+        )
+        GROUP BY ALL
+        ORDER BY "Bin Start"
+    """, [start, end, bins, bins]).df()
+
+
+def default_range(first, last, days=365):
+    """Last year of data, clipped to what exists"""
+    return max(first, last - timedelta(days=days - 1)), last
@@ -1,11 +1,12 @@
 import duckdb
 import os
+from snapshot import DB_PATH
 
 # Create output folder if it doesn't exist
 os.makedirs("db", exist_ok=True)
 
 # Connect to your DuckDB database
-con = duckdb.connect("employee_reports.duckdb", read_only=True)
+con = duckdb.connect(DB_PATH, read_only=True)
 
 # Get list of all tables
 tables = con.execute("""
@@ -1,44 +1,138 @@
+import csv
 import duckdb
+import glob
 import os
 import sys
-
-try:
-
-    con = duckdb.connect("employee_reports.duckdb")
-except duckdb.IOException as e:
-    if "Conflicting lock is held" in str(e):
-        print("Database is locked by another process.")
-        print("Options:")
-        print("1. Close the other process (PID shown in error message)")
-        print("2. Run with read-only flag (add --readonly as parameter)")
-        
-        if len(sys.argv) > 1 and sys.argv[1] == "--readonly":
-            print("Opening in read-only mode...")
-            con = duckdb.connect("employee_reports.duckdb", read_only=True)
-        else:
-            sys.exit(1)
+from snapshot import DB_PATH, build_path, publish
+from watched_dir.schema import duckdb_types
 
 
+# Export file name stems per table; chunked exports (e.g. timesheet_report_part00001.csv) are combined
 csv_tables = {
-    "employee_master": "employee_master.csv",
-    "employee_exit_report": "employee_exit_report.csv",
-    "employee_work_profile": "employee_work_profile.csv",
-    "employee_experience_report": "experience_report.csv",
-    "daily_attendance": "daily_attendance.csv",
-    "timesheets": "timesheet_report.csv"
+    "employee_master": ["employee_master"],
+    "employee_exit_report": ["employee_exit_report"],
+    "employee_work_profile": ["employee_work_profile"],
+    "employee_experience_report": ["experience_report"],
+    "daily_attendance": ["daily_attendance", "attendance_report_dailycopy"],
+    "timesheets": ["timesheet_report"]
 }
 
-for table_name, file_name in csv_tables.items():
-    if os.path.exists(file_name):
-        con.execute(f"""
-            CREATE OR REPLACE TABLE {table_name} AS
-            SELECT * FROM read_csv_auto('{file_name}')
-        """)
-        print(f"Loaded {table_name} from {file_name}")
-    else:
-        print(f"⚠️  {file_name} not found, skipping...")
 
-con.close()
-print("✅ DuckDB database initialized: employee_reports.duckdb")
+def file_list(files):
+    return ", ".join(f"'{file_name}'" for file_name in files)
+
+
+def csv_header(file_name):
+    """Source column names from the first line of a CSV file"""
+    with open(file_name, newline="", encoding="utf-8-sig") as f:
+        return next(csv.reader(f), [])
+
+
+def csv_types(table_name, csv_files):
+    """DuckDB types for every header across a table's CSV files, as a read_csv types struct"""
+    types = {}
+    for file_name in csv_files:
+        types.update(duckdb_types(table_name, csv_header(file_name)))
+    return "{" + ", ".join(f"'{header}': '{column_type}'" for header, column_type in types.items()) + "}"
+
+
+def create_table(con, table_name, csv_files, parquet_files, types):
+    """Replace a dashboard table with the union of its CSV and Parquet exports"""
+    sources = []
+    if csv_files:
+        type_option = f", types={types}" if types else ""
+        sources.append(f"SELECT * FROM read_csv_auto([{file_list(csv_files)}], union_by_name=true{type_option})")
+    if parquet_files:
+        sources.append(f"SELECT * FROM read_parquet([{file_list(parquet_files)}], union_by_name=true)")
+
+    con.execute(f"""
+        CREATE OR REPLACE TABLE {table_name} AS
+        {" UNION ALL BY NAME ".join(sources)}
+    """)
+
+
+def load_csv_tables(con, tables=csv_tables, source_dir="."):
+    """Load each CSV or Parquet export into its dashboard table"""
+    for table_name, stems in tables.items():
+        csv_files = sorted(f for stem in stems for f in glob.glob(os.path.join(source_dir, f"{stem}*.csv")))
+        parquet_files = sorted(f for stem in stems for f in glob.glob(os.path.join(source_dir, f"{stem}*.parquet")))
+
+        if not csv_files and not parquet_files:
+            print(f"⚠️  {' / '.join(stems)} exports not found, skipping...")
+            continue
+
+        try:
+            # Declared schema types, so DuckDB does not sample the files to infer them
+            create_table(con, table_name, csv_files, parquet_files, csv_types(table_name, csv_files))
+        except duckdb.Error as e:
+            # e.g. dates that are not ISO; let DuckDB detect the formats instead of failing the table
+            print(f"⚠️  {table_name} exports do not fit the declared types ({e}), inferring types...")
+            create_table(con, table_name, csv_files, parquet_files, None)
+        print(f"Loaded {table_name} from {len(csv_files) + len(parquet_files)} file(s)")
+
+
+def build_reconciliation(con):
+    """One row per employee-day: attendance hours against the sum of timesheet hours"""
+    loaded_tables = {row[0] for row in con.execute("SHOW TABLES").fetchall()}
+    if not {"daily_attendance", "timesheets"} <= loaded_tables:
+        print("⚠️  daily_attendance or timesheets missing, skipping attendance_reconciliation...")
+        return
+
+    con.execute("""
+        CREATE OR REPLACE TABLE attendance_reconciliation AS
+        WITH worked AS (
+            SELECT
+                "Employee Code",
+                "Date",
+                ROUND(SUM("Hours Worked"), 2) AS "Timesheet Hours",
+                COUNT(DISTINCT "Project ID") AS "Projects Count"
+            FROM timesheets
+            GROUP BY "Employee Code", "Date"
+        )
+        SELECT
+            COALESCE(a."Employee Code", w."Employee Code") AS "Employee Code",
+            COALESCE(a."Date", w."Date") AS "Date",
+            a."Clock-In Time",
+            a."Clock-Out Time",
+            a."Total Hours" AS "Attendance Hours",
+            COALESCE(w."Timesheet Hours", 0) AS "Timesheet Hours",
+            COALESCE(w."Projects Count", 0) AS "Projects Count",
+            ROUND(COALESCE(a."Total Hours", 0) - COALESCE(w."Timesheet Hours", 0), 2) AS "Discrepancy"
+        FROM daily_attendance a
+        FULL OUTER JOIN worked w
+        ON a."Employee Code" = w."Employee Code" AND a."Date" = w."Date"
+        ORDER BY "Date", "Employee Code"
+    """)
+    print("Built attendance_reconciliation from daily_attendance and timesheets")
+
+
+def main():
+    # Build the next snapshot next to the published database so the dashboard,
+    # which holds the published file open read-only, never sees a lock conflict
+    build_file = build_path()
+    for stale_file in (build_file, f"{build_file}.wal"):
+        if os.path.exists(stale_file):
+            os.remove(stale_file)
+
+    con = duckdb.connect(build_file)
+    try:
+        load_csv_tables(con)
+        build_reconciliation(con)
+    except duckdb.Error as e:
+        # Never publish a snapshot whose tables or reconciliation did not build
+        con.close()
+        for stale_file in (build_file, f"{build_file}.wal"):
+            if os.path.exists(stale_file):
+                os.remove(stale_file)
+        print(f"❌ Snapshot build failed, the published snapshot is unchanged: {e}")
+        return 1
+    con.close()
+
+    # Swap the new snapshot in; open dashboard sessions switch over on their next rerun
+    publish(build_file)
+    print(f"✅ DuckDB snapshot published: {DB_PATH}")
+    return 0
 
 
+if __name__ == "__main__":
+    sys.exit(main())
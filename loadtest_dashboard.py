@@ -0,0 +1,271 @@
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import duckdb
+
+
+PREDEFINED_REPORTS = [
+    "Employee Roster",
+    "Exit Report",
+    "Work Profile",
+    "Experience Summary",
+    "Daily Attendance with Timesheet Verification",
+    "Project Master Report",
+    "Employee Project Summary"
+]
+
+CUSTOM_REPORTS = ["Employee Details", "Project Assignments", "Attendance Records", "Timesheet Summary"]
+
+DEPARTMENTS = ["IT", "Sales", "Support"]
+
+
+def build_test_database(db_path, employees, days, projects=20):
+    """Generate a synthetic employee_reports database with the dashboard's table layout"""
+    from init_db import build_reconciliation
+
+    for stale_file in (db_path, f"{db_path}.wal"):
+        if os.path.exists(stale_file):
+            os.remove(stale_file)
+
+    con = duckdb.connect(db_path)
+    con.execute("""
+        CREATE TABLE employee_master AS
+        SELECT
+            printf('EMP%06d', i) AS "Employee Code",
+            'Employee ' || CAST(i AS VARCHAR) AS "Employee Name",
+            printf('emp%06d@example.com', i) AS "Email",
+            printf('+91%010d', 9000000000 + i) AS "Mobile Number",
+            (['Male', 'Female', 'Other'])[1 + i % 3] AS "Gender",
+            DATE '2015-01-01' + CAST(i % 3000 AS INTEGER) AS "Date Of Joining",
+            (['Tech', 'HR', 'Marketing'])[1 + i % 3] AS "Business Unit",
+            (['Manager', 'Engineer', 'Analyst'])[1 + (i // 3) % 3] AS "Designation",
+            (['IT', 'Sales', 'Support'])[1 + (i // 7) % 3] AS "Department",
+            (['Active', 'Inactive'])[1 + CAST(i % 10 = 0 AS INTEGER)] AS "Status"
+        FROM range(1, ? + 1) t(i)
+    """, [employees])
+    con.execute("""
+        CREATE TABLE employee_exit_report AS
+        SELECT
+            "Employee Code", "Employee Name", "Business Unit", "Designation", "Date Of Joining",
+            "Date Of Joining" + INTERVAL 900 DAY AS "Exit Date",
+            "Date Of Joining" + INTERVAL 870 DAY AS "Expected Resignation Date"
+        FROM employee_master
+        WHERE "Status" = 'Inactive'
+    """)
+    con.execute("""
+        CREATE TABLE employee_work_profile AS
+        SELECT
+            "Employee Code", "Employee Name", "Business Unit",
+            'Senior ' || "Designation" AS "Parent Designation",
+            "Department" AS "Assigned Department", "Designation",
+            'Office ' || CAST(hash("Employee Code") % 10 AS VARCHAR) AS "Office Location Name"
+        FROM employee_master
+    """)
+    con.execute("""
+        CREATE TABLE employee_experience_report AS
+        SELECT
+            "Employee Code", "Employee Name", "Business Unit", "Department", "Designation", "Date Of Joining",
+            ROUND((hash("Employee Code") % 900) / 100.0 + 1, 2) AS "Current Experience",
+            ROUND((hash("Employee Code", 1) % 500) / 100.0, 2) AS "Past Experience",
+            ROUND((hash("Employee Code") % 900) / 100.0 + 1 + (hash("Employee Code", 1) % 500) / 100.0, 2)
+                AS "Total Experience"
+        FROM employee_master
+    """)
+    con.execute("""
+        CREATE TABLE daily_attendance AS
+        SELECT
+            DATE '2025-01-01' + CAST(d AS INTEGER) AS "Date",
+            e."Employee Code",
+            e."Employee Name",
+            TIME '08:00:00' + INTERVAL (hash(e."Employee Code", d) % 120) MINUTE AS "Clock-In Time",
+            TIME '16:00:00' + INTERVAL (hash(e."Employee Code", d) % 120 + hash(d, e."Employee Code") % 60) MINUTE
+                AS "Clock-Out Time",
+            ROUND(8 + (hash(d, e."Employee Code") % 60) / 60.0, 2) AS "Total Hours"
+        FROM employee_master e, range(?) days(d)
+    """, [days])
+    con.execute("""
+        CREATE TABLE timesheets AS
+        WITH entries AS (
+            SELECT
+                a."Date",
+                a."Employee Code",
+                p,
+                1 + hash(a."Employee Code", a."Date") % 3 AS project_count
+            FROM daily_attendance a, range(3) slots(p)
+        )
+        SELECT
+            "Date",
+            "Employee Code",
+            printf('PRJ%03d', 1 + (hash("Employee Code") % 1000 + p) % ?) AS "Project ID",
+            'Project ' || CAST(1 + (hash("Employee Code") % 1000 + p) % ? AS VARCHAR) AS "Project Name",
+            ROUND(8.0 / project_count, 2) AS "Hours Worked"
+        FROM entries
+        WHERE p < project_count
+    """, [projects, projects])
+    build_reconciliation(con)
+    con.close()
+
+
+def current_rss_mb():
+    """Resident set size of this process in MB"""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError):
+        # Peak RSS is the best portable fallback (KB on Linux, bytes on macOS)
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def widget(widgets, label):
+    """Find a widget by its label, or None if the last run did not render it"""
+    return next((w for w in widgets if w.label == label), None)
+
+
+def interact(app, rng):
+    """Perform one random dashboard interaction; returns False if a widget it needs was not rendered"""
+    if rng.random() < 0.5:
+        report = widget(app.selectbox, "Select a report")
+        if report is None:
+            return False
+        report.set_value(rng.choice(PREDEFINED_REPORTS))
+    else:
+        report_type = widget(app.selectbox, "Select Report Type")
+        departments = widget(app.multiselect, "Select Departments")
+        if report_type is None or departments is None:
+            return False
+        report_type.set_value(rng.choice(CUSTOM_REPORTS))
+        departments.set_value(rng.sample(DEPARTMENTS, rng.randint(1, 2)))
+        app.button(key="custom_query_report").click()
+    return True
+
+
+def warm_up(app_path, timeout):
+    """Run the app once before sessions start, so concurrent sessions don't all compile the script at once"""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(app_path, default_timeout=timeout)
+    app.run()
+    if app.exception:
+        raise RuntimeError(f"{app_path} raised an exception on its warm-up run")
+
+
+def run_session(app_path, session_index, interactions, seed, timeout):
+    """Drive one headless dashboard session and return its rerun latencies, errors and app handle"""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(seed + session_index)
+    latencies = []
+    errors = 0
+
+    def rerun(app):
+        nonlocal errors
+        start = time.perf_counter()
+        app.run()
+        latencies.append(time.perf_counter() - start)
+        if app.exception:
+            errors += 1
+
+    def start_session():
+        app = AppTest.from_file(app_path, default_timeout=timeout)
+        rerun(app)
+        return app
+
+    app = start_session()
+    for _ in range(interactions):
+        if not app.exception and interact(app, rng):
+            rerun(app)
+            continue
+
+        # A failed run leaves no widgets to drive: count it (if the rerun did not already) and start over
+        if not app.exception:
+            errors += 1
+        app = start_session()
+
+    return latencies, errors, app
+
+
+def percentile(values, pct):
+    """Percentile of a list of values (pct in 0-100)"""
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[pct - 1]
+
+
+def run_step(app_path, sessions, interactions, seed, timeout):
+    """Run a number of concurrent sessions and summarise latency, memory and throughput"""
+    rss_before = current_rss_mb()
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=sessions) as executor:
+        results = list(executor.map(
+            lambda index: run_session(app_path, index, interactions, seed, timeout),
+            range(sessions)
+        ))
+
+    elapsed = time.perf_counter() - start
+    # Sessions are still referenced here, so their state counts towards RSS
+    rss_after = current_rss_mb()
+
+    latencies = [latency for session_latencies, _, _ in results for latency in session_latencies]
+    return {
+        'sessions': sessions,
+        'reruns': len(latencies),
+        'errors': sum(errors for _, errors, _ in results),
+        'throughput_reruns_per_s': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'cold_start_ms': statistics.mean(session_latencies[0] for session_latencies, _, _ in results) * 1000,
+        'rss_mb': rss_after,
+        'rss_per_session_mb': max(rss_after - rss_before, 0) / sessions
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline concurrent-user load test for the Streamlit dashboard")
+    parser.add_argument('--db', default='loadtest_reports.duckdb', help="Generated database path")
+    parser.add_argument('--employees', type=int, default=2000)
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--reuse-db', action='store_true', help="Skip generation if the database exists")
+    parser.add_argument('--sessions', default='1,2,4,8,16', help="Comma-separated concurrent session counts")
+    parser.add_argument('--interactions', type=int, default=5, help="Widget interactions per session")
+    parser.add_argument('--timeout', type=float, default=120, help="Per-rerun timeout in seconds")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--app', default='app.py')
+    parser.add_argument('--json', help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    # The dashboard resolves its database path from the environment on import
+    os.environ['DUCKDB_PATH'] = os.path.abspath(args.db)
+
+    if not (args.reuse_db and os.path.exists(args.db)):
+        print(f"Generating {args.employees} employees x {args.days} days into {args.db}...")
+        build_test_database(args.db, args.employees, args.days)
+
+    warm_up(args.app, args.timeout)
+
+    results = []
+    print(f"{'sessions':>8} {'reruns':>7} {'errors':>6} {'rerun/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+          f"{'p99 ms':>8} {'cold ms':>8} {'MB/sess':>8}")
+    for sessions in [int(count) for count in args.sessions.split(',')]:
+        step = run_step(args.app, sessions, args.interactions, args.seed, args.timeout)
+        results.append(step)
+        print(f"{step['sessions']:>8} {step['reruns']:>7} {step['errors']:>6} "
+              f"{step['throughput_reruns_per_s']:>8.2f} {step['p50_ms']:>8.0f} {step['p95_ms']:>8.0f} "
+              f"{step['p99_ms']:>8.0f} {step['cold_start_ms']:>8.0f} {step['rss_per_session_mb']:>8.1f}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'employees': args.employees, 'days': args.days, 'steps': results}, f, indent=2)
+        print(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+import calendar
+import re
+from datetime import date
+
+# Local fast path for the AI assistant: common pivot questions (see sample_queries.md) are matched
+# to pre-validated DuckDB templates and answered without calling the LLM
+
+MIN_CONFIDENCE = 0.99
+
+MONTHS = {name.lower(): number for number, name in enumerate(calendar.month_name) if name}
+MONTHS.update({name.lower(): number for number, name in enumerate(calendar.month_abbr) if name})
+
+# Words that narrow a question in a way no template filter can express
+NEGATION_PATTERN = re.compile(
+    r"\b(?:not|no|never|neither|nor|except|excluding|exclude|excludes|without|besides|other than)\b|n't\b",
+    re.IGNORECASE
+)
+
+EXPERIENCE_LEVEL = """
+    CASE
+        WHEN x."Total Experience" IS NULL THEN 'Unknown'
+        WHEN x."Total Experience" < 3 THEN 'Junior (<3y)'
+        WHEN x."Total Experience" < 8 THEN 'Mid (3-8y)'
+        ELSE 'Senior (8y+)'
+    END
+"""
+
+# Each template lists keyword groups that must all appear (any word of a group counts), words that
+# rule it out, and its SQL with a {where} slot for the extracted entity filters
+TEMPLATES = [
+    {
+        'name': "Employees per project by department",
+        'groups': [{'project'}, {'department', 'dept'}, {'employee', 'headcount', 'people', 'staff'},
+                   {'count', 'number', 'many', 'headcount'}],
+        'excludes': {'hour', 'average', 'avg', 'mean', 'percentage', 'percent', 'share', 'week', 'month'},
+        'filters': {'department': 'e."Department"', 'project': 't."Project Name"', 'date': 't."Date"'},
+        'sql': """
+            PIVOT (
+                SELECT t."Project Name", COALESCE(e."Department", 'Unknown') AS "Department", t."Employee Code"
+                FROM timesheets t
+                JOIN employee_master e ON t."Employee Code" = e."Employee Code"
+                WHERE 1=1 {where}
+            )
+            ON "Department"
+            USING COUNT(DISTINCT "Employee Code")
+            GROUP BY "Project Name"
+            ORDER BY "Project Name"
+        """
+    },
+    {
+        'name': "Hours per project by department",
+        'groups': [{'project'}, {'department', 'dept'}, {'hour', 'time', 'contribution', 'intensity', 'involvement'}],
+        'excludes': {'average', 'avg', 'mean', 'percentage', 'percent', 'share', 'week', 'month',
+                     'designation', 'role', 'experience'},
+        'filters': {'department': 'e."Department"', 'project': 't."Project Name"', 'date': 't."Date"'},
+        'sql': """
+            PIVOT (
+                SELECT t."Project Name", COALESCE(e."Department", 'Unknown') AS "Department", t."Hours Worked"
+                FROM timesheets t
+                JOIN employee_master e ON t."Employee Code" = e."Employee Code"
+                WHERE 1=1 {where}
+            )
+            ON "Department"
+            USING ROUND(SUM("Hours Worked"), 2)
+            GROUP BY "Project Name"
+            ORDER BY "Project Name"
+        """
+    },
+    {
+        'name': "Average hours by department and project",
+        'groups': [{'project'}, {'department', 'dept'}, {'hour', 'time'}, {'average', 'avg', 'mean'}],
+        'excludes': {'percentage', 'percent', 'share', 'week', 'month'},
+        'filters': {'department': 'e."Department"', 'project': 't."Project Name"', 'date': 't."Date"'},
+        'sql': """
+            PIVOT (
+                SELECT COALESCE(e."Department", 'Unknown') AS "Department", t."Project Name", t."Hours Worked"
+                FROM timesheets t
+                JOIN employee_master e ON t."Employee Code" = e."Employee Code"
+                WHERE 1=1 {where}
+            )
+            ON "Project Name"
+            USING ROUND(AVG("Hours Worked"), 2)
+            GROUP BY "Department"
+            ORDER BY "Department"
+        """
+    },
+    {
+        'name': "Share of department hours by project",
+        'groups': [{'project'}, {'department', 'dept'}, {'percentage', 'percent', 'share', 'proportion'}],
+        'excludes': {'week', 'month'},
+        'filters': {'department': 'e."Department"', 'project': 't."Project Name"', 'date': 't."Date"'},
+        'sql': """
+            SELECT
+                COALESCE(e."Department", 'Unknown') AS "Department",
+                t."Project Name",
+                ROUND(SUM(t."Hours Worked"), 2) AS "Total Hours",
+                ROUND(100.0 * SUM(t."Hours Worked") / SUM(SUM(t."Hours Worked")) OVER (), 2) AS "Percent of All Hours"
+            FROM timesheets t
+            JOIN employee_master e ON t."Employee Code" = e."Employee Code"
+            WHERE 1=1 {where}
+            GROUP BY ALL
+            ORDER BY "Total Hours" DESC
+        """
+    },
+    {
+        'name': "Weekly hours per project",
+        'groups': [{'project'}, {'week', 'weekly'}, {'hour', 'time'}],
+        'excludes': {'attendance', 'employee'},
+        'filters': {'department': 'e."Department"', 'project': 't."Project Name"', 'date': 't."Date"'},
+        'sql': """
+            PIVOT (
+                SELECT t."Project Name", strftime(date_trunc('week', CAST(t."Date" AS DATE)), '%Y-%m-%d') AS "Week",
+                       t."Hours Worked"
+                FROM timesheets t
+                LEFT JOIN employee_master e ON t."Employee Code" = e."Employee Code"
+                WHERE 1=1 {where}
+            )
+            ON "Week"
+            USING ROUND(SUM("Hours Worked"), 2)
+            GROUP BY "Project Name"
+            ORDER BY "Project Name"
+        """
+    },
+    {
+        'name': "Monthly hours per employee and project",
+        'groups': [{'employee'}, {'project'}, {'month', 'monthly'}, {'hour', 'time'}],
+        'excludes': {'attendance', 'week'},
+        'filters': {'department': 'e."Department"', 'project': 't."Project Name"', 'date': 't."Date"'},
+        'sql': """
+            SELECT
+                e."Employee Name",
+                t."Employee Code",
+                t."Project Name",
+                strftime(date_trunc('month', CAST(t."Date" AS DATE)), '%Y-%m') AS "Month",
+                ROUND(SUM(t."Hours Worked"), 2) AS "Total Hours"
+            FROM timesheets t
+            LEFT JOIN employee_master e ON t."Employee Code" = e."Employee Code"
+            WHERE 1=1 {where}
+            GROUP BY ALL
+            ORDER BY "Month", e."Employee Name", t."Project Name"
+        """
+    },
+    {
+        'name': "Weekly attendance vs timesheet hours per employee",
+        'groups': [{'attendance'}, {'timesheet'}, {'week', 'weekly'}],
+        'excludes': set(),
+        'filters': {'department': 'e."Department"', 'date': 'r."Date"'},
+        'sql': """
+            SELECT
+                r."Employee Code",
+                e."Employee Name",
+                strftime(date_trunc('week', CAST(r."Date" AS DATE)), '%Y-%m-%d') AS "Week",
+                ROUND(SUM(r."Attendance Hours"), 2) AS "Attendance Hours",
+                ROUND(SUM(r."Timesheet Hours"), 2) AS "Timesheet Hours",
+                ROUND(SUM(r."Discrepancy"), 2) AS "Discrepancy"
+            FROM attendance_reconciliation r
+            LEFT JOIN employee_master e ON r."Employee Code" = e."Employee Code"
+            WHERE 1=1 {where}
+            GROUP BY ALL
+            ORDER BY "Week", r."Employee Code"
+        """
+    },
+    {
+        'name': "Hours per project by designation",
+        'groups': [{'designation', 'role'}, {'project'}],
+        'excludes': {'experience', 'week', 'month'},
+        'filters': {'department': 'e."Department"', 'project': 't."Project Name"', 'date': 't."Date"'},
+        'sql': """
+            PIVOT (
+                SELECT COALESCE(e."Designation", 'Unknown') AS "Designation", t."Project Name", t."Hours Worked"
+                FROM timesheets t
+                JOIN employee_master e ON t."Employee Code" = e."Employee Code"
+                WHERE 1=1 {where}
+            )
+            ON "Project Name"
+            USING ROUND(SUM("Hours Worked"), 2)
+            GROUP BY "Designation"
+            ORDER BY "Designation"
+        """
+    },
+    {
+        'name': "Project participation by experience level",
+        'groups': [{'experience', 'senior', 'junior', 'seniority'}, {'project'}],
+        'excludes': {'week', 'month'},
+        'filters': {'department': 'e."Department"', 'project': 't."Project Name"', 'date': 't."Date"'},
+        'sql': f"""
+            PIVOT (
+                SELECT t."Project Name", {EXPERIENCE_LEVEL} AS "Experience Level", t."Employee Code", t."Hours Worked"
+                FROM timesheets t
+                JOIN employee_master e ON t."Employee Code" = e."Employee Code"
+                LEFT JOIN employee_experience_report x ON t."Employee Code" = x."Employee Code"
+                WHERE 1=1 {{where}}
+            )
+            ON "Experience Level"
+            USING COUNT(DISTINCT "Employee Code") AS employees, ROUND(SUM("Hours Worked"), 2) AS hours
+            GROUP BY "Project Name"
+            ORDER BY "Project Name"
+        """
+    }
+]
+
+
+def normalise_words(text):
+    """Lower-case words with a trailing plural 's' removed"""
+    words = set()
+    for word in re.findall(r"[a-z]+", text.lower()):
+        if len(word) > 3 and word.endswith('s') and not word.endswith('ss'):
+            word = word[:-1]
+        words.add(word)
+    return words
+
+
+def score(template, words):
+    """Fraction of the template's keyword groups present, or 0 if an excluded word appears"""
+    if template['excludes'] & words:
+        return 0.0
+    matched = sum(1 for group in template['groups'] if group & words)
+    return matched / len(template['groups'])
+
+
+def find_values(question, values):
+    """Known values (departments, projects) mentioned in the question"""
+    found = []
+    for value in sorted(values, key=len, reverse=True):
+        # Short upper-case values like 'IT' or 'HR' must match case so 'it' in a sentence is ignored
+        flags = 0 if value.isupper() and len(value) <= 4 else re.IGNORECASE
+        if re.search(rf"(?<!\w){re.escape(value)}(?!\w)", question, flags):
+            found.append(value)
+    return found
+
+
+def remove_values(question, values):
+    """The question with the given known values cut out"""
+    for value in sorted(values, key=len, reverse=True):
+        question = re.sub(rf"(?<!\w){re.escape(value)}(?!\w)", " ", question, flags=re.IGNORECASE)
+    return question
+
+
+def remove_dates(question):
+    """The question with ISO dates, 'June 2025' style months and bare years cut out"""
+    month_names = "|".join(sorted(MONTHS, key=len, reverse=True))
+    question = re.sub(r"\b\d{4}-\d{2}-\d{2}\b", " ", question)
+    question = re.sub(rf"\b(?:{month_names})\.?\s+\d{{4}}\b", " ", question, flags=re.IGNORECASE)
+    return re.sub(r"\b(?:20\d{2}|19\d{2})\b", " ", question)
+
+
+def unbound_constraints(question, template, entities, other_values=()):
+    """Constraints in the question that the template would silently drop; empty if it answers it fully"""
+    leftovers = []
+    filters = template['filters']
+    for key, entity in (('department', 'departments'), ('project', 'projects'), ('date', 'date_range')):
+        if entities[entity] and key not in filters:
+            leftovers.append(entity)
+
+    if NEGATION_PATTERN.search(question):
+        leftovers.append("negation")
+
+    # Employees, business units, designations and the like are recognised but never bound
+    named = find_values(question, other_values)
+    if named:
+        leftovers.append(f"unsupported values: {', '.join(named)}")
+
+    # Any number left over (IDs, codes, counts, thresholds) is a constraint too
+    rest = remove_dates(remove_values(question, entities['departments'] + entities['projects']))
+    if re.search(r"\d", rest):
+        leftovers.append("numbers or codes")
+
+    return leftovers
+
+
+def month_range(year, month):
+    """First and last day of a month"""
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def find_date_range(question):
+    """Date range mentioned as ISO dates, 'June 2025' or a bare year; None if there is none"""
+    iso_dates = re.findall(r"\b(\d{4})-(\d{2})-(\d{2})\b", question)
+    try:
+        if len(iso_dates) >= 2:
+            bounds = sorted(date(int(y), int(m), int(d)) for y, m, d in iso_dates[:2])
+            return bounds[0], bounds[1]
+        if len(iso_dates) == 1:
+            day = date(*(int(part) for part in iso_dates[0]))
+            return day, day
+    except ValueError:
+        return None
+
+    month_names = "|".join(sorted(MONTHS, key=len, reverse=True))
+    months = re.findall(rf"\b({month_names})\.?\s+(\d{{4}})\b", question, re.IGNORECASE)
+    if months:
+        ranges = [month_range(int(year), MONTHS[name.lower()]) for name, year in months]
+        return min(start for start, _ in ranges), max(end for _, end in ranges)
+
+    years = re.findall(r"\b(20\d{2}|19\d{2})\b", question)
+    if years:
+        return date(int(min(years)), 1, 1), date(int(max(years)), 12, 31)
+
+    return None
+
+
+def sql_literal(value):
+    """Quote a string for inlining; values always come from the known-value lists or parsed dates"""
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def build_where(template, entities):
+    """AND clauses for the extracted entities the template can filter on"""
+    filters = template['filters']
+    clauses = []
+    if entities['departments'] and 'department' in filters:
+        clauses.append(f"{filters['department']} IN ({', '.join(sql_literal(v) for v in entities['departments'])})")
+    if entities['projects'] and 'project' in filters:
+        clauses.append(f"{filters['project']} IN ({', '.join(sql_literal(v) for v in entities['projects'])})")
+    if entities['date_range'] and 'date' in filters:
+        start, end = entities['date_range']
+        clauses.append(f"CAST({filters['date']} AS DATE) BETWEEN DATE {sql_literal(start)} AND DATE {sql_literal(end)}")
+    return "".join(f" AND {clause}" for clause in clauses)
+
+
+def match(question, departments=(), projects=(), other_values=(), min_confidence=MIN_CONFIDENCE):
+    """Best template for a question as a dict with name, sql, confidence and entities, or None"""
+    words = normalise_words(question)
+    scored = [(score(template, words), len(template['groups']), template) for template in TEMPLATES]
+    confidence, _, template = max(scored, key=lambda item: (item[0], item[1]))
+    if confidence < min_confidence:
+        return None
+
+    entities = {
+        'departments': find_values(question, departments),
+        'projects': find_values(question, projects),
+        'date_range': find_date_range(question)
+    }
+    # A template that would drop part of the question answers it wrongly; leave those to the LLM
+    if unbound_constraints(question, template, entities, other_values):
+        return None
+
+    return {
+        'name': template['name'],
+        'sql': template['sql'].format(where=build_where(template, entities)),
+        'confidence': confidence,
+        'entities': entities
+    }
@@ -0,0 +1,198 @@
+# SQL behind the dashboard's predefined and custom reports, shared by app.py and bench_queries.py
+
+# Predefined reports that are a plain dump of one table
+TABLE_REPORTS = {
+    "Employee Roster": "employee_master",
+    "Exit Report": "employee_exit_report",
+    "Work Profile": "employee_work_profile",
+    "Experience Summary": "employee_experience_report"
+}
+
+CUSTOM_REPORT_TYPES = ["Employee Details", "Project Assignments", "Attendance Records", "Timesheet Summary"]
+
+PROJECT_SUMMARY_QUERY = """
+    SELECT
+        DISTINCT t."Project ID",
+        t."Project Name",
+        COUNT(DISTINCT t."Employee Code") as "Total Employees",
+        ROUND(SUM(t."Hours Worked"), 2) as "Total Hours",
+        MIN(t."Date") as "Start Date",
+        MAX(t."Date") as "Latest Activity Date",
+        COUNT(DISTINCT t."Date") as "Active Days"
+    FROM timesheets t
+    GROUP BY t."Project ID", t."Project Name"
+    ORDER BY t."Project ID"
+"""
+
+PROJECT_EMPLOYEES_QUERY = """
+    SELECT
+        e."Employee Name",
+        e."Department",
+        ROUND(SUM(t."Hours Worked"), 2) as "Total Hours",
+        COUNT(DISTINCT t."Date") as "Days Worked",
+        MIN(t."Date") as "First Day",
+        MAX(t."Date") as "Last Day"
+    FROM timesheets t
+    JOIN employee_master e ON t."Employee Code" = e."Employee Code"
+    WHERE t."Project ID" = ?
+    GROUP BY e."Employee Name", e."Department"
+    ORDER BY "Total Hours" DESC
+"""
+
+EMPLOYEE_PROJECT_SUMMARY_QUERY = """
+    SELECT
+        e.*,
+        COALESCE((SELECT COUNT(DISTINCT t."Project ID")
+                 FROM timesheets t
+                 WHERE t."Employee Code" = e."Employee Code"), 0) as "Projects Count",
+        COALESCE((SELECT ROUND(SUM(t."Hours Worked"), 2)
+                 FROM timesheets t
+                 WHERE t."Employee Code" = e."Employee Code"), 0) as "Total Hours Worked"
+    FROM employee_master e
+    ORDER BY e."Employee Code"
+"""
+
+EMPLOYEE_PROJECTS_QUERY = """
+    SELECT
+        t."Project ID",
+        t."Project Name",
+        ROUND(SUM(t."Hours Worked"), 2) as "Total Hours",
+        COUNT(DISTINCT t."Date") as "Days Worked",
+        MIN(t."Date") as "First Day",
+        MAX(t."Date") as "Last Day"
+    FROM timesheets t
+    WHERE t."Employee Code" = ?
+    GROUP BY t."Project ID", t."Project Name"
+    ORDER BY "Total Hours" DESC
+"""
+
+
+def table_report_query(report):
+    """Query for a predefined single-table report"""
+    return f"SELECT * FROM {TABLE_REPORTS[report]}"
+
+
+def reconciliation_query(only_discrepancies=False, tolerance=0.5):
+    """Attendance vs timesheet report, optionally limited to discrepancies above a tolerance"""
+    query = """
+        SELECT
+            "Employee Code",
+            "Date",
+            "Clock-In Time",
+            "Clock-Out Time",
+            "Attendance Hours",
+            "Timesheet Hours",
+            "Projects Count",
+            "Discrepancy"
+        FROM attendance_reconciliation
+    """
+    params = []
+    if only_discrepancies:
+        query += " WHERE ABS(\"Discrepancy\") > ?"
+        params.append(tolerance)
+    query += " ORDER BY \"Date\", \"Employee Code\""
+    return query, params
+
+
+def in_filter(column, values):
+    """IN clause and parameters for a multiselect, or nothing when it is empty or includes 'All'"""
+    if not values or "All" in values:
+        return "", []
+    placeholders = ",".join(["?" for _ in values])
+    return f" AND {column} IN ({placeholders})", list(values)
+
+
+def date_filter(column, start_date, end_date):
+    """Inclusive date range clause and parameters; either bound may be None"""
+    clause = ""
+    params = []
+    if start_date:
+        clause += f" AND {column} >= ?"
+        params.append(start_date.strftime('%Y-%m-%d'))
+    if end_date:
+        clause += f" AND {column} <= ?"
+        params.append(end_date.strftime('%Y-%m-%d'))
+    return clause, params
+
+
+def custom_report_query(report_type, employees=(), departments=(), projects=(), start_date=None, end_date=None):
+    """Query and parameters for a custom report with the builder's filters applied"""
+    if report_type == "Employee Details":
+        query = "SELECT * FROM employee_master WHERE 1=1"
+        filters = [in_filter("\"Employee Name\"", employees), in_filter("Department", departments)]
+        order_by = ""
+        group_by = ""
+
+    elif report_type == "Project Assignments":
+        query = """
+            SELECT
+                t."Date",
+                t."Employee Code",
+                e."Employee Name",
+                e.Department,
+                t."Project ID",
+                t."Project Name",
+                t."Hours Worked"
+            FROM timesheets t
+            JOIN employee_master e ON t."Employee Code" = e."Employee Code"
+            WHERE 1=1
+        """
+        filters = [
+            in_filter("e.\"Employee Name\"", employees),
+            in_filter("e.Department", departments),
+            in_filter("t.\"Project Name\"", projects),
+            date_filter("t.\"Date\"", start_date, end_date)
+        ]
+        group_by = ""
+        order_by = " ORDER BY t.\"Date\", e.\"Employee Name\""
+
+    elif report_type == "Attendance Records":
+        query = """
+            SELECT
+                a."Date",
+                a."Employee Code",
+                e."Employee Name",
+                e.Department,
+                a."Clock-In Time",
+                a."Clock-Out Time",
+                a."Total Hours"
+            FROM daily_attendance a
+            JOIN employee_master e ON a."Employee Code" = e."Employee Code"
+            WHERE 1=1
+        """
+        filters = [
+            in_filter("e.\"Employee Name\"", employees),
+            in_filter("e.Department", departments),
+            date_filter("a.\"Date\"", start_date, end_date)
+        ]
+        group_by = ""
+        order_by = " ORDER BY a.\"Date\", e.\"Employee Name\""
+
+    elif report_type == "Timesheet Summary":
+        query = """
+            SELECT
+                e."Employee Name",
+                e.Department,
+                t."Project Name",
+                ROUND(SUM(t."Hours Worked"), 2) as "Total Hours"
+            FROM timesheets t
+            JOIN employee_master e ON t."Employee Code" = e."Employee Code"
+            WHERE 1=1
+        """
+        filters = [
+            in_filter("e.\"Employee Name\"", employees),
+            in_filter("e.Department", departments),
+            in_filter("t.\"Project Name\"", projects),
+            date_filter("t.\"Date\"", start_date, end_date)
+        ]
+        group_by = " GROUP BY e.\"Employee Name\", e.Department, t.\"Project Name\""
+        order_by = " ORDER BY e.\"Employee Name\", t.\"Project Name\""
+
+    else:
+        raise ValueError(f"Unknown report type: {report_type}")
+
+    params = []
+    for clause, clause_params in filters:
+        query += clause
+        params.extend(clause_params)
+    return query + group_by + order_by, params
@@ -0,0 +1,160 @@
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+
+class ResultStore:
+    # Holds each dashboard session's latest result as Arrow under a global memory
+    # budget, spilling least recently used results to Parquet and dropping idle ones
+
+    def __init__(self, memory_budget_mb=256, idle_ttl_seconds=1800, spill_dir=None):
+        self.memory_budget = memory_budget_mb * 1024 * 1024
+        self.idle_ttl = idle_ttl_seconds
+        self.spill_dir = spill_dir or tempfile.mkdtemp(prefix="emps_results_")
+        self.lock = threading.Lock()
+        self.memory_used = 0
+
+        # session key -> entry, least recently used first
+        self.entries = OrderedDict()
+
+        atexit.register(shutil.rmtree, self.spill_dir, True)
+
+    def put(self, session_key, df):
+        """Store a session's latest result, replacing its previous one"""
+        import pyarrow as pa
+
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # Mixed-type object columns (e.g. from ad-hoc AI queries) are kept as text
+            table = pa.Table.from_pandas(df.astype(str), preserve_index=False)
+
+        with self.lock:
+            self._discard(session_key)
+            self.entries[session_key] = {
+                'table': table,
+                'path': None,
+                'nbytes': table.nbytes,
+                'rows': table.num_rows,
+                'last_access': time.time(),
+                'spilling': False
+            }
+            self.memory_used += table.nbytes
+            self._evict_idle()
+            spills = self._choose_spills()
+
+        # Parquet writes happen outside the lock so other sessions are not kept waiting on disk
+        for spill_key, entry in spills:
+            self._spill(spill_key, entry)
+
+    def get(self, session_key):
+        """Return a session's latest result as a DataFrame, or None if there is none"""
+        import pyarrow.parquet as pq
+
+        while True:
+            with self.lock:
+                entry = self.entries.get(session_key)
+                if entry is None:
+                    return None
+
+                entry['last_access'] = time.time()
+                self.entries.move_to_end(session_key)
+                table, path = entry['table'], entry['path']
+
+            if table is not None:
+                return table.to_pandas()
+
+            # Spilled results are read back on demand and stay on disk. The read happens outside the lock
+            # so other sessions are not kept waiting on disk; if the entry is replaced or dropped meanwhile,
+            # look it up again
+            try:
+                table = pq.read_table(path)
+            except OSError:
+                with self.lock:
+                    if self.entries.get(session_key) is entry:
+                        raise
+                continue
+
+            with self.lock:
+                if self.entries.get(session_key) is entry:
+                    break
+
+        return table.to_pandas()
+
+    def discard(self, session_key):
+        """Drop a session's stored result"""
+        with self.lock:
+            self._discard(session_key)
+
+    def stats(self):
+        """Summary of memory use for monitoring"""
+        with self.lock:
+            return {
+                'sessions': len(self.entries),
+                'in_memory': sum(1 for entry in self.entries.values()
+                                 if entry['table'] is not None and not entry['spilling']),
+                'spilled': sum(1 for entry in self.entries.values() if entry['path'] is not None),
+                'memory_used_mb': self.memory_used / (1024 * 1024),
+                'memory_budget_mb': self.memory_budget / (1024 * 1024)
+            }
+
+    def _discard(self, session_key):
+        entry = self.entries.pop(session_key, None)
+        if entry is None:
+            return
+
+        # A result being spilled is already off the memory total, and its writer removes the file
+        if entry['spilling']:
+            return
+        if entry['table'] is not None:
+            self.memory_used -= entry['nbytes']
+        if entry['path'] is not None and os.path.exists(entry['path']):
+            os.remove(entry['path'])
+
+    def _choose_spills(self):
+        # Pick least recently used results until the in-memory total fits the budget. They leave the
+        # total now, so concurrent puts don't pick them again, and are served from memory until written
+        spills = []
+        for session_key, entry in self.entries.items():
+            if self.memory_used <= self.memory_budget:
+                break
+            if entry['table'] is not None and not entry['spilling']:
+                entry['spilling'] = True
+                entry['path'] = os.path.join(self.spill_dir, f"{uuid.uuid4().hex}.parquet")
+                self.memory_used -= entry['nbytes']
+                spills.append((session_key, entry))
+        return spills
+
+    def _spill(self, session_key, entry):
+        import pyarrow.parquet as pq
+
+        path = entry['path']
+        try:
+            pq.write_table(entry['table'], path)
+            written = True
+        except Exception:
+            written = False
+
+        with self.lock:
+            if self.entries.get(session_key) is entry:
+                entry['spilling'] = False
+                if written:
+                    entry['table'] = None
+                    return
+                # Keep the result in memory; a later put spills it again
+                entry['path'] = None
+                self.memory_used += entry['nbytes']
+
+        # Replaced or discarded while being written, or the write failed part way
+        if os.path.exists(path):
+            os.remove(path)
+
+    def _evict_idle(self):
+        cutoff = time.time() - self.idle_ttl
+        for session_key in [key for key, entry in self.entries.items() if entry['last_access'] < cutoff]:
+            self._discard(session_key)
@@ -0,0 +1,63 @@
+import os
+import re
+import time
+
+import duckdb
+
+# Published dashboard database; the dashboard only ever opens it read-only. After the first publish it is
+# a symlink to the current snapshot file
+DB_PATH = os.getenv("DUCKDB_PATH", "employee_reports.duckdb")
+
+# Published snapshot files kept on disk, so sessions still reading the previous one are not cut off
+KEEP_SNAPSHOTS = 2
+
+
+def build_path(db_path=DB_PATH):
+    """Path the next snapshot is built at, alongside the published one"""
+    return f"{db_path}.{os.getpid()}.building"
+
+
+def snapshot_files(db_path=DB_PATH):
+    """Published snapshot files of a database, oldest first"""
+    directory = os.path.dirname(os.path.abspath(db_path))
+    root, extension = os.path.splitext(os.path.basename(db_path))
+    pattern = re.compile(rf"{re.escape(root)}\.(\d+){re.escape(extension)}$")
+    matches = [(int(match.group(1)), name) for name in os.listdir(directory)
+               for match in [pattern.match(name)] if match]
+    return [os.path.join(directory, name) for _, name in sorted(matches)]
+
+
+def publish(build_file, db_path=DB_PATH):
+    """Publish a freshly built snapshot under its own file name and atomically point db_path at it"""
+    # DuckDB caches open databases by path, so a process that has a snapshot open would keep
+    # getting it back if the next one replaced it under the same name
+    root, extension = os.path.splitext(db_path)
+    snapshot_file = f"{root}.{time.time_ns()}{extension}"
+    os.replace(build_file, snapshot_file)
+
+    link = f"{db_path}.{os.getpid()}.link"
+    if os.path.lexists(link):
+        os.remove(link)
+    os.symlink(os.path.basename(snapshot_file), link)
+    os.replace(link, db_path)
+
+    # Make the rename durable before readers are told about it
+    dir_fd = os.open(os.path.dirname(os.path.abspath(db_path)), os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+    for old_file in snapshot_files(db_path)[:-KEEP_SNAPSHOTS]:
+        os.remove(old_file)
+
+
+def snapshot_version(db_path=DB_PATH):
+    """Identify the published snapshot as (file, modified time); changes every time a new one is published"""
+    snapshot_file = os.path.realpath(db_path)
+    return snapshot_file, os.stat(snapshot_file).st_mtime_ns
+
+
+def connect(version):
+    """Open a published snapshot read-only by the file its version names"""
+    return duckdb.connect(version[0], read_only=True)
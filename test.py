@@ -1,157 +1,315 @@
-from faker import Faker
-import pandas as pd
-import random
-from datetime import timedelta, datetime
-
-fake = Faker()
-Faker.seed(0)
-random.seed(0)
-
-num_employees = 50
-start_date = datetime(2025, 6, 1)
-end_date = datetime(2025, 6, 7)
-date_range = pd.date_range(start=start_date, end=end_date)
-
-# Helper
-def rand_date(start, end):
-    return fake.date_between(start, end)
-
-def round_hours(dt):
-    return round(dt.total_seconds() / 3600, 2)
-
-# Employee Master
-employees = []
-for i in range(1, num_employees + 1):
-    emp_code = f"EMP{i:04d}"
-    doj = rand_date('-10y', '-1y')
-    dob = rand_date('-50y', '-25y')
-    employees.append({
-        "Employee Code": emp_code,
-        "Employee Name": fake.name(),
-        "Email": fake.email(),
-        "Additional Email": fake.email(),
-        "Mobile Number": fake.phone_number(),
-        "Secondary Mobile Number": fake.phone_number(),
-        "Gender": random.choice(["Male", "Female", "Other"]),
-        "Date Of Joining": doj,
-        "Date Of Birth": dob,
-        "Fax": fake.phone_number(),
-        "Marital Status": random.choice(["Single", "Married"]),
-        "Self Service": random.choice(["Yes", "No"]),
-        "Employee Type": random.choice(["Full Time", "Part Time", "Intern"]),
-        "Office Location": fake.city(),
-        "Business Unit": random.choice(["Tech", "HR", "Marketing"]),
-        "Designation": random.choice(["Manager", "Engineer", "Analyst"]),
-        "Department": random.choice(["IT", "Sales", "Support"]),
-        "Grade": random.choice(["A", "B", "C"]),
-        "Parent Department": random.choice(["Corporate", "Engineering"]),
-        "Primary Manager": fake.name(),
-        "Primary Manager Email": fake.email(),
-        "Bank Name": fake.company(),
-        "Branch Name": fake.city(),
-        "Account Holder Name": fake.name(),
-        "Account Number": fake.iban(),
-        "Account Type": random.choice(["Savings", "Current"]),
-        "IFSC Code": f"IFSC{random.randint(1000,9999)}",
-        "Swift Code": f"SW{random.randint(100000,999999)}",
-        "PAN Number": fake.bothify(text='?????####?'),
-        "Aadhaar Enrollment Number": fake.bothify(text='############'),
-        "Aadhaar Number": fake.bothify(text='############'),
-        "Present Address": fake.address(),
-        "Present State": fake.state(),
-        "Present City": fake.city(),
-        "Present Pincode": fake.postcode(),
-        "Present Country": "India",
-        "Permanent Address": fake.address(),
-        "Permanent State": fake.state(),
-        "Permanent City": fake.city(),
-        "Permanent Pincode": fake.postcode(),
-        "Permanent Country": "India",
-        "Status": random.choice(["Active", "Inactive"])
-    })
-
-df_emp = pd.DataFrame(employees)
-df_emp.to_csv("employee_master.csv", index=False)
-
-# Exit Report
-exit_report = []
-for emp in employees[:10]:  # 10 employees resigned
-    doj = pd.to_datetime(emp["Date Of Joining"])
-    exit_date = doj + timedelta(days=random.randint(500, 3000))
-    exit_report.append({
-        "Employee Code": emp["Employee Code"],
-        "Employee Name": emp["Employee Name"],
-        "Business Unit": emp["Business Unit"],
-        "Designation": emp["Designation"],
-        "Date Of Joining": doj.date(),
-        "Exit Date": exit_date.date(),
-        "Expected Resignation Date": (exit_date - timedelta(days=30)).date()
-    })
-pd.DataFrame(exit_report).to_csv("employee_exit_report.csv", index=False)
-
-# Work Profile
-work_profiles = [{
-    "Employee Code": emp["Employee Code"],
-    "Employee Name": emp["Employee Name"],
-    "Business Unit": emp["Business Unit"],
-    "Parent Designation": "Senior " + emp["Designation"],
-    "Assigned Department": emp["Department"],
-    "Designation": emp["Designation"],
-    "Office Location Name": emp["Office Location"]
-} for emp in employees]
-pd.DataFrame(work_profiles).to_csv("employee_work_profile.csv", index=False)
-
-# Experience Report
-experience_reports = []
-for emp in employees:
-    current_exp = round(random.uniform(1.0, 10.0), 2)
-    past_exp = round(random.uniform(0.0, 5.0), 2)
-    total_exp = round(current_exp + past_exp, 2)
-    experience_reports.append({
-        "Employee Code": emp["Employee Code"],
-        "Employee Name": emp["Employee Name"],
-        "Business Unit": emp["Business Unit"],
-        "Department": emp["Department"],
-        "Designation": emp["Designation"],
-        "Date Of Joining": emp["Date Of Joining"],
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+
+FIRST_NAMES = np.array(["Aarav", "Vivaan", "Aditya", "Ananya", "Diya", "Ishaan", "Kavya", "Meera", "Rohan",
+                        "Saanvi", "Arjun", "Priya", "Rahul", "Neha", "Vikram", "Pooja", "Karan", "Sneha",
+                        "Amit", "Riya", "James", "Maria", "David", "Sarah", "Daniel", "Laura"])
+LAST_NAMES = np.array(["Sharma", "Verma", "Patel", "Gupta", "Reddy", "Iyer", "Nair", "Singh", "Kumar", "Mehta",
+                       "Joshi", "Rao", "Das", "Khan", "Smith", "Johnson", "Brown", "Garcia", "Miller", "Wilson"])
+CITIES = np.array(["Mumbai", "Delhi", "Bengaluru", "Hyderabad", "Chennai", "Pune", "Kolkata", "Ahmedabad",
+                   "Jaipur", "Kochi"])
+STATES = np.array(["Maharashtra", "Delhi", "Karnataka", "Telangana", "Tamil Nadu", "Maharashtra", "West Bengal",
+                   "Gujarat", "Rajasthan", "Kerala"])
+STREETS = np.array(["MG Road", "Park Street", "Station Road", "Church Street", "Lake View", "Hill Road",
+                    "Ring Road", "Market Lane"])
+PROJECT_WORDS = np.array(["Synergize", "Streamline", "Orchestrate", "Leverage", "Integrate", "Optimize",
+                          "Transform", "Deliver", "Scale", "Modernize"])
+PROJECT_OBJECTS = np.array(["Platforms", "Pipelines", "Portals", "Analytics", "Workflows", "Channels",
+                            "Infrastructure", "Experiences", "Marketplaces", "Systems"])
+
+DIGITS = np.array(list("0123456789"))
+LETTERS = np.array(list("ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+
+EPOCH = date(1970, 1, 1)
+
+
+def random_strings(rng, n, alphabet, length):
+    """n random fixed-length strings drawn from an alphabet, without a Python loop"""
+    chars = alphabet[rng.integers(0, len(alphabet), size=(n, length))]
+    return np.ascontiguousarray(chars).view(f"<U{length}").ravel()
+
+
+def join(*parts):
+    """Element-wise string concatenation of arrays and scalars"""
+    result = np.asarray(parts[0]).astype(str)
+    for part in parts[1:]:
+        result = np.char.add(result, np.asarray(part).astype(str))
+    return result
+
+
+def days_since_epoch(value):
+    return (value - EPOCH).days
+
+
+def as_date32(days):
+    """Arrow date column from integer days since the epoch (zero-copy)"""
+    return pa.array(np.asarray(days, dtype=np.int32)).view(pa.date32())
+
+
+def as_time32(seconds):
+    """Arrow time-of-day column from integer seconds since midnight (zero-copy)"""
+    return pa.array(np.asarray(seconds, dtype=np.int32)).view(pa.time32("s"))
+
+
+def employee_codes(num_employees):
+    width = max(4, len(str(num_employees)))
+    return join("EMP", np.char.zfill(np.arange(1, num_employees + 1).astype(str), width))
+
+
+def build_employees(num_employees, seed, today):
+    """Employee master columns as arrays, sampled in one vectorized pass"""
+    rng = np.random.default_rng([seed, 0])
+    n = num_employees
+    codes = employee_codes(n)
+
+    first = FIRST_NAMES[rng.integers(0, len(FIRST_NAMES), n)]
+    last = LAST_NAMES[rng.integers(0, len(LAST_NAMES), n)]
+    names = join(first, " ", last)
+    email_stem = np.char.lower(join(first, ".", last, np.arange(1, n + 1)))
+    present_city = rng.integers(0, len(CITIES), n)
+    permanent_city = rng.integers(0, len(CITIES), n)
+
+    today_days = days_since_epoch(today)
+    joining = today_days - rng.integers(365, 3650, n)
+    birth = today_days - rng.integers(25 * 365, 50 * 365, n)
+
+    def choice(options):
+        return np.array(options)[rng.integers(0, len(options), n)]
+
+    def address(city_index):
+        return join(rng.integers(1, 500, n), " ", STREETS[rng.integers(0, len(STREETS), n)], ", ",
+                    CITIES[city_index])
+
+    def phone():
+        return join("+91 ", rng.integers(6_000_000_000, 9_999_999_999, n))
+
+    return {
+        "Employee Code": codes,
+        "Employee Name": names,
+        "Email": join(email_stem, "@example.com"),
+        "Additional Email": join(email_stem, "@mail.example.com"),
+        "Mobile Number": phone(),
+        "Secondary Mobile Number": phone(),
+        "Gender": choice(["Male", "Female", "Other"]),
+        "Date Of Joining": as_date32(joining),
+        "Date Of Birth": as_date32(birth),
+        "Fax": phone(),
+        "Marital Status": choice(["Single", "Married"]),
+        "Self Service": choice(["Yes", "No"]),
+        "Employee Type": choice(["Full Time", "Part Time", "Intern"]),
+        "Office Location": CITIES[rng.integers(0, len(CITIES), n)],
+        "Business Unit": choice(["Tech", "HR", "Marketing"]),
+        "Designation": choice(["Manager", "Engineer", "Analyst"]),
+        "Department": choice(["IT", "Sales", "Support"]),
+        "Grade": choice(["A", "B", "C"]),
+        "Parent Department": choice(["Corporate", "Engineering"]),
+        "Primary Manager": join(FIRST_NAMES[rng.integers(0, len(FIRST_NAMES), n)], " ",
+                                LAST_NAMES[rng.integers(0, len(LAST_NAMES), n)]),
+        "Primary Manager Email": join("manager", rng.integers(1, max(n // 10, 2), n), "@example.com"),
+        "Bank Name": choice(["State Bank", "HDFC Bank", "ICICI Bank", "Axis Bank"]),
+        "Branch Name": CITIES[rng.integers(0, len(CITIES), n)],
+        "Account Holder Name": names,
+        "Account Number": random_strings(rng, n, DIGITS, 14),
+        "Account Type": choice(["Savings", "Current"]),
+        "IFSC Code": join("IFSC", rng.integers(1000, 10000, n)),
+        "Swift Code": join("SW", rng.integers(100000, 1000000, n)),
+        "PAN Number": join(random_strings(rng, n, LETTERS, 5), random_strings(rng, n, DIGITS, 4),
+                           random_strings(rng, n, LETTERS, 1)),
+        "Aadhaar Enrollment Number": random_strings(rng, n, DIGITS, 12),
+        "Aadhaar Number": random_strings(rng, n, DIGITS, 12),
+        "Present Address": address(present_city),
+        "Present State": STATES[present_city],
+        "Present City": CITIES[present_city],
+        "Present Pincode": join(rng.integers(110000, 700000, n)),
+        "Present Country": np.full(n, "India"),
+        "Permanent Address": address(permanent_city),
+        "Permanent State": STATES[permanent_city],
+        "Permanent City": CITIES[permanent_city],
+        "Permanent Pincode": join(rng.integers(110000, 700000, n)),
+        "Permanent Country": np.full(n, "India"),
+        "Status": choice(["Active", "Inactive"])
+    }
+
+
+def build_master_tables(employees, seed):
+    """Derive the exit, work profile and experience tables from the employee master"""
+    rng = np.random.default_rng([seed, 1])
+    n = len(employees["Employee Code"])
+    joining = employees["Date Of Joining"].cast(pa.int32()).to_numpy().astype(np.int64)
+
+    # Roughly one in five employees has left
+    exited = np.flatnonzero(rng.random(n) < 0.2)
+    exit_days = joining[exited] + rng.integers(500, 3000, len(exited))
+    exit_report = {
+        "Employee Code": employees["Employee Code"][exited],
+        "Employee Name": employees["Employee Name"][exited],
+        "Business Unit": employees["Business Unit"][exited],
+        "Designation": employees["Designation"][exited],
+        "Date Of Joining": as_date32(joining[exited]),
+        "Exit Date": as_date32(exit_days),
+        "Expected Resignation Date": as_date32(exit_days - 30)
+    }
+
+    work_profile = {
+        "Employee Code": employees["Employee Code"],
+        "Employee Name": employees["Employee Name"],
+        "Business Unit": employees["Business Unit"],
+        "Parent Designation": join("Senior ", employees["Designation"]),
+        "Assigned Department": employees["Department"],
+        "Designation": employees["Designation"],
+        "Office Location Name": employees["Office Location"]
+    }
+
+    current_exp = np.round(rng.uniform(1.0, 10.0, n), 2)
+    past_exp = np.round(rng.uniform(0.0, 5.0, n), 2)
+    experience = {
+        "Employee Code": employees["Employee Code"],
+        "Employee Name": employees["Employee Name"],
+        "Business Unit": employees["Business Unit"],
+        "Department": employees["Department"],
+        "Designation": employees["Designation"],
+        "Date Of Joining": employees["Date Of Joining"],
         "Current Experience": current_exp,
         "Past Experience": past_exp,
-        "Total Experience": total_exp
-    })
-pd.DataFrame(experience_reports).to_csv("experience_report.csv", index=False)
-
-# Daily Attendance Report
-attendance = []
-for emp in employees:
-    for day in date_range:
-        clock_in = datetime.combine(day, datetime.min.time()) + timedelta(hours=random.randint(8, 10), minutes=random.randint(0, 59))
-        clock_out = clock_in + timedelta(hours=random.uniform(7.0, 9.0))
-        total_hours = round_hours(clock_out - clock_in)
-        attendance.append({
-            "Date": day.date(),
-            "Employee Code": emp["Employee Code"],
-            "Employee Name": emp["Employee Name"],
-            "Clock-In Time": clock_in.strftime("%H:%M:%S"),
-            "Clock-Out Time": clock_out.strftime("%H:%M:%S"),
-            "Total Hours": total_hours
-        })
-pd.DataFrame(attendance).to_csv("attendance_report_daily.csv", index=False)
-
-# Timesheet Report (Daily Project-wise)
-projects = [{"Project ID": f"PRJ{pid:03d}", "Project Name": fake.bs().title()} for pid in range(1, 6)]
-timesheets = []
-for emp in employees:
-    for day in date_range:
-        hours_left = 8.0
-        while hours_left > 0:
-            proj = random.choice(projects)
-            hrs = round(random.uniform(1.0, min(4.0, hours_left)), 2)
-            timesheets.append({
-                "Date": day.date(),
-                "Employee Code": emp["Employee Code"],
-                "Project ID": proj["Project ID"],
-                "Project Name": proj["Project Name"],
-                "Hours Worked": hrs
-            })
-            hours_left -= hrs
-pd.DataFrame(timesheets).to_csv("timesheet_report.csv", index=False)
\ No newline at end of file
+        "Total Experience": np.round(current_exp + past_exp, 2)
+    }
+
+    return exit_report, work_profile, experience
+
+
+def project_catalog(num_projects, seed):
+    rng = np.random.default_rng([seed, 2])
+    ids = join("PRJ", np.char.zfill(np.arange(1, num_projects + 1).astype(str), 3))
+    names = join(PROJECT_WORDS[rng.integers(0, len(PROJECT_WORDS), num_projects)], " ",
+                 PROJECT_OBJECTS[rng.integers(0, len(PROJECT_OBJECTS), num_projects)], " ",
+                 np.arange(1, num_projects + 1))
+    return ids, names
+
+
+def build_fact_chunk(codes, names, first_day, num_days, num_projects, seed, chunk_index):
+    """Attendance and timesheet columns for every employee over a run of days"""
+    rng = np.random.default_rng([seed, 100 + chunk_index])
+    n = len(codes)
+    rows = n * num_days
+
+    day = np.repeat(np.arange(first_day, first_day + num_days, dtype=np.int32), n)
+    employee = np.tile(np.arange(n), num_days)
+
+    clock_in = rng.integers(8 * 3600, 11 * 3600, rows)
+    worked = rng.integers(7 * 3600, 9 * 3600, rows)
+    attendance = {
+        "Date": as_date32(day),
+        "Employee Code": codes[employee],
+        "Employee Name": names[employee],
+        "Clock-In Time": as_time32(clock_in),
+        "Clock-Out Time": as_time32(clock_in + worked),
+        "Total Hours": np.round(worked / 3600, 2)
+    }
+
+    # One to four distinct projects per employee-day, splitting eight hours between them
+    project_ids, project_names = project_catalog(num_projects, seed)
+    max_entries = min(4, num_projects)
+    entries = rng.integers(1, max_entries + 1, rows)
+    slot = np.arange(max_entries)
+    used = slot[None, :] < entries[:, None]
+    weights = rng.random((rows, max_entries)) * used
+    hours = np.round(8.0 * weights / weights.sum(axis=1, keepdims=True), 2)
+    first_project = rng.integers(0, num_projects, rows)
+    project = (first_project[:, None] + slot[None, :]) % num_projects
+
+    entry_day = np.broadcast_to(day[:, None], used.shape)[used]
+    entry_employee = np.broadcast_to(employee[:, None], used.shape)[used]
+    entry_project = project[used]
+    timesheets = {
+        "Date": as_date32(entry_day),
+        "Employee Code": codes[entry_employee],
+        "Project ID": project_ids[entry_project],
+        "Project Name": project_names[entry_project],
+        "Hours Worked": hours[used]
+    }
+
+    return attendance, timesheets
+
+
+def write_table(columns, output_dir, stem, output_format, part=None):
+    """Write one table as CSV or Parquet, named so the watcher's file_mappings recognise it"""
+    table = pa.table({name: pa.array(values) if isinstance(values, np.ndarray) else values
+                      for name, values in columns.items()})
+    suffix = f"_part{part:05d}" if part is not None else ""
+    path = os.path.join(output_dir, f"{stem}{suffix}.{output_format}")
+
+    if output_format == "parquet":
+        pq.write_table(table, path)
+    else:
+        pacsv.write_csv(table, path)
+    return table.num_rows
+
+
+def generate_fact_chunk(args):
+    """Worker entry point: generate and write one chunk of attendance and timesheets"""
+    (codes, names, first_day, num_days, num_projects, seed, chunk_index,
+     output_dir, output_format, part) = args
+    attendance, timesheets = build_fact_chunk(codes, names, first_day, num_days, num_projects, seed, chunk_index)
+    return (write_table(attendance, output_dir, "attendance_report_dailycopy", output_format, part),
+            write_table(timesheets, output_dir, "timesheet_report", output_format, part))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic employee data for the watcher and dashboard")
+    parser.add_argument("--employees", type=int, default=50)
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2025, 6, 1))
+    parser.add_argument("--end", type=date.fromisoformat, default=date(2025, 6, 7))
+    parser.add_argument("--projects", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-days", type=int, default=7, help="Days of attendance/timesheets per output file")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes for fact chunks")
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--output-dir", default=".")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    started = time.perf_counter()
+
+    employees = build_employees(args.employees, args.seed, args.end)
+    exit_report, work_profile, experience = build_master_tables(employees, args.seed)
+    write_table(employees, args.output_dir, "employee_master", args.format)
+    write_table(exit_report, args.output_dir, "employee_exit_report", args.format)
+    write_table(work_profile, args.output_dir, "employee_work_profile", args.format)
+    write_table(experience, args.output_dir, "experience_report", args.format)
+    print(f"Wrote master tables for {args.employees} employees")
+
+    # Chunks are seeded by index, so output is identical for any number of workers
+    first_day = days_since_epoch(args.start)
+    total_days = days_since_epoch(args.end) - first_day + 1
+    chunk_starts = list(range(0, total_days, args.chunk_days))
+    chunked = len(chunk_starts) > 1
+    tasks = [
+        (employees["Employee Code"], employees["Employee Name"], first_day + offset,
+         min(args.chunk_days, total_days - offset), args.projects, args.seed, index,
+         args.output_dir, args.format, index + 1 if chunked else None)
+        for index, offset in enumerate(chunk_starts)
+    ]
+
+    attendance_rows = 0
+    timesheet_rows = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for index, (attendance_count, timesheet_count) in enumerate(executor.map(generate_fact_chunk, tasks), 1):
+            attendance_rows += attendance_count
+            timesheet_rows += timesheet_count
+            print(f"Chunk {index}/{len(tasks)}: {attendance_rows:,} attendance rows, "
+                  f"{timesheet_rows:,} timesheet rows")
+
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import os
+import unittest
+
+from watched_dir.database import DatabaseManager
+
+
+class FileKeyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.db_manager = DatabaseManager()
+
+    def test_same_name_in_different_archive_folders(self):
+        root = os.path.join("archive", "exports")
+        first = self.db_manager.file_key(os.path.join(root, "2024", "timesheet_report.csv"), root)
+        second = self.db_manager.file_key(os.path.join(root, "2025", "timesheet_report.csv"), root)
+        self.assertEqual(first, "2024/timesheet_report.csv")
+        self.assertEqual(second, "2025/timesheet_report.csv")
+
+    def test_without_root_ignores_mount_point(self):
+        self.assertEqual(
+            self.db_manager.file_key("/mnt/node1/watched_folder/unprocessed/timesheet_report.csv"),
+            self.db_manager.file_key("/srv/share/unprocessed/timesheet_report.csv")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
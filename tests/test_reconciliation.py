@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import duckdb
+
+import init_db
+from watched_dir.file_processor import FileProcessor
+
+
+class SnapshotBuildTest(unittest.TestCase):
+
+    def test_failed_reconciliation_is_not_published(self):
+        with tempfile.TemporaryDirectory() as directory:
+            build_file = os.path.join(directory, "employee_reports.duckdb.building")
+            with mock.patch('init_db.build_path', return_value=build_file), \
+                    mock.patch('init_db.load_csv_tables'), \
+                    mock.patch('init_db.build_reconciliation', side_effect=duckdb.Error("reconciliation failed")), \
+                    mock.patch('init_db.publish') as publish:
+                self.assertEqual(init_db.main(), 1)
+            publish.assert_not_called()
+            self.assertFalse(os.path.exists(build_file))
+
+
+class IngestReconciliationTest(unittest.TestCase):
+    # Needs the Postgres database configured by DB_* in the environment
+
+    def setUp(self):
+        self.processor = FileProcessor()
+        if not self.processor.db_manager.connect():
+            self.skipTest("Postgres is not reachable")
+        self.processor.db_manager.disconnect()
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.processed = os.path.join(self.directory.name, "processed")
+        os.mkdir(self.processed)
+        self.file_path = os.path.join(self.directory.name, "Timesheet_Report.csv")
+        with open(self.file_path, "w") as f:
+            f.write("Date,Employee Code,Project ID,Project Name,Hours Worked\n2025-03-03,EMP900,PRJ900,P,6\n")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_failed_refresh_fails_the_file(self):
+        with mock.patch.object(self.processor.db_manager, 'refresh_reconciliation', return_value=False):
+            self.assertFalse(self.processor.process_file(self.file_path, self.processed))
+        self.assertIn("Reconciliation refresh", self.processor.last_error)
+        # Left in place for the retry scheduler
+        self.assertTrue(os.path.exists(self.file_path))
+
+    def test_successful_refresh_moves_the_file(self):
+        self.assertTrue(self.processor.process_file(self.file_path, self.processed))
+        self.assertFalse(os.path.exists(self.file_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from result_store import ResultStore
+
+
+class ResultStoreTest(unittest.TestCase):
+
+    def setUp(self):
+        # A zero budget spills every result except while it is being written
+        self.store = ResultStore(memory_budget_mb=0)
+
+    def frame(self, value):
+        return pd.DataFrame({'employee_code': [f"EMP{value:03d}"], 'hours': [value]})
+
+    def test_spilled_result_reads_back(self):
+        self.store.put('a', self.frame(1))
+        self.assertEqual(self.store.stats()['spilled'], 1)
+        pd.testing.assert_frame_equal(self.store.get('a'), self.frame(1))
+
+    def test_discarded_result_is_gone(self):
+        self.store.put('a', self.frame(1))
+        self.store.discard('a')
+        self.assertIsNone(self.store.get('a'))
+
+    def test_spilled_read_does_not_block_other_sessions(self):
+        self.store.put('a', self.frame(1))
+        self.store.memory_budget = 1024 * 1024
+        self.store.put('b', self.frame(2))
+
+        reading = threading.Event()
+        release = threading.Event()
+        read_table = pq.read_table
+
+        def slow_read(path):
+            reading.set()
+            release.wait(5)
+            return read_table(path)
+
+        with mock.patch('pyarrow.parquet.read_table', slow_read):
+            reader = threading.Thread(target=self.store.get, args=('a',))
+            reader.start()
+            reading.wait(5)
+            start = time.perf_counter()
+            pd.testing.assert_frame_equal(self.store.get('b'), self.frame(2))
+            self.assertLess(time.perf_counter() - start, 1)
+            release.set()
+            reader.join()
+
+    def test_result_replaced_during_read_returns_new_result(self):
+        self.store.put('a', self.frame(1))
+        read_table = pq.read_table
+
+        def read_then_replace(path):
+            table = read_table(path)
+            self.store.memory_budget = 1024 * 1024
+            self.store.put('a', self.frame(2))
+            return table
+
+        results = []
+        with mock.patch('pyarrow.parquet.read_table', read_then_replace):
+            # In a thread, so a read that holds the store lock fails the test instead of deadlocking it
+            reader = threading.Thread(target=lambda: results.append(self.store.get('a')), daemon=True)
+            reader.start()
+            reader.join(5)
+        self.assertFalse(reader.is_alive())
+        pd.testing.assert_frame_equal(results[0], self.frame(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import tempfile
+import unittest
+
+import duckdb
+
+import snapshot
+
+
+class PublishTest(unittest.TestCase):
+    # The dashboard keeps its snapshot connection and session cursors open across reruns; a newly
+    # published snapshot must still reach it
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.directory.name, "employee_reports.duckdb")
+        self.connections = []
+
+    def tearDown(self):
+        for con in self.connections:
+            con.close()
+        self.directory.cleanup()
+
+    def publish(self, value):
+        build_file = snapshot.build_path(self.db_path)
+        con = duckdb.connect(build_file)
+        con.execute("CREATE TABLE employee_master AS SELECT ? AS employee_count", [value])
+        con.close()
+        snapshot.publish(build_file, self.db_path)
+
+    def open_published(self):
+        # As app.py does on each rerun: look up the published version and connect to it
+        con = snapshot.connect(snapshot.snapshot_version(self.db_path))
+        self.connections.append(con)
+        return con.cursor()
+
+    def read(self, cursor):
+        return cursor.execute("SELECT employee_count FROM employee_master").fetchone()[0]
+
+    def test_open_connection_sees_each_new_publish(self):
+        self.publish(1)
+        first = self.open_published()
+        self.assertEqual(self.read(first), 1)
+
+        self.publish(2)
+        self.assertEqual(self.read(self.open_published()), 2)
+        # Sessions still on the previous snapshot keep reading it
+        self.assertEqual(self.read(first), 1)
+
+        self.publish(3)
+        self.assertEqual(self.read(self.open_published()), 3)
+
+    def test_version_changes_on_publish(self):
+        self.publish(1)
+        first = snapshot.snapshot_version(self.db_path)
+        self.publish(2)
+        self.assertNotEqual(snapshot.snapshot_version(self.db_path), first)
+
+    def test_old_snapshots_are_removed(self):
+        for value in range(4):
+            self.publish(value)
+        self.assertEqual(len(snapshot.snapshot_files(self.db_path)), snapshot.KEEP_SNAPSHOTS)
+        with duckdb.connect(self.db_path, read_only=True) as con:
+            self.assertEqual(con.execute("SELECT employee_count FROM employee_master").fetchone()[0], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from decimal import Decimal
+
+import psycopg2
+import pyarrow as pa
+from psycopg2.extensions import Column
+
+from watched_dir.database import NUMERIC_OID, DatabaseManager
+
+
+def numeric_column(name, precision, scale):
+    return Column(name=name, type_code=NUMERIC_OID, precision=precision, scale=scale)
+
+
+class ArrowSchemaTest(unittest.TestCase):
+
+    def setUp(self):
+        self.db_manager = DatabaseManager()
+
+    def test_declared_numeric_is_decimal(self):
+        arrow_schema = self.db_manager._arrow_schema([numeric_column('hours_worked', 5, 2)])
+        self.assertEqual(arrow_schema.field('hours_worked').type, pa.decimal128(5, 2))
+
+    def test_aggregate_numeric_is_float(self):
+        # What psycopg2 reports for SUM(hours_worked) over DECIMAL(5,2)
+        arrow_schema = self.db_manager._arrow_schema([numeric_column('hours', 65535, 65531)])
+        self.assertEqual(arrow_schema.field('hours').type, pa.float64())
+
+        batch = self.db_manager._rows_to_record_batch([(Decimal('7.50'),), (None,)], arrow_schema)
+        self.assertEqual(batch.column(0).to_pylist(), [7.5, None])
+
+
+class StreamQueryTest(unittest.TestCase):
+    # Needs the Postgres database configured by DB_* in the environment
+
+    def setUp(self):
+        self.db_manager = DatabaseManager()
+        if not self.db_manager.connect():
+            self.skipTest("Postgres is not reachable")
+        with self.db_manager.connection.cursor() as cursor:
+            cursor.execute("CREATE TEMP TABLE stream_timesheets (project_id VARCHAR(50), hours_worked DECIMAL(5,2))")
+            cursor.execute("INSERT INTO stream_timesheets VALUES ('PRJ001', 4.25), ('PRJ001', 3.50), ('PRJ002', 8)")
+        self.db_manager.connection.commit()
+
+    def tearDown(self):
+        self.db_manager.disconnect()
+
+    def test_streams_sum_of_decimal(self):
+        batches = list(self.db_manager.stream_query(
+            "SELECT project_id, SUM(hours_worked) AS hours FROM stream_timesheets GROUP BY project_id ORDER BY 1",
+            output='arrow', chunk_rows=1
+        ))
+        self.assertEqual(len(batches), 2)
+        self.assertEqual({batch.schema for batch in batches}, {batches[0].schema})
+        self.assertEqual(pa.Table.from_batches(batches).column('hours').to_pylist(), [7.75, 8.0])
+
+    def test_query_error_propagates(self):
+        with self.assertRaises(psycopg2.errors.UndefinedColumn):
+            list(self.db_manager.stream_query("SELECT no_such_column FROM stream_timesheets", output='arrow'))
+        # The connection is usable again afterwards
+        self.assertEqual(self.db_manager.execute_query("SELECT 1 AS one")[0]['one'], 1)
+
+    def test_early_stop_ends_transaction(self):
+        rows = self.db_manager.stream_query("SELECT * FROM stream_timesheets", itersize=1)
+        next(rows)
+        rows.close()
+        self.assertEqual(self.db_manager.connection.get_transaction_status(),
+                         psycopg2.extensions.TRANSACTION_STATUS_IDLE)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import csv
+import logging
+from . import schema
+
+
+class ArrowCSVReader:
+    # Compression codec for each supported CSV extension
+    compression_codecs = {
+        '.csv': None,
+        '.csv.gz': 'gzip',
+        '.csv.zst': 'zstd'
+    }
+
+    def __init__(self, block_size_mb=16):
+        import pyarrow as pa
+
+        self.pa = pa
+        self.block_size = block_size_mb * 1024 * 1024
+        self.logger = logging.getLogger(__name__)
+
+    def clean_column_name(self, column):
+        """Clean a source header to match database schema"""
+        return schema.clean_column_name(column)
+
+    def read_header(self, file_path, compression):
+        """Read and parse only the header line of a (possibly compressed) CSV file"""
+        # Read whole blocks up to the first newline, so a multibyte character is never cut in half
+        head = b''
+        with self.pa.input_stream(file_path, compression=compression) as stream:
+            while b'\n' not in head:
+                block = stream.read(64 * 1024)
+                if not block:
+                    break
+                head += block
+        header_line = head.split(b'\n', 1)[0].decode('utf-8-sig').rstrip('\r')
+        return next(csv.reader([header_line]), [])
+
+    def read(self, file_path, extension, table_name):
+        """Read the mapped columns of a CSV file into an Arrow table in load order, or None if it cannot be typed"""
+        import pyarrow.csv as pacsv
+
+        compression = self.compression_codecs[extension]
+
+        # Declare registry types up front for the mapped columns, keyed by source header
+        try:
+            column_types = schema.arrow_types(table_name, self.read_header(file_path, compression))
+        except UnicodeDecodeError as e:
+            self.logger.warning(f"Arrow parser could not read the header of {file_path}: {str(e)}")
+            return None
+
+        read_options = pacsv.ReadOptions(use_threads=True, block_size=self.block_size)
+        convert_options = pacsv.ConvertOptions(
+            column_types=column_types,
+            include_columns=list(column_types),
+            strings_can_be_null=True
+        )
+
+        try:
+            with self.pa.input_stream(file_path, compression=compression) as stream:
+                table = pacsv.read_csv(stream, read_options=read_options, convert_options=convert_options)
+        except self.pa.ArrowInvalid as e:
+            self.logger.warning(f"Arrow parser could not read {file_path} with declared types: {str(e)}")
+            return None
+
+        table = table.rename_columns([self.clean_column_name(name) for name in table.column_names])
+        return table.select([column for column in schema.load_columns(table_name) if column in table.column_names])
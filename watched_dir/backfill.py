@@ -0,0 +1,181 @@
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from .database import DatabaseManager
+from .file_processor import FileProcessor
+
+# Load order: master data before the tables that refer to it, facts last
+TABLE_PHASES = [
+    ['employee_master'],
+    ['employee_exit_report', 'employee_work_profile', 'employee_experience_report'],
+    ['daily_attendance', 'timesheets']
+]
+
+# Full-dump tables are replayed oldest first in one worker so the newest dump wins
+SERIAL_TABLES = ('employee_master', 'employee_exit_report', 'employee_work_profile', 'employee_experience_report')
+
+# One FileProcessor (and database connection per file) in each worker process
+worker_processor = None
+
+
+def init_worker(log_level, root):
+    """Create the per-process FileProcessor"""
+    global worker_processor
+    logging.basicConfig(level=log_level, format='%(asctime)s - %(process)d - %(name)s - %(levelname)s - %(message)s')
+    # Archive files are checkpointed and claimed by their path under root, so same-named files in
+    # different subfolders are tracked separately
+    worker_processor = FileProcessor(key_root=root)
+
+
+def load_files(file_paths):
+    """Load files in order in a worker, leaving them in place; returns (path, ok, written, rejected, error) per file"""
+    results = []
+    for file_path in file_paths:
+        worker_processor.db_manager.last_write_stats = {'written': 0, 'rejected': 0}
+        ok = worker_processor.process_file(file_path, None)
+        stats = worker_processor.db_manager.last_write_stats
+        results.append((file_path, ok, stats['written'], stats['rejected'], worker_processor.last_error))
+    return results
+
+
+def discover_files(root):
+    """Find every supported file under root, grouped by target table"""
+    processor = FileProcessor()
+    files_by_table = {}
+    skipped = []
+
+    for dir_path, _, filenames in os.walk(root):
+        for filename in filenames:
+            file_path = os.path.join(dir_path, filename)
+            file_type = processor.identify_file_type(filename) if processor.is_supported_file(filename) else None
+            if not file_type:
+                skipped.append(file_path)
+                continue
+            table_name = processor.file_mappings[file_type]['table']
+            files_by_table.setdefault(table_name, []).append(file_path)
+
+    # Oldest first, so later exports of the same keys are applied last
+    for file_paths in files_by_table.values():
+        file_paths.sort(key=lambda path: (os.path.getmtime(path), path))
+
+    return files_by_table, skipped
+
+
+def set_indexes(tables, create):
+    """Drop or rebuild the managed secondary indexes of the given tables"""
+    db_manager = DatabaseManager()
+    if not db_manager.connect():
+        return False
+    try:
+        for table_name in tables:
+            if create:
+                db_manager.ensure_indexes(table_name)
+            else:
+                db_manager.drop_indexes(table_name)
+        return True
+    finally:
+        db_manager.disconnect()
+
+
+class Progress:
+    # Byte-weighted progress with rows/s and ETA across all phases
+
+    def __init__(self, total_files, total_bytes):
+        self.total_files = total_files
+        self.total_bytes = max(total_bytes, 1)
+        self.done_files = 0
+        self.done_bytes = 0
+        self.rows = 0
+        self.rejected = 0
+        self.failed = []
+        self.start = time.perf_counter()
+
+    def update(self, file_path, ok, written, rejected, error):
+        """Record one finished file and print a progress line"""
+        self.done_files += 1
+        self.done_bytes += os.path.getsize(file_path)
+        self.rows += written
+        self.rejected += rejected
+        if ok is False:
+            self.failed.append((file_path, error))
+
+        elapsed = time.perf_counter() - self.start
+        fraction = self.done_bytes / self.total_bytes
+        eta = elapsed * (1 - fraction) / fraction if fraction else 0
+        status = "claimed by another node" if ok is None else "ok" if ok else f"FAILED: {error}"
+        print(f"[{self.done_files}/{self.total_files} {fraction:6.1%}] {self.rows:,} rows "
+              f"({self.rows / max(elapsed, 1e-9):,.0f} rows/s) ETA {eta:,.0f}s - "
+              f"{os.path.basename(file_path)} {status}", flush=True)
+
+
+def main():
+    """Bulk-load an archive of historical exports in parallel"""
+    parser = argparse.ArgumentParser(description="Backfill historical export files into the database")
+    parser.add_argument('root', help="Directory tree of archived export files")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Parallel worker processes")
+    parser.add_argument('--defer-indexes', action='store_true',
+                        help="Drop secondary indexes on fact tables during the load and rebuild them at the end")
+    parser.add_argument('--log-level', default='WARNING')
+    args = parser.parse_args()
+
+    files_by_table, skipped = discover_files(args.root)
+    for file_path in skipped:
+        print(f"Skipping {file_path}: not a recognised export")
+
+    all_files = [path for paths in files_by_table.values() for path in paths]
+    if not all_files:
+        print("No files to load")
+        return 0
+
+    db_manager = DatabaseManager()
+    if not db_manager.connect():
+        return 1
+    try:
+        if not db_manager.create_all_tables():
+            return 1
+    finally:
+        db_manager.disconnect()
+
+    deferred = [table for table in TABLE_PHASES[-1] if table in files_by_table] if args.defer_indexes else []
+    if deferred:
+        print(f"Dropping secondary indexes on {', '.join(deferred)}")
+        set_indexes(deferred, create=False)
+
+    progress = Progress(len(all_files), sum(os.path.getsize(path) for path in all_files))
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=init_worker,
+                                 initargs=(args.log_level.upper(), args.root)) as executor:
+            for phase in TABLE_PHASES:
+                # Each job is a list of files loaded in order by one worker
+                jobs = []
+                for table_name in phase:
+                    file_paths = files_by_table.get(table_name, [])
+                    if table_name in SERIAL_TABLES:
+                        jobs.append(file_paths)
+                    else:
+                        jobs.extend([file_path] for file_path in file_paths)
+
+                futures = [executor.submit(load_files, job) for job in jobs if job]
+                for future in as_completed(futures):
+                    for result in future.result():
+                        progress.update(*result)
+    finally:
+        if deferred:
+            print(f"Rebuilding secondary indexes on {', '.join(deferred)}")
+            set_indexes(deferred, create=True)
+
+    elapsed = time.perf_counter() - progress.start
+    print(f"Loaded {progress.rows:,} rows from {progress.done_files - len(progress.failed)} of "
+          f"{progress.total_files} files in {elapsed:,.1f}s ({progress.rows / max(elapsed, 1e-9):,.0f} rows/s), "
+          f"{progress.rejected:,} rows rejected")
+    for file_path, error in progress.failed:
+        print(f"  failed: {file_path}: {error}")
+
+    return 1 if progress.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+import argparse
+import io
+import os
+import time
+from .file_processor import FileProcessor
+
+
+def time_pandas(processor, file_path, mapping):
+    """Current path: pandas parse, date normalisation and per-row record conversion"""
+    start = time.perf_counter()
+    df = processor.load_dataframe(file_path, mapping)
+    records = df.astype(object).where(df.notna(), None).to_dict('records')
+    return time.perf_counter() - start, len(records)
+
+
+def time_arrow(processor, file_path, mapping):
+    """Arrow path: multithreaded typed parse and CSV serialisation for COPY"""
+    import pyarrow.csv as pacsv
+
+    start = time.perf_counter()
+    table = processor.read_arrow_table(file_path, mapping)
+    if table is None:
+        return None, 0
+    buffer = io.BytesIO()
+    pacsv.write_csv(table, buffer, write_options=pacsv.WriteOptions(include_header=False))
+    return time.perf_counter() - start, table.num_rows
+
+
+def main():
+    """Benchmark the pandas and Arrow parse engines on the given files (no database needed)"""
+    parser = argparse.ArgumentParser(description="Compare FileProcessor parse engines")
+    parser.add_argument('files', nargs='+', help="CSV files named like the watched-folder drops")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per engine; the best time is reported")
+    args = parser.parse_args()
+
+    processor = FileProcessor()
+
+    for file_path in args.files:
+        file_type = processor.identify_file_type(os.path.basename(file_path))
+        if not file_type:
+            print(f"Skipping {file_path}: unknown file type")
+            continue
+
+        mapping = processor.file_mappings[file_type]
+        size_mb = os.path.getsize(file_path) / (1024 * 1024)
+        print(f"{os.path.basename(file_path)} ({size_mb:.1f} MB, {file_type})")
+
+        for engine, timer in (('pandas', time_pandas), ('arrow', time_arrow)):
+            timings = []
+            rows = 0
+            for _ in range(args.repeat):
+                elapsed, rows = timer(processor, file_path, mapping)
+                if elapsed is None:
+                    break
+                timings.append(elapsed)
+
+            if not timings:
+                print(f"  {engine:<7} could not parse with declared types")
+                continue
+
+            best = min(timings)
+            print(f"  {engine:<7} {best:8.3f}s  {rows / best:12,.0f} rows/s  {size_mb / best:8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import json
+import logging
+import select
+import time
+from datetime import date
+import psycopg2
+from .config import Config
+from .database import DatabaseManager
+
+
+class ChangeListener:
+    # Receives the change events FileProcessor publishes after each committed ingest
+
+    def __init__(self, tables):
+        self.config = Config()
+        self.logger = logging.getLogger(__name__)
+        self.tables = list(tables)
+        self.connection = None
+
+        # channel -> table, named the way DatabaseManager publishes them
+        db_manager = DatabaseManager()
+        self.channels = {db_manager.change_channel(table): table for table in self.tables}
+
+    def connect(self):
+        """Open a dedicated autocommit connection and LISTEN on every table's channel"""
+        try:
+            self.connection = psycopg2.connect(
+                host=self.config.DB_HOST,
+                port=self.config.DB_PORT,
+                database=self.config.DB_NAME,
+                user=self.config.DB_USER,
+                password=self.config.DB_PASSWORD
+            )
+            # Notifications are only delivered outside an open transaction
+            self.connection.autocommit = True
+            with self.connection.cursor() as cursor:
+                for channel in self.channels:
+                    cursor.execute(f"LISTEN {channel}")
+
+            self.logger.info(f"Listening for changes on {', '.join(self.tables)}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Change listener connection failed: {str(e)}")
+            return False
+
+    def close(self):
+        """Close the listening connection"""
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+    def parse_event(self, notify):
+        """Turn a notification into an event dict with date objects for the affected range"""
+        try:
+            event = json.loads(notify.payload)
+        except ValueError:
+            self.logger.warning(f"Ignoring malformed change event on {notify.channel}: {notify.payload}")
+            return None
+
+        event.setdefault('table', self.channels.get(notify.channel))
+        for key in ('date_min', 'date_max'):
+            if event.get(key):
+                event[key] = date.fromisoformat(event[key])
+        return event
+
+    def poll(self, timeout=5.0):
+        """Wait up to timeout seconds and return the events received, oldest first"""
+        if select.select([self.connection], [], [], timeout) == ([], [], []):
+            return []
+
+        self.connection.poll()
+        events = []
+        while self.connection.notifies:
+            event = self.parse_event(self.connection.notifies.pop(0))
+            if event:
+                events.append(event)
+        return events
+
+    def listen(self, callback, stop_event=None, timeout=5.0, reconnect_delay=5.0):
+        """Call callback(event) for every change until stop_event is set, reconnecting on failure"""
+        while not (stop_event and stop_event.is_set()):
+            if self.connection is None and not self.connect():
+                time.sleep(reconnect_delay)
+                continue
+
+            try:
+                for event in self.poll(timeout):
+                    callback(event)
+            except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+                # Events sent while disconnected are lost; consumers should do a full refresh on reconnect
+                self.logger.error(f"Change listener lost its connection: {str(e)}")
+                self.close()
+
+        self.close()
+
+
+def affects(event, date_from, date_to):
+    """Check if an event's date range overlaps [date_from, date_to]; undated events affect everything"""
+    if event.get('date_min') is None:
+        return True
+    return event['date_min'] <= date_to and event['date_max'] >= date_from
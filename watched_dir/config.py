@@ -1,4 +1,5 @@
 import os
+import socket
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -17,6 +18,51 @@ class Config:
     UNPROCESSED_FOLDER = os.getenv('UNPROCESSED_FOLDER', './watched_folder/unprocessed')
     UNDERPROCESSED_FOLDER = os.getenv('UNDERPROCESSED_FOLDER', './watched_folder/underprocessed')
     PROCESSED_FOLDER = os.getenv('PROCESSED_FOLDER', './watched_folder/processed')
+    DEAD_LETTER_FOLDER = os.getenv('DEAD_LETTER_FOLDER', './watched_folder/dead_letter')
+
+    # Retry Configuration
+    RETRY_STATE_FILE = os.getenv('RETRY_STATE_FILE', './watched_folder/retry_state.json')
+    MAX_RETRY_ATTEMPTS = int(os.getenv('MAX_RETRY_ATTEMPTS', '5'))
+    RETRY_BASE_DELAY_SECONDS = int(os.getenv('RETRY_BASE_DELAY_SECONDS', '30'))
+    RETRY_MAX_DELAY_SECONDS = int(os.getenv('RETRY_MAX_DELAY_SECONDS', '3600'))
+
+    # Ingestion Configuration
+    UPSERT_BATCH_SIZE = int(os.getenv('UPSERT_BATCH_SIZE', '5000'))
+    # Rows fetched per round trip by DatabaseManager.stream_query
+    STREAM_ITERSIZE = int(os.getenv('STREAM_ITERSIZE', '10000'))
+    # 'pandas' (default) or 'arrow' for the multithreaded pyarrow CSV reader
+    PARSE_ENGINE = os.getenv('PARSE_ENGINE', 'pandas').lower()
+    ARROW_BLOCK_SIZE_MB = int(os.getenv('ARROW_BLOCK_SIZE_MB', '16'))
+    # Plain CSV files at least this large are loaded in checkpointed chunks and resume after a restart
+    CHUNKED_INGEST_MIN_MB = int(os.getenv('CHUNKED_INGEST_MIN_MB', '256'))
+    INGEST_CHUNK_MB = int(os.getenv('INGEST_CHUNK_MB', '64'))
+    # Send a pg_notify change event on emps_<table>_changed after each committed ingest
+    NOTIFY_CHANGES = os.getenv('NOTIFY_CHANGES', 'true').lower() == 'true'
+    # Reject timesheet/attendance rows whose employee_code is not in employee_master
+    VALIDATE_EMPLOYEE_CODES = os.getenv('VALIDATE_EMPLOYEE_CODES', 'true').lower() == 'true'
+
+    # Ingest Scheduling
+    INGEST_WORKERS = int(os.getenv('INGEST_WORKERS', '2'))
+    # Seconds a queued file waits before it is promoted one priority level
+    INGEST_AGING_SECONDS = int(os.getenv('INGEST_AGING_SECONDS', '300'))
+    # Seconds a new file is left to finish being written before it is picked up
+    FILE_SETTLE_SECONDS = float(os.getenv('FILE_SETTLE_SECONDS', '2'))
+    # Files up to this size can also run on the dedicated express worker
+    EXPRESS_LANE_MAX_MB = int(os.getenv('EXPRESS_LANE_MAX_MB', '10'))
+    # Files for the same table arriving within this window are loaded together in one write (0 disables)
+    COALESCE_WINDOW_SECONDS = float(os.getenv('COALESCE_WINDOW_SECONDS', '2'))
+    COALESCE_MAX_FILES = int(os.getenv('COALESCE_MAX_FILES', '200'))
+    # Only files up to this size are coalesced; larger files are loaded on their own
+    COALESCE_MAX_MB = int(os.getenv('COALESCE_MAX_MB', '50'))
+
+    # Multi-node Configuration
+    # Coordinate several watchers on a shared drop folder through the file_claims table
+    MULTI_NODE = os.getenv('MULTI_NODE', 'false').lower() == 'true'
+    NODE_ID = os.getenv('NODE_ID', f"{socket.gethostname()}:{os.getpid()}")
+    CLAIM_LEASE_SECONDS = int(os.getenv('CLAIM_LEASE_SECONDS', '120'))
+    # Network filesystems (NFS/SMB) do not deliver inotify events from other hosts; poll instead
+    USE_POLLING_OBSERVER = os.getenv('USE_POLLING_OBSERVER', 'false').lower() == 'true'
+    POLLING_INTERVAL_SECONDS = int(os.getenv('POLLING_INTERVAL_SECONDS', '5'))
 
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
@@ -1,7 +1,30 @@
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extras import RealDictCursor, execute_batch
+import io
+import os
+import json
+import math
 import logging
+import uuid
+from datetime import date
 from .config import Config
+from . import schema
+
+NUMERIC_OID = 1700
+
+# Arrow types for the Postgres type OIDs a streamed result can hold; other types are streamed as text
+ARROW_TYPES = {
+    16: lambda pa: pa.bool_(),
+    20: lambda pa: pa.int64(),
+    21: lambda pa: pa.int16(),
+    23: lambda pa: pa.int32(),
+    700: lambda pa: pa.float32(),
+    701: lambda pa: pa.float64(),
+    1082: lambda pa: pa.date32(),
+    1083: lambda pa: pa.time64('us'),
+    1114: lambda pa: pa.timestamp('us'),
+    1184: lambda pa: pa.timestamp('us', tz='UTC')
+}
 
 
 class DatabaseManager:
@@ -10,130 +33,136 @@ class DatabaseManager:
         self.connection = None
         self.logger = logging.getLogger(__name__)
 
-        # Table schemas - defines the structure of each table
-        self.table_schemas = {
-            'employee_exit_report': """
-                CREATE TABLE IF NOT EXISTS employee_exit_report (
-                    id SERIAL PRIMARY KEY,
-                    employee_code VARCHAR(50) UNIQUE NOT NULL,
-                    employee_name VARCHAR(255),
-                    business_unit VARCHAR(255),
-                    designation VARCHAR(255),
-                    date_of_joining DATE,
-                    exit_date DATE,
-                    expected_resignation_date DATE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """,
-            'employee_master': """
-                CREATE TABLE IF NOT EXISTS employee_master (
-                    id SERIAL PRIMARY KEY,
-                    employee_code VARCHAR(50) UNIQUE NOT NULL,
-                    employee_name VARCHAR(255),
-                    email VARCHAR(255),
-                    additional_email VARCHAR(255),
-                    mobile_number VARCHAR(20),
-                    secondary_mobile_number VARCHAR(20),
-                    gender VARCHAR(10),
-                    date_of_joining DATE,
-                    date_of_birth DATE,
-                    fax VARCHAR(50),
-                    marital_status VARCHAR(50),
-                    self_service VARCHAR(10),
-                    employee_type VARCHAR(100),
-                    office_location VARCHAR(255),
-                    business_unit VARCHAR(255),
-                    designation VARCHAR(255),
-                    department VARCHAR(255),
-                    grade VARCHAR(50),
-                    parent_department VARCHAR(255),
-                    primary_manager VARCHAR(255),
-                    primary_manager_email VARCHAR(255),
-                    bank_name VARCHAR(255),
-                    branch_name VARCHAR(255),
-                    account_holder_name VARCHAR(255),
-                    account_number VARCHAR(100),
-                    account_type VARCHAR(50),
-                    ifsc_code VARCHAR(20),
-                    swift_code VARCHAR(20),
-                    pan_number VARCHAR(20),
-                    aadhaar_enrollment_number VARCHAR(50),
-                    aadhaar_number VARCHAR(20),
-                    present_address TEXT,
-                    present_state VARCHAR(100),
-                    present_city VARCHAR(100),
-                    present_pincode VARCHAR(10),
-                    present_country VARCHAR(100),
-                    permanent_address TEXT,
-                    permanent_state VARCHAR(100),
-                    permanent_city VARCHAR(100),
-                    permanent_pincode VARCHAR(10),
-                    permanent_country VARCHAR(100),
-                    status VARCHAR(50),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """,
-            'employee_work_profile': """
-                CREATE TABLE IF NOT EXISTS employee_work_profile (
+        # Table schemas - ingested tables are generated from the schema registry
+        self.table_schemas = {table_name: schema.create_table_sql(table_name) for table_name in schema.TABLES}
+        self.table_schemas.update({
+            'ingest_rejects': """
+                CREATE TABLE IF NOT EXISTS ingest_rejects (
                     id SERIAL PRIMARY KEY,
-                    employee_code VARCHAR(50) UNIQUE NOT NULL,
-                    employee_name VARCHAR(255),
-                    business_unit VARCHAR(255),
-                    parent_designation VARCHAR(255),
-                    assigned_department VARCHAR(255),
-                    designation VARCHAR(255),
-                    office_location_name VARCHAR(255),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """,
-            'employee_experience_report': """
-                CREATE TABLE IF NOT EXISTS employee_experience_report (
-                    id SERIAL PRIMARY KEY,
-                    employee_code VARCHAR(50) UNIQUE NOT NULL,
-                    employee_name VARCHAR(255),
-                    business_unit VARCHAR(255),
-                    department VARCHAR(255),
-                    designation VARCHAR(255),
-                    date_of_joining DATE,
-                    current_experience VARCHAR(50),
-                    past_experience VARCHAR(50),
-                    total_experience VARCHAR(50),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    table_name VARCHAR(100) NOT NULL,
+                    source_file VARCHAR(255),
+                    row_data JSONB,
+                    error TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """,
-            'timesheets': """
-                CREATE TABLE IF NOT EXISTS timesheets (
+            'attendance_reconciliation': """
+                CREATE TABLE IF NOT EXISTS attendance_reconciliation (
                     id SERIAL PRIMARY KEY,
                     date DATE NOT NULL,
                     employee_code VARCHAR(50) NOT NULL,
-                    project_id VARCHAR(50) NOT NULL,
-                    project_name VARCHAR(255),
-                    hours_worked DECIMAL(5,2),
+                    attendance_hours DECIMAL(5,2),
+                    timesheet_hours DECIMAL(7,2) DEFAULT 0,
+                    project_count INTEGER DEFAULT 0,
+                    discrepancy DECIMAL(7,2),
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(date, employee_code, project_id)
+                    UNIQUE(date, employee_code)
                 )
             """,
-            'daily_attendance': """
-                CREATE TABLE IF NOT EXISTS daily_attendance (
-                    id SERIAL PRIMARY KEY,
-                    date DATE NOT NULL,
-                    employee_code VARCHAR(50) NOT NULL,
-                    employee_name VARCHAR(255),
-                    clock_in_time TIME,
-                    clock_out_time TIME,
-                    total_hours DECIMAL(5,2),
+            'ingest_checkpoints': """
+                CREATE TABLE IF NOT EXISTS ingest_checkpoints (
+                    file_name VARCHAR(1024) PRIMARY KEY,
+                    table_name VARCHAR(100) NOT NULL,
+                    file_size BIGINT NOT NULL,
+                    file_mtime_ns BIGINT NOT NULL,
+                    byte_offset BIGINT NOT NULL,
+                    rows_committed BIGINT NOT NULL DEFAULT 0,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(date, employee_code)
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """,
+            'file_claims': """
+                CREATE TABLE IF NOT EXISTS file_claims (
+                    file_key VARCHAR(1024) PRIMARY KEY,
+                    node_id VARCHAR(255) NOT NULL,
+                    claimed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    heartbeat_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    lease_expires_at TIMESTAMP NOT NULL
                 )
             """
+        })
+
+        # Range-partitioned tables - maps table name to its monthly partition key
+        self.partitioned_tables = {
+            table_name: spec['partition_key'] for table_name, spec in schema.TABLES.items() if spec['partition_key']
+        }
+        # Whether each partitioned table really is partitioned in the database; tables created before
+        # partitioning existed stay plain tables and are loaded directly
+        self.partitioning_state = {}
+
+        # Managed secondary indexes - created idempotently alongside each table
+        self.table_indexes = {
+            'timesheets': {
+                'idx_timesheets_employee_date': """
+                    CREATE INDEX IF NOT EXISTS idx_timesheets_employee_date
+                    ON timesheets (employee_code, date)
+                """,
+                'idx_timesheets_project_date': """
+                    CREATE INDEX IF NOT EXISTS idx_timesheets_project_date
+                    ON timesheets (project_id, date)
+                """,
+                'idx_timesheets_hours_rollup': """
+                    CREATE INDEX IF NOT EXISTS idx_timesheets_hours_rollup
+                    ON timesheets (project_id, employee_code)
+                    INCLUDE (date, hours_worked)
+                """,
+                'brin_timesheets_date': """
+                    CREATE INDEX IF NOT EXISTS brin_timesheets_date
+                    ON timesheets USING BRIN (date)
+                """,
+                'brin_timesheets_updated_at': """
+                    CREATE INDEX IF NOT EXISTS brin_timesheets_updated_at
+                    ON timesheets USING BRIN (updated_at)
+                """
+            },
+            'daily_attendance': {
+                'idx_daily_attendance_employee_date': """
+                    CREATE INDEX IF NOT EXISTS idx_daily_attendance_employee_date
+                    ON daily_attendance (employee_code, date)
+                    INCLUDE (total_hours)
+                """,
+                'brin_daily_attendance_date': """
+                    CREATE INDEX IF NOT EXISTS brin_daily_attendance_date
+                    ON daily_attendance USING BRIN (date)
+                """,
+                'brin_daily_attendance_updated_at': """
+                    CREATE INDEX IF NOT EXISTS brin_daily_attendance_updated_at
+                    ON daily_attendance USING BRIN (updated_at)
+                """
+            },
+            'attendance_reconciliation': {
+                'idx_attendance_reconciliation_employee_date': """
+                    CREATE INDEX IF NOT EXISTS idx_attendance_reconciliation_employee_date
+                    ON attendance_reconciliation (employee_code, date)
+                """,
+                'idx_attendance_reconciliation_discrepancy': """
+                    CREATE INDEX IF NOT EXISTS idx_attendance_reconciliation_discrepancy
+                    ON attendance_reconciliation (date, employee_code)
+                    WHERE discrepancy <> 0
+                """
+            }
         }
 
+        # Full-dump tables whose rows carry a content hash, so unchanged rows are never rewritten
+        self.hashed_tables = tuple(table_name for table_name, spec in schema.TABLES.items() if spec['row_hash'])
+
+        # Column additions applied to tables created before the column existed
+        self.table_migrations = {
+            table_name: [f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS row_hash BIGINT"]
+            for table_name in self.hashed_tables
+        }
+        # Checkpoints are keyed by relative path rather than file name; widening a VARCHAR is metadata-only
+        self.table_migrations['ingest_checkpoints'] = [
+            "ALTER TABLE ingest_checkpoints ALTER COLUMN file_name TYPE VARCHAR(1024)"
+        ]
+
+        # Tables whose ingestion changes the attendance reconciliation rows
+        self.reconciled_tables = ('timesheets', 'daily_attendance')
+
+        # Row counts from the most recent bulk_insert/upsert_data call
+        self.last_write_stats = {'written': 0, 'rejected': 0}
+
     def connect(self):
         """Establish database connection"""
         try:
@@ -201,6 +230,174 @@ class DatabaseManager:
             return self.create_table(table_name)
         return True
 
+    def apply_migrations(self, table_name):
+        """Apply idempotent column migrations to an existing table"""
+        migrations = self.table_migrations.get(table_name, [])
+        if not migrations:
+            return True
+
+        try:
+            with self.connection.cursor() as cursor:
+                for migration_sql in migrations:
+                    cursor.execute(migration_sql)
+                self.connection.commit()
+            return True
+        except Exception as e:
+            self.connection.rollback()
+            self.logger.error(f"Failed to migrate table {table_name}: {str(e)}")
+            return False
+
+    def ensure_indexes(self, table_name):
+        """Create the managed secondary indexes for a table if they are missing"""
+        indexes = self.table_indexes.get(table_name, {})
+        if not indexes:
+            return True
+
+        try:
+            with self.connection.cursor() as cursor:
+                for index_sql in indexes.values():
+                    cursor.execute(index_sql)
+                self.connection.commit()
+
+            self.logger.info(f"Ensured {len(indexes)} indexes on table: {table_name}")
+            return True
+        except Exception as e:
+            self.connection.rollback()
+            self.logger.error(f"Failed to create indexes on table {table_name}: {str(e)}")
+            return False
+
+    def drop_indexes(self, table_name):
+        """Drop the managed secondary indexes for a table"""
+        indexes = self.table_indexes.get(table_name, {})
+        if not indexes:
+            return True
+
+        try:
+            with self.connection.cursor() as cursor:
+                for index_name in indexes.keys():
+                    cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+                self.connection.commit()
+
+            self.logger.info(f"Dropped {len(indexes)} indexes on table: {table_name}")
+            return True
+        except Exception as e:
+            self.connection.rollback()
+            self.logger.error(f"Failed to drop indexes on table {table_name}: {str(e)}")
+            return False
+
+    def partition_name(self, table_name, month_start):
+        """Build the partition table name for the month starting at month_start"""
+        return f"{table_name}_y{month_start.year:04d}m{month_start.month:02d}"
+
+    def _month_start(self, value):
+        """Return the first day of the month for a date-like value, or None"""
+        try:
+            return date(int(value.year), int(value.month), 1)
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    def is_partitioned(self, table_name):
+        """Check if an existing table is a partitioned table in the database (relkind 'p')"""
+        if table_name not in self.partitioning_state:
+            rows = self.execute_query("""
+                SELECT c.relkind
+                FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE n.nspname = 'public' AND c.relname = %s
+            """, (table_name,))
+            if not rows:
+                return False
+            self.partitioning_state[table_name] = rows[0]['relkind'] == 'p'
+        return self.partitioning_state[table_name]
+
+    def check_partitioning(self, table_name):
+        """Warn once if a table meant to be partitioned was created as a plain table by an older version"""
+        if table_name not in self.partitioned_tables or self.is_partitioned(table_name):
+            return True
+
+        partition_key = self.partitioned_tables[table_name]
+        self.logger.warning(
+            f"Table {table_name} predates monthly partitioning and is a plain table; rows are loaded into it "
+            f"directly. To partition it: ALTER TABLE {table_name} RENAME TO {table_name}_legacy, restart to "
+            f"create the partitioned {table_name}, load the old rows with DatabaseManager.ensure_partitions("
+            f"'{table_name}', <{partition_key} values>) and INSERT INTO {table_name} SELECT ... FROM "
+            f"{table_name}_legacy, then drop {table_name}_legacy"
+        )
+        return True
+
+    def ensure_partitions(self, table_name, dates):
+        """Create any missing monthly partitions covering the given dates"""
+        if table_name not in self.partitioned_tables:
+            return True
+
+        # A legacy unpartitioned table takes the rows itself
+        if not self.is_partitioned(table_name):
+            return True
+
+        months = {self._month_start(value) for value in dates}
+        months.discard(None)
+        if not months:
+            return True
+
+        try:
+            with self.connection.cursor() as cursor:
+                # Serialise partition creation between concurrent loaders (e.g. parallel backfill workers)
+                cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (f"partitions:{table_name}",))
+                for month_start in sorted(months):
+                    if month_start.month == 12:
+                        month_end = date(month_start.year + 1, 1, 1)
+                    else:
+                        month_end = date(month_start.year, month_start.month + 1, 1)
+
+                    cursor.execute(f"""
+                        CREATE TABLE IF NOT EXISTS {self.partition_name(table_name, month_start)}
+                        PARTITION OF {table_name}
+                        FOR VALUES FROM (%s) TO (%s)
+                    """, (month_start, month_end))
+                self.connection.commit()
+            return True
+        except Exception as e:
+            self.connection.rollback()
+            self.logger.error(f"Failed to create partitions for table {table_name}: {str(e)}")
+            return False
+
+    def list_partitions(self, table_name):
+        """List the partition names attached to a partitioned table"""
+        query = """
+            SELECT child.relname AS partition_name
+            FROM pg_inherits
+            JOIN pg_class parent ON pg_inherits.inhparent = parent.oid
+            JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+            WHERE parent.relname = %s
+            ORDER BY child.relname
+        """
+        return [row['partition_name'] for row in self.execute_query(query, (table_name,))]
+
+    def detach_partition(self, table_name, month_start, concurrently=True):
+        """Detach a monthly partition so it can be archived or dropped cheaply"""
+        partition = self.partition_name(table_name, month_start)
+        mode = ' CONCURRENTLY' if concurrently else ''
+
+        # DETACH ... CONCURRENTLY cannot run inside a transaction block
+        previous_autocommit = self.connection.autocommit
+        try:
+            self.connection.commit()
+            self.connection.autocommit = concurrently
+            with self.connection.cursor() as cursor:
+                cursor.execute(f"ALTER TABLE {table_name} DETACH PARTITION {partition}{mode}")
+            if not concurrently:
+                self.connection.commit()
+
+            self.logger.info(f"Detached partition {partition} from {table_name}")
+            return True
+        except Exception as e:
+            if not self.connection.autocommit:
+                self.connection.rollback()
+            self.logger.error(f"Failed to detach partition {partition}: {str(e)}")
+            return False
+        finally:
+            self.connection.autocommit = previous_autocommit
+
     def create_all_tables(self):
         """Create all predefined tables"""
         success_count = 0
@@ -209,7 +406,10 @@ class DatabaseManager:
         self.logger.info("Creating all predefined tables...")
 
         for table_name in self.table_schemas.keys():
-            if self.ensure_table_exists(table_name):
+            if (self.ensure_table_exists(table_name)
+                    and self.check_partitioning(table_name)
+                    and self.apply_migrations(table_name)
+                    and self.ensure_indexes(table_name)):
                 success_count += 1
 
         self.logger.info(f"Table creation completed: {success_count}/{total_tables} successful")
@@ -230,6 +430,99 @@ class DatabaseManager:
             self.logger.error(f"Query execution failed: {str(e)}")
             raise e
 
+    def stream_query(self, query, params=None, output='tuples', itersize=None, chunk_rows=None):
+        """Yield the rows of a SELECT from a server-side cursor as tuples, DataFrame chunks or Arrow batches"""
+        if output not in ('tuples', 'dataframe', 'arrow'):
+            raise ValueError(f"Unknown stream output: {output}")
+
+        itersize = itersize or self.config.STREAM_ITERSIZE
+        chunk_rows = chunk_rows or itersize
+
+        # A named cursor keeps the result on the server and fetches itersize rows per round trip;
+        # plain tuples avoid building a dict per row
+        cursor = self.connection.cursor(name=f"stream_{uuid.uuid4().hex}", cursor_factory=psycopg2.extensions.cursor)
+        cursor.itersize = itersize
+        finished = False
+        try:
+            cursor.execute(query, params)
+
+            if output == 'tuples':
+                yield from cursor
+            else:
+                columns = arrow_schema = None
+                while True:
+                    rows = cursor.fetchmany(chunk_rows)
+                    if not rows:
+                        break
+                    if columns is None:
+                        # A named cursor only describes its result after the first fetch
+                        columns = [column.name for column in cursor.description]
+                        if output == 'arrow':
+                            arrow_schema = self._arrow_schema(cursor.description)
+                    if output == 'dataframe':
+                        yield self._rows_to_dataframe(rows, columns)
+                    else:
+                        yield self._rows_to_record_batch(rows, arrow_schema)
+
+            finished = True
+        except Exception as e:
+            self.logger.error(f"Streaming query failed: {str(e)}")
+            raise e
+        finally:
+            # Also reached when the caller stops iterating early
+            try:
+                cursor.close()
+            except psycopg2.Error:
+                # A failed query has already invalidated the named cursor; keep the query's error
+                pass
+            # End the transaction the cursor opened, so the connection is not left idle in it
+            if finished:
+                self.connection.commit()
+            elif not self.connection.closed:
+                self.connection.rollback()
+
+    def _rows_to_dataframe(self, rows, columns):
+        """Build a DataFrame from one chunk of streamed rows"""
+        import pandas as pd
+
+        return pd.DataFrame.from_records(rows, columns=columns)
+
+    def _arrow_schema(self, description):
+        """Arrow schema of a streamed result, taken from its Postgres column types so every batch shares it"""
+        import pyarrow as pa
+
+        fields = []
+        for column in description:
+            type_code = column.type_code
+            if type_code == NUMERIC_OID:
+                # Unconstrained NUMERIC (any SUM or AVG of a DECIMAL) reports precision 65535, beyond decimal128
+                if column.precision and column.scale is not None and 0 <= column.scale <= column.precision <= 38:
+                    arrow_type = pa.decimal128(column.precision, column.scale)
+                else:
+                    arrow_type = pa.float64()
+            elif type_code in ARROW_TYPES:
+                arrow_type = ARROW_TYPES[type_code](pa)
+            else:
+                arrow_type = pa.string()
+            fields.append(pa.field(column.name, arrow_type))
+        return pa.schema(fields)
+
+    def _rows_to_record_batch(self, rows, arrow_schema):
+        """Build an Arrow record batch from one chunk of streamed rows"""
+        import pyarrow as pa
+
+        arrays = []
+        for field, values in zip(arrow_schema, zip(*rows)):
+            if pa.types.is_string(field.type):
+                # Types without an Arrow mapping (JSON, intervals, arrays) are streamed as text
+                values = [value if value is None or isinstance(value, str)
+                          else json.dumps(value, default=str) if isinstance(value, (dict, list))
+                          else str(value) for value in values]
+            elif pa.types.is_floating(field.type):
+                values = [None if value is None else float(value) for value in values]
+            arrays.append(pa.array(values, type=field.type))
+        return pa.RecordBatch.from_arrays(arrays, schema=arrow_schema)
+
     def bulk_insert(self, table_name, data_list, on_conflict='NOTHING'):
         """Bulk insert data into specified table"""
         if not data_list:
@@ -240,6 +533,12 @@ class DatabaseManager:
             self.logger.error(f"Cannot insert data: table {table_name} does not exist and could not be created")
             return False
 
+        partition_key = self.partitioned_tables.get(table_name)
+        if partition_key and not self.ensure_partitions(
+                table_name, [record.get(partition_key) for record in data_list]):
+            self.logger.error(f"Cannot insert data: partitions for table {table_name} could not be created")
+            return False
+
         try:
             # Get column names from first record
             columns = list(data_list[0].keys())
@@ -258,11 +557,11 @@ class DatabaseManager:
                 values = [record.get(col) for col in columns]
                 values_list.append(values)
 
-            with self.connection.cursor() as cursor:
-                cursor.executemany(query, values_list)
-                self.connection.commit()
+            written, rejects = self._write_batches(query, values_list)
+            self.record_rejects(table_name, columns, rejects)
+            self.last_write_stats = {'written': written, 'rejected': len(rejects)}
 
-            self.logger.info(f"Successfully inserted {len(data_list)} records into {table_name}")
+            self.logger.info(f"Successfully inserted {written} records into {table_name}, rejected {len(rejects)}")
             return True
 
         except Exception as e:
@@ -270,7 +569,7 @@ class DatabaseManager:
             self.logger.error(f"Bulk insert failed for table {table_name}: {str(e)}")
             raise e
 
-    def upsert_data(self, table_name, data_list, conflict_columns):
+    def upsert_data(self, table_name, data_list, conflict_columns, source_file=None):
         """Upsert data - update if exists, insert if not"""
         if not data_list:
             return True
@@ -280,6 +579,12 @@ class DatabaseManager:
             self.logger.error(f"Cannot upsert data: table {table_name} does not exist and could not be created")
             return False
 
+        partition_key = self.partitioned_tables.get(table_name)
+        if partition_key and not self.ensure_partitions(
+                table_name, [record.get(partition_key) for record in data_list]):
+            self.logger.error(f"Cannot upsert data: partitions for table {table_name} could not be created")
+            return False
+
         try:
             columns = list(data_list[0].keys())
             columns_str = ', '.join(columns)
@@ -291,11 +596,18 @@ class DatabaseManager:
 
             conflict_str = ', '.join(conflict_columns)
 
+            # Hashed rows only rewrite (and bump updated_at) when their content changed
+            change_filter = ''
+            if 'row_hash' in columns:
+                update_clause += ', updated_at = CURRENT_TIMESTAMP'
+                change_filter = f"WHERE {table_name}.row_hash IS DISTINCT FROM EXCLUDED.row_hash"
+
             query = f"""
                 INSERT INTO {table_name} ({columns_str})
                 VALUES ({placeholders})
                 ON CONFLICT ({conflict_str})
                 DO UPDATE SET {update_clause}
+                {change_filter}
             """
 
             values_list = []
@@ -303,14 +615,300 @@ class DatabaseManager:
                 values = [record.get(col) for col in columns]
                 values_list.append(values)
 
+            written, rejects = self._write_batches(query, values_list)
+            self.record_rejects(table_name, columns, rejects, source_file)
+            self.last_write_stats = {'written': written, 'rejected': len(rejects)}
+
+            self.logger.info(f"Successfully upserted {written} records into {table_name}, rejected {len(rejects)}")
+            return True
+
+        except Exception as e:
+            self.connection.rollback()
+            self.logger.error(f"Upsert failed for table {table_name}: {str(e)}")
+            raise e
+
+    def fetch_row_hashes(self, table_name, key_column='employee_code'):
+        """Return the stored content hash for every row of a hashed table, keyed by key_column"""
+        if not self.ensure_table_exists(table_name):
+            return {}
+
+        rows = self.execute_query(f"SELECT {key_column}, row_hash FROM {table_name} WHERE row_hash IS NOT NULL")
+        return {row[key_column]: row['row_hash'] for row in rows}
+
+    def copy_upsert(self, table_name, arrow_table, conflict_columns, source_file=None):
+        """Upsert an Arrow table through COPY into a staging table, without per-row Python conversion"""
+        import pyarrow.csv as pacsv
+        import pyarrow.compute as pc
+
+        if arrow_table.num_rows == 0:
+            return True
+
+        if not self.ensure_table_exists(table_name):
+            self.logger.error(f"Cannot upsert data: table {table_name} does not exist and could not be created")
+            return False
+
+        partition_key = self.partitioned_tables.get(table_name)
+        if partition_key and not self.ensure_partitions(
+                table_name, pc.unique(arrow_table[partition_key]).to_pylist()):
+            self.logger.error(f"Cannot upsert data: partitions for table {table_name} could not be created")
+            return False
+
+        columns = arrow_table.column_names
+        columns_str = ', '.join(columns)
+        conflict_str = ', '.join(conflict_columns)
+        update_columns = [col for col in columns if col not in conflict_columns]
+        update_clause = ', '.join([f"{col} = EXCLUDED.{col}" for col in update_columns])
+        staging_table = f"_stage_{table_name}"
+
+        # Arrow writes nulls as unquoted empty fields, which COPY reads back as NULL
+        buffer = io.BytesIO()
+        pacsv.write_csv(arrow_table, buffer, write_options=pacsv.WriteOptions(include_header=False))
+        buffer.seek(0)
+
+        try:
             with self.connection.cursor() as cursor:
-                cursor.executemany(query, values_list)
+                cursor.execute(f"""
+                    CREATE TEMP TABLE {staging_table} ON COMMIT DROP AS
+                    SELECT {columns_str} FROM {table_name} WITH NO DATA
+                """)
+                # _seq keeps file order so the last duplicate key in the file wins
+                cursor.execute(f"ALTER TABLE {staging_table} ADD COLUMN _seq BIGSERIAL")
+                cursor.copy_expert(
+                    f"COPY {staging_table} ({columns_str}) FROM STDIN WITH (FORMAT csv)",
+                    buffer
+                )
+                cursor.execute(f"""
+                    INSERT INTO {table_name} ({columns_str})
+                    SELECT DISTINCT ON ({conflict_str}) {columns_str}
+                    FROM {staging_table}
+                    ORDER BY {conflict_str}, _seq DESC
+                    ON CONFLICT ({conflict_str})
+                    DO UPDATE SET {update_clause}
+                """)
+                written = cursor.rowcount
+            self.connection.commit()
+
+            self.last_write_stats = {'written': written, 'rejected': 0}
+            self.logger.info(f"Successfully copied {written} records into {table_name}")
+            return True
+
+        except (psycopg2.DataError, psycopg2.IntegrityError) as e:
+            # Fall back to the batched row path, which isolates and records the bad rows
+            self.connection.rollback()
+            self.logger.warning(f"COPY into {table_name} hit bad rows, falling back to batched upsert: {str(e)}")
+            return self.upsert_data(table_name, arrow_table.to_pylist(), conflict_columns, source_file)
+
+        except Exception as e:
+            self.connection.rollback()
+            self.logger.error(f"COPY upsert failed for table {table_name}: {str(e)}")
+            raise e
+
+    def _write_batches(self, query, values_list):
+        """Write rows in committed batches, returning (written count, rejected rows)"""
+        batch_size = self.config.UPSERT_BATCH_SIZE
+        written = 0
+        rejects = []
+
+        for start in range(0, len(values_list), batch_size):
+            batch_written, batch_rejects = self._write_batch(query, values_list[start:start + batch_size])
+            written += batch_written
+            rejects.extend(batch_rejects)
+
+        return written, rejects
+
+    def _write_batch(self, query, batch):
+        """Write one batch in a transaction, bisecting it on row-level errors to isolate bad rows"""
+        try:
+            with self.connection.cursor() as cursor:
+                execute_batch(cursor, query, batch, page_size=500)
+            self.connection.commit()
+            return len(batch), []
+
+        except (psycopg2.DataError, psycopg2.IntegrityError, ValueError, TypeError) as e:
+            # Only data errors are row-specific; anything else aborts the whole write
+            self.connection.rollback()
+            if len(batch) == 1:
+                return 0, [(batch[0], str(e).strip())]
+
+            middle = len(batch) // 2
+            left_written, left_rejects = self._write_batch(query, batch[:middle])
+            right_written, right_rejects = self._write_batch(query, batch[middle:])
+            return left_written + right_written, left_rejects + right_rejects
+
+    def _json_value(self, value):
+        """Convert a row value into something JSON can store"""
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return None
+        if isinstance(value, (str, int, float, bool)):
+            return value
+        return str(value)
+
+    def record_rejects(self, table_name, columns, rejects, source_file=None):
+        """Store rejected rows with their error in the ingest_rejects table"""
+        if not rejects:
+            return True
+
+        if not self.ensure_table_exists('ingest_rejects'):
+            self.logger.error(f"Cannot record {len(rejects)} rejected rows for {table_name}: no ingest_rejects table")
+            return False
+
+        try:
+            reject_rows = []
+            for values, error in rejects:
+                row_data = {col: self._json_value(value) for col, value in zip(columns, values)}
+                reject_rows.append((table_name, source_file, json.dumps(row_data), error))
+
+            with self.connection.cursor() as cursor:
+                execute_batch(cursor, """
+                    INSERT INTO ingest_rejects (table_name, source_file, row_data, error)
+                    VALUES (%s, %s, %s, %s)
+                """, reject_rows)
+            self.connection.commit()
+
+            self.logger.warning(f"Recorded {len(rejects)} rejected rows for {table_name} in ingest_rejects")
+            return True
+
+        except Exception as e:
+            self.connection.rollback()
+            self.logger.error(f"Failed to record rejected rows for {table_name}: {str(e)}")
+            return False
+
+    def refresh_reconciliation(self, keys, batch_size=50000):
+        """Recompute attendance_reconciliation rows for the given (date, employee_code) keys"""
+        keys = list(keys)
+        if not keys:
+            return True
+
+        if not self.ensure_table_exists('attendance_reconciliation'):
+            self.logger.error("Cannot refresh reconciliation: table attendance_reconciliation could not be created")
+            return False
+
+        query = """
+            WITH keys AS (
+                SELECT DISTINCT k.date, k.employee_code
+                FROM unnest(%s::date[], %s::varchar[]) AS k(date, employee_code)
+            ),
+            attendance AS (
+                SELECT a.date, a.employee_code, a.total_hours
+                FROM daily_attendance a
+                JOIN keys k ON a.date = k.date AND a.employee_code = k.employee_code
+            ),
+            worked AS (
+                SELECT t.date, t.employee_code,
+                       SUM(t.hours_worked) AS timesheet_hours,
+                       COUNT(DISTINCT t.project_id) AS project_count
+                FROM timesheets t
+                JOIN keys k ON t.date = k.date AND t.employee_code = k.employee_code
+                GROUP BY t.date, t.employee_code
+            )
+            INSERT INTO attendance_reconciliation
+                (date, employee_code, attendance_hours, timesheet_hours, project_count, discrepancy)
+            SELECT
+                k.date,
+                k.employee_code,
+                a.total_hours,
+                COALESCE(w.timesheet_hours, 0),
+                COALESCE(w.project_count, 0),
+                COALESCE(a.total_hours, 0) - COALESCE(w.timesheet_hours, 0)
+            FROM keys k
+            LEFT JOIN attendance a ON a.date = k.date AND a.employee_code = k.employee_code
+            LEFT JOIN worked w ON w.date = k.date AND w.employee_code = k.employee_code
+            WHERE a.employee_code IS NOT NULL OR w.employee_code IS NOT NULL
+            ON CONFLICT (date, employee_code)
+            DO UPDATE SET attendance_hours = EXCLUDED.attendance_hours,
+                          timesheet_hours = EXCLUDED.timesheet_hours,
+                          project_count = EXCLUDED.project_count,
+                          discrepancy = EXCLUDED.discrepancy,
+                          updated_at = CURRENT_TIMESTAMP
+        """
+
+        try:
+            with self.connection.cursor() as cursor:
+                # Serialise refreshes from concurrent loaders; each statement below then reads the facts
+                # committed before the lock was granted, so a slower refresh cannot write back stale totals
+                cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", ('reconciliation',))
+                for start in range(0, len(keys), batch_size):
+                    batch = keys[start:start + batch_size]
+                    dates = [key[0] for key in batch]
+                    employee_codes = [key[1] for key in batch]
+                    cursor.execute(query, (dates, employee_codes))
                 self.connection.commit()
 
-            self.logger.info(f"Successfully upserted {len(data_list)} records into {table_name}")
+            self.logger.info(f"Refreshed reconciliation for {len(keys)} employee-days")
             return True
 
         except Exception as e:
             self.connection.rollback()
-            self.logger.error(f"Upsert failed for table {table_name}: {str(e)}")
-            raise e
\ No newline at end of file
+            self.logger.error(f"Reconciliation refresh failed: {str(e)}")
+            return False
+
+    def change_channel(self, table_name):
+        """LISTEN/NOTIFY channel that announces changes to a table"""
+        return f"emps_{table_name}_changed"
+
+    def notify_change(self, table_name, payload):
+        """Announce a committed change to a table on its channel; listeners receive it after commit"""
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("SELECT pg_notify(%s, %s)", (self.change_channel(table_name), json.dumps(payload)))
+            self.connection.commit()
+            return True
+
+        except Exception as e:
+            self.connection.rollback()
+            self.logger.error(f"Change notification for {table_name} failed: {str(e)}")
+            return False
+
+    def file_key(self, file_path, root=None):
+        """Key a file for checkpoints and claims by its path under root, or else by its folder and name"""
+        file_path = os.path.abspath(file_path)
+        if root:
+            return os.path.relpath(file_path, os.path.abspath(root)).replace(os.sep, '/')
+        # The same on every node whatever the local mount point of the shared folder
+        return f"{os.path.basename(os.path.dirname(file_path))}/{os.path.basename(file_path)}"
+
+    def load_checkpoint(self, file_name, file_size, file_mtime_ns):
+        """Committed progress for a file, or None if there is none for this exact version of it"""
+        if not self.ensure_table_exists('ingest_checkpoints'):
+            return None
+
+        rows = self.execute_query(
+            "SELECT * FROM ingest_checkpoints WHERE file_name = %s",
+            (file_name,)
+        )
+        if not rows:
+            return None
+
+        checkpoint = rows[0]
+        if checkpoint['file_size'] != file_size or checkpoint['file_mtime_ns'] != file_mtime_ns:
+            # A different file with the same name; start it from the beginning
+            self.logger.warning(f"Ignoring stale checkpoint for {file_name}: file has changed")
+            return None
+        return checkpoint
+
+    def save_checkpoint(self, file_name, table_name, file_size, file_mtime_ns, byte_offset, rows_committed):
+        """Record how far into a file the committed rows reach"""
+        try:
+            self.execute_query("""
+                INSERT INTO ingest_checkpoints
+                    (file_name, table_name, file_size, file_mtime_ns, byte_offset, rows_committed)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                ON CONFLICT (file_name)
+                DO UPDATE SET table_name = EXCLUDED.table_name,
+                              file_size = EXCLUDED.file_size,
+                              file_mtime_ns = EXCLUDED.file_mtime_ns,
+                              byte_offset = EXCLUDED.byte_offset,
+                              rows_committed = EXCLUDED.rows_committed,
+                              updated_at = CURRENT_TIMESTAMP
+            """, (file_name, table_name, file_size, file_mtime_ns, byte_offset, rows_committed))
+            return True
+        except Exception:
+            return False
+
+    def clear_checkpoint(self, file_name):
+        """Forget a file's progress once it is fully loaded"""
+        try:
+            self.execute_query("DELETE FROM ingest_checkpoints WHERE file_name = %s", (file_name,))
+            return True
+        except Exception:
+            return False
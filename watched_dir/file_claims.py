@@ -0,0 +1,131 @@
+import os
+import logging
+import threading
+from .database import DatabaseManager
+from .config import Config
+
+
+class FileClaims:
+    # Leases in the file_claims table so each file on a shared drop folder is processed by one node
+
+    def __init__(self, root=None):
+        self.config = Config()
+        self.db_manager = DatabaseManager()
+        self.logger = logging.getLogger(__name__)
+        self.node_id = self.config.NODE_ID
+        self.lease_seconds = self.config.CLAIM_LEASE_SECONDS
+        # Files are keyed by their path under root when given (a backfill archive), else by folder and name
+        self.root = root
+
+        # Claims held by this node, renewed by the heartbeat thread until released
+        self.held = set()
+        self.lock = threading.Lock()
+        self.heartbeat_thread = None
+        self.stop_event = threading.Event()
+
+    def file_key(self, file_path):
+        """Identify a file the same way on every node, whatever the local mount point"""
+        return self.db_manager.file_key(file_path, self.root)
+
+    def _execute(self, query, params):
+        """Run a claims statement on this node's connection, reconnecting if needed; returns rows or None"""
+        with self.lock:
+            if self.db_manager.connection is None or self.db_manager.connection.closed:
+                if not self.db_manager.connect():
+                    return None
+                self.db_manager.ensure_table_exists('file_claims')
+
+            try:
+                with self.db_manager.connection.cursor() as cursor:
+                    cursor.execute(query, params)
+                    rows = cursor.fetchall() if cursor.description else []
+                self.db_manager.connection.commit()
+                return rows
+            except Exception as e:
+                self.db_manager.connection.rollback()
+                self.logger.error(f"File claim query failed: {str(e)}")
+                return None
+
+    def claim(self, file_path):
+        """Claim a file for this node; False if another node holds a live lease on it"""
+        file_key = self.file_key(file_path)
+
+        # Takes a free or expired claim (or renews our own) atomically; concurrent claimers serialise on the row
+        rows = self._execute("""
+            INSERT INTO file_claims (file_key, node_id, claimed_at, heartbeat_at, lease_expires_at)
+            VALUES (%s, %s, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP,
+                    CURRENT_TIMESTAMP + make_interval(secs => %s))
+            ON CONFLICT (file_key) DO UPDATE
+            SET node_id = EXCLUDED.node_id,
+                claimed_at = EXCLUDED.claimed_at,
+                heartbeat_at = EXCLUDED.heartbeat_at,
+                lease_expires_at = EXCLUDED.lease_expires_at
+            WHERE file_claims.lease_expires_at < CURRENT_TIMESTAMP
+               OR file_claims.node_id = EXCLUDED.node_id
+            RETURNING node_id
+        """, (file_key, self.node_id, self.lease_seconds))
+
+        if not rows:
+            return False
+
+        # Another node may have finished and moved the file just before our claim
+        if not os.path.exists(file_path):
+            self.release(file_path)
+            return False
+
+        with self.lock:
+            self.held.add(file_key)
+        self._start_heartbeat()
+        return True
+
+    def release(self, file_path):
+        """Give up this node's claim on a file"""
+        file_key = self.file_key(file_path)
+        with self.lock:
+            self.held.discard(file_key)
+
+        self._execute(
+            "DELETE FROM file_claims WHERE file_key = %s AND node_id = %s",
+            (file_key, self.node_id)
+        )
+
+    def renew(self):
+        """Extend the leases of every claim this node still holds"""
+        with self.lock:
+            held = list(self.held)
+        if not held:
+            return
+
+        self._execute("""
+            UPDATE file_claims
+            SET heartbeat_at = CURRENT_TIMESTAMP,
+                lease_expires_at = CURRENT_TIMESTAMP + make_interval(secs => %s)
+            WHERE node_id = %s AND file_key = ANY(%s)
+        """, (self.lease_seconds, self.node_id, held))
+
+    def _start_heartbeat(self):
+        if self.heartbeat_thread and self.heartbeat_thread.is_alive():
+            return
+
+        self.heartbeat_thread = threading.Thread(target=self._heartbeat, name="file-claims-heartbeat", daemon=True)
+        self.heartbeat_thread.start()
+
+    def _heartbeat(self):
+        # Renew well before expiry so a slow file never loses its lease while this node is alive
+        interval = max(self.lease_seconds / 3, 1)
+        while not self.stop_event.wait(interval):
+            self.renew()
+
+    def stop(self):
+        """Stop renewing and release every held claim"""
+        self.stop_event.set()
+        with self.lock:
+            held = list(self.held)
+            self.held.clear()
+
+        if held:
+            self._execute(
+                "DELETE FROM file_claims WHERE node_id = %s AND file_key = ANY(%s)",
+                (self.node_id, held)
+            )
+        self.db_manager.disconnect()
@@ -1,67 +1,89 @@
 import pandas as pd
+import psycopg2
+import io
 import os
 import shutil
+import uuid
+import threading
 from datetime import datetime
 import logging
 from .database import DatabaseManager
+from .config import Config
+from .validation import RowValidator
+from . import schema
 
 
 class FileProcessor:
-    def __init__(self):
+    def __init__(self, key_root=None):
+        self.config = Config()
         self.db_manager = DatabaseManager()
         self.logger = logging.getLogger(__name__)
+        self.arrow_reader = None
+        self.validator = RowValidator(self.db_manager)
 
-        # File type mappings
+        # Checkpoints and claims key files by their path under key_root (the backfill archive) if set
+        self.key_root = key_root
+
+        # Cross-node file claims when several watchers share one drop folder
+        self.claims = None
+        if self.config.MULTI_NODE:
+            from .file_claims import FileClaims
+            self.claims = FileClaims(key_root)
+
+        # Reason for the most recent process_file failure, for retry bookkeeping
+        self.last_error = None
+        # Which step of the most recent write_data call failed
+        self.write_error = None
+        # Whether that failure came from the database being unreachable rather than from the file
+        self.last_error_transient = False
+        # Failure reason per file from the most recent process_batch, and the files that failed on an outage
+        self.batch_errors = {}
+        self.batch_transient = set()
+
+        # Set on shutdown: chunked loads stop after the chunk in flight and resume from their checkpoint
+        self.stop_event = threading.Event()
+
+        # File type mappings, generated from the schema registry in bulk-load column order
         self.file_mappings = {
-            'employee_exit_report': {
-                'table': 'employee_exit_report',
-                'columns': ['employee_code', 'employee_name', 'business_unit', 'designation',
-                            'date_of_joining', 'exit_date', 'expected_resignation_date'],
-                'conflict_columns': ['employee_code']
-            },
-            'employee_master': {
-                'table': 'employee_master',
-                'columns': ['employee_code', 'employee_name', 'email', 'additional_email',
-                            'mobile_number', 'secondary_mobile_number', 'gender', 'date_of_joining',
-                            'date_of_birth', 'fax', 'marital_status', 'self_service', 'employee_type',
-                            'office_location', 'business_unit', 'designation', 'department', 'grade',
-                            'parent_department', 'primary_manager', 'primary_manager_email', 'bank_name',
-                            'branch_name', 'account_holder_name', 'account_number', 'account_type',
-                            'ifsc_code', 'swift_code', 'pan_number', 'aadhaar_enrollment_number',
-                            'aadhaar_number', 'present_address', 'present_state', 'present_city',
-                            'present_pincode', 'present_country', 'permanent_address', 'permanent_state',
-                            'permanent_city', 'permanent_pincode', 'permanent_country', 'status'],
-                'conflict_columns': ['employee_code']
-            },
-            'employee_work_profile': {
-                'table': 'employee_work_profile',
-                'columns': ['employee_code', 'employee_name', 'business_unit', 'parent_designation',
-                            'assigned_department', 'designation', 'office_location_name'],
-                'conflict_columns': ['employee_code']
-            },
-            'experience_report': {
-                'table': 'employee_experience_report',
-                'columns': ['employee_code', 'employee_name', 'business_unit', 'department',
-                            'designation', 'date_of_joining', 'current_experience', 'past_experience',
-                            'total_experience'],
-                'conflict_columns': ['employee_code']
-            },
-            'timesheet_report': {
-                'table': 'timesheets',
-                'columns': ['date', 'employee_code', 'project_id', 'project_name', 'hours_worked'],
-                'conflict_columns': ['date', 'employee_code', 'project_id']
-            },
-            'attendance_report_dailycopy': {
-                'table': 'daily_attendance',
-                'columns': ['date', 'employee_code', 'employee_name', 'clock_in_time',
-                            'clock_out_time', 'total_hours'],
-                'conflict_columns': ['date', 'employee_code']
+            spec['file_type']: {
+                'table': table_name,
+                'columns': schema.load_columns(table_name),
+                'conflict_columns': spec['conflict_columns']
             }
+            for table_name, spec in schema.TABLES.items()
         }
 
+        # Supported input formats, longest suffix first so '.csv.gz' is matched before '.csv'
+        self.supported_extensions = ('.csv.gz', '.csv.zst', '.parquet', '.xlsx', '.csv')
+
+    def file_extension(self, filename):
+        """Return the supported extension of a file, or None"""
+        filename_lower = filename.lower()
+        for extension in self.supported_extensions:
+            if filename_lower.endswith(extension):
+                return extension
+        return None
+
+    def is_outage(self, error=None):
+        """Check if a failure came from losing the database (the error, or a closed connection) rather than the file"""
+        if error is not None:
+            return isinstance(error, (psycopg2.OperationalError, psycopg2.InterfaceError))
+        return self.db_manager.connection is None or bool(self.db_manager.connection.closed)
+
+    def is_supported_file(self, filename):
+        """Check if a file is in a format the processor can ingest"""
+        filename = os.path.basename(filename)
+        # Skip lock files left behind by spreadsheet editors
+        if filename.startswith('~$'):
+            return False
+        return self.file_extension(filename) is not None
+
     def identify_file_type(self, filename):
         """Identify file type based on filename"""
-        filename_lower = filename.lower().replace('.csv', '')
+        filename_lower = filename.lower()
+        extension = self.file_extension(filename_lower)
+        if extension:
+            filename_lower = filename_lower[:-len(extension)]
 
         for file_type in self.file_mappings.keys():
             if file_type in filename_lower:
@@ -69,11 +91,58 @@ class FileProcessor:
 
         return None
 
+    def clean_column_name(self, column):
+        """Clean a single column name to match database schema"""
+        return schema.clean_column_name(column)
+
     def clean_column_names(self, df):
         """Clean column names to match database schema"""
         df.columns = df.columns.str.lower().str.replace(' ', '_').str.replace('-', '_')
         return df
 
+    def read_parquet(self, file_path, columns):
+        """Read only the mapped columns from a Parquet file"""
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(file_path)
+        wanted = set(columns)
+        selected = [name for name in parquet_file.schema_arrow.names
+                    if self.clean_column_name(name) in wanted]
+        return parquet_file.read(columns=selected).to_pandas()
+
+    def read_typed(self, reader, source, mapping, **options):
+        """Read the mapped columns with a pandas reader and the registry dtypes, inferring types only if a value does not fit"""
+        headers = reader(source, nrows=0, **options).columns
+        # Unmapped headers are never read, so they cannot reach the INSERT
+        dtypes = schema.pandas_dtypes(mapping['table'], headers)
+
+        try:
+            if hasattr(source, 'seek'):
+                source.seek(0)
+            return reader(source, usecols=list(dtypes), dtype=dtypes, **options)
+        except (ValueError, TypeError) as e:
+            # e.g. text in a numeric column; the database rejects those rows individually
+            self.logger.warning(f"Declared dtypes do not fit {mapping['table']} data, inferring types: {str(e)}")
+            if hasattr(source, 'seek'):
+                source.seek(0)
+            return reader(source, usecols=list(dtypes), **options)
+
+    def read_file(self, file_path, mapping):
+        """Read an input file into a DataFrame based on its format"""
+        extension = self.file_extension(file_path)
+
+        if extension == '.csv.gz':
+            # Decompressed as a stream while parsing
+            return self.read_typed(pd.read_csv, file_path, mapping, compression='gzip')
+        elif extension == '.csv.zst':
+            return self.read_typed(pd.read_csv, file_path, mapping, compression='zstd')
+        elif extension == '.parquet':
+            return self.read_parquet(file_path, mapping['columns'])
+        elif extension == '.xlsx':
+            return self.read_typed(pd.read_excel, file_path, mapping, engine='openpyxl')
+        else:
+            return self.read_typed(pd.read_csv, file_path, mapping)
+
     def process_dates(self, df, date_columns):
         """Process date columns to proper format"""
         for col in date_columns:
@@ -81,81 +150,419 @@ class FileProcessor:
                 df[col] = pd.to_datetime(df[col], errors='coerce')
         return df
 
+    def use_arrow_engine(self, file_path, mapping):
+        """Check if a file should be parsed with the Arrow CSV engine"""
+        # Hashed full-dump tables stay on pandas so their row hashes are computed consistently
+        return (self.config.PARSE_ENGINE == 'arrow'
+                and self.file_extension(file_path) in ('.csv', '.csv.gz', '.csv.zst')
+                and mapping['table'] not in self.db_manager.hashed_tables)
+
+    def read_arrow_table(self, file_path, mapping):
+        """Read the mapped columns of a CSV file as a typed Arrow table, or None to fall back to pandas"""
+        if self.arrow_reader is None:
+            from .arrow_engine import ArrowCSVReader
+            self.arrow_reader = ArrowCSVReader(self.config.ARROW_BLOCK_SIZE_MB)
+
+        return self.arrow_reader.read(file_path, self.file_extension(file_path), mapping['table'])
+
+    def load_dataframe(self, file_path, mapping):
+        """Read a file with pandas and normalise columns and dates"""
+        df = self.read_file(file_path, mapping)
+
+        if df.empty:
+            return df
+
+        # Clean column names
+        df = self.clean_column_names(df)
+
+        # Process date columns
+        return self.process_dates(df, schema.date_columns(mapping['table']))
+
+    def filter_changed_rows(self, df, mapping):
+        """Add a per-row content hash and keep only rows that are new or changed"""
+        content_columns = [col for col in mapping['columns'] if col in df.columns]
+        df = df.copy()
+        df['row_hash'] = pd.util.hash_pandas_object(df[content_columns], index=False).values.view('int64')
+
+        stored_hashes = pd.Series(self.db_manager.fetch_row_hashes(mapping['table']), dtype='Int64')
+        unchanged = (df['employee_code'].map(stored_hashes) == df['row_hash']).fillna(False).astype(bool)
+        return df[~unchanged]
+
+    def reconciliation_keys(self, data):
+        """Distinct (date, employee_code) pairs in a DataFrame or Arrow table"""
+        if isinstance(data, pd.DataFrame):
+            keys = data[['date', 'employee_code']].dropna().drop_duplicates()
+            return list(keys.itertuples(index=False, name=None))
+
+        keys = data.select(['date', 'employee_code']).drop_null().group_by(['date', 'employee_code']).aggregate([])
+        return list(zip(keys['date'].to_pylist(), keys['employee_code'].to_pylist()))
+
+    def change_summary(self, data):
+        """Affected date range, employee count and row count of the rows just written"""
+        summary = {'date_min': None, 'date_max': None, 'employee_count': 0, 'row_count': len(data)}
+
+        if isinstance(data, pd.DataFrame):
+            if 'date' in data.columns and data['date'].notna().any():
+                summary['date_min'] = data['date'].min().date().isoformat()
+                summary['date_max'] = data['date'].max().date().isoformat()
+            if 'employee_code' in data.columns:
+                summary['employee_count'] = int(data['employee_code'].nunique())
+            return summary
+
+        import pyarrow.compute as pc
+
+        if 'date' in data.column_names:
+            date_range = pc.min_max(data['date'])
+            if date_range['min'].is_valid:
+                summary['date_min'] = date_range['min'].as_py().isoformat()
+                summary['date_max'] = date_range['max'].as_py().isoformat()
+        if 'employee_code' in data.column_names:
+            summary['employee_count'] = pc.count_distinct(data['employee_code']).as_py()
+        return summary
+
+    def notify_changes(self, mapping, data, filename):
+        """Publish change events for the written table and the reconciliation it feeds"""
+        if not self.config.NOTIFY_CHANGES or len(data) == 0:
+            return
+
+        payload = {
+            'table': mapping['table'],
+            'ingest_id': uuid.uuid4().hex,
+            'source_file': filename,
+            **self.change_summary(data)
+        }
+        self.db_manager.notify_change(mapping['table'], payload)
+
+        if mapping['table'] in self.db_manager.reconciled_tables:
+            self.db_manager.notify_change(
+                'attendance_reconciliation',
+                {**payload, 'table': 'attendance_reconciliation'}
+            )
+
+    def read_data(self, file_path, mapping):
+        """Read input file, with the Arrow engine when configured and the file is typeable"""
+        data = None
+        if self.use_arrow_engine(file_path, mapping):
+            data = self.read_arrow_table(file_path, mapping)
+        if data is None:
+            data = self.load_dataframe(file_path, mapping)
+        return data
+
+    def write_data(self, mapping, data, source_file):
+        """Upsert validated rows and refresh what depends on them; returns (rows sent to the database, success)"""
+        self.write_error = None
+        if mapping['table'] in self.db_manager.hashed_tables:
+            total_rows = len(data)
+            data = self.filter_changed_rows(data, mapping)
+            self.logger.info(f"{source_file}: {len(data)} of {total_rows} rows new or changed")
+
+        if isinstance(data, pd.DataFrame):
+            # Convert DataFrame to list of dictionaries, with missing values as NULL
+            records = data.astype(object).where(data.notna(), None).to_dict('records')
+
+            # Upsert data
+            success = self.db_manager.upsert_data(
+                mapping['table'],
+                records,
+                mapping['conflict_columns'],
+                source_file=source_file
+            )
+        else:
+            # Arrow batches go straight to COPY
+            success = self.db_manager.copy_upsert(
+                mapping['table'],
+                data,
+                mapping['conflict_columns'],
+                source_file=source_file
+            )
+
+        if not success:
+            self.write_error = f"Upsert into {mapping['table']} failed"
+        elif mapping['table'] in self.db_manager.reconciled_tables:
+            # Keep the per employee-day reconciliation in step with the facts. A failed refresh fails the
+            # write, so the file is retried (the upsert is idempotent) instead of leaving stale totals
+            success = self.db_manager.refresh_reconciliation(self.reconciliation_keys(data))
+            if not success:
+                self.write_error = f"Reconciliation refresh after loading {mapping['table']} failed"
+
+        return data, success
+
+    def use_chunked_ingest(self, file_path, mapping):
+        """Check if a file is large enough to be loaded in checkpointed chunks"""
+        # Only uncompressed CSV can be resumed from a byte offset; full dumps are diffed as a whole
+        return (self.file_extension(file_path) == '.csv'
+                and mapping['table'] not in self.db_manager.hashed_tables
+                and os.path.getsize(file_path) >= self.config.CHUNKED_INGEST_MIN_MB * 1024 * 1024)
+
+    def iter_csv_chunks(self, file_path, start_offset, chunk_bytes):
+        """Yield (end offset, header line + whole rows) for successive chunks of a CSV file"""
+        with open(file_path, 'rb') as f:
+            header = f.readline()
+            offset = max(start_offset, f.tell())
+            f.seek(offset)
+
+            while True:
+                block = f.read(chunk_bytes)
+                if not block:
+                    return
+                # Finish the row the chunk ends in; rows never span lines in these exports
+                block += f.readline()
+                offset += len(block)
+                yield offset, header + block
+
+    def read_chunk(self, chunk, mapping):
+        """Parse one chunk of CSV bytes the same way a whole file is parsed"""
+        if self.config.PARSE_ENGINE == 'arrow':
+            import pyarrow as pa
+
+            if self.arrow_reader is None:
+                from .arrow_engine import ArrowCSVReader
+                self.arrow_reader = ArrowCSVReader(self.config.ARROW_BLOCK_SIZE_MB)
+
+            table = self.arrow_reader.read(pa.py_buffer(chunk), '.csv', mapping['table'])
+            if table is not None:
+                return table
+
+        df = self.clean_column_names(self.read_typed(pd.read_csv, io.BytesIO(chunk), mapping))
+        return self.process_dates(df, schema.date_columns(mapping['table']))
+
+    def process_chunked(self, file_path, mapping, processed_folder):
+        """Load a large CSV chunk by chunk, checkpointing each committed chunk; None if stopped part-way"""
+        filename = os.path.basename(file_path)
+        stat = os.stat(file_path)
+        chunk_bytes = self.config.INGEST_CHUNK_MB * 1024 * 1024
+
+        if not self.db_manager.connect():
+            self.last_error = "Database connection failed"
+            self.last_error_transient = True
+            return False
+
+        # Files with the same name in different folders keep separate checkpoints
+        file_key = self.db_manager.file_key(file_path, self.key_root)
+        checkpoint = self.db_manager.load_checkpoint(file_key, stat.st_size, stat.st_mtime_ns)
+        offset, rows_committed = 0, 0
+        if checkpoint:
+            offset, rows_committed = checkpoint['byte_offset'], checkpoint['rows_committed']
+            self.logger.info(f"Resuming {filename} at byte {offset:,} ({offset / stat.st_size:.0%}), "
+                             f"{rows_committed:,} rows already committed")
+
+        for end_offset, chunk in self.iter_csv_chunks(file_path, offset, chunk_bytes):
+            data = self.read_chunk(chunk, mapping)
+
+            if len(data):
+                data = self.validator.validate(data, mapping, source_file=filename)
+                data, success = self.write_data(mapping, data, filename)
+                if not success:
+                    # Committed chunks stay committed; a retry resumes after the last checkpoint
+                    self.last_error = f"{self.write_error} at byte {end_offset:,}"
+                    self.last_error_transient = self.is_outage()
+                    return False
+                self.notify_changes(mapping, data, filename)
+                rows_committed += len(data)
+
+            # Written after the chunk commits; a crash in between replays one idempotent upsert
+            self.db_manager.save_checkpoint(file_key, mapping['table'], stat.st_size, stat.st_mtime_ns,
+                                            end_offset, rows_committed)
+            self.logger.info(f"{filename}: {end_offset / stat.st_size:.0%} loaded, {rows_committed:,} rows")
+
+            if self.stop_event.is_set() and end_offset < stat.st_size:
+                self.logger.info(f"Stopping {filename} at byte {end_offset:,}; it resumes from here on restart")
+                return None
+
+        self.db_manager.clear_checkpoint(file_key)
+
+        if processed_folder is not None:
+            shutil.move(file_path, os.path.join(processed_folder, filename))
+        self.logger.info(f"Successfully processed {filename} in chunks ({rows_committed:,} rows)")
+        return True
+
     def process_file(self, file_path, processed_folder):
-        """Process a single CSV file"""
+        """Process a single input file (left in place if processed_folder is None); None if claimed elsewhere or stopped"""
+        self.last_error = None
+        self.last_error_transient = False
+        filename = os.path.basename(file_path)
+        claimed = False
+
         try:
-            filename = os.path.basename(file_path)
             file_type = self.identify_file_type(filename)
 
             if not file_type:
-                self.logger.warning(f"Unknown file type: {filename}")
+                self.last_error = f"Unknown file type: {filename}"
+                self.logger.warning(self.last_error)
                 return False
 
-            self.logger.info(f"Processing {filename} as {file_type}")
-
-            # Read CSV file
-            df = pd.read_csv(file_path)
+            if self.claims:
+                if not self.claims.claim(file_path):
+                    self.logger.info(f"Skipping {filename}, claimed by another node")
+                    return None
+                claimed = True
 
-            if df.empty:
-                self.logger.warning(f"Empty file: {filename}")
-                return False
-
-            # Clean column names
-            df = self.clean_column_names(df)
+            self.logger.info(f"Processing {filename} as {file_type}")
 
             # Get file mapping
             mapping = self.file_mappings[file_type]
 
-            # Process date columns
-            date_columns = ['date_of_joining', 'date_of_birth', 'exit_date',
-                            'expected_resignation_date', 'date']
-            df = self.process_dates(df, date_columns)
+            if self.use_chunked_ingest(file_path, mapping):
+                return self.process_chunked(file_path, mapping, processed_folder)
+
+            data = self.read_data(file_path, mapping)
 
-            # Convert DataFrame to list of dictionaries
-            records = df.to_dict('records')
+            if len(data) == 0:
+                self.last_error = f"Empty file: {filename}"
+                self.logger.warning(self.last_error)
+                return False
 
             # Connect to database
             if not self.db_manager.connect():
+                self.last_error = "Database connection failed"
+                self.last_error_transient = True
                 return False
 
-            # Upsert data
-            success = self.db_manager.upsert_data(
-                mapping['table'],
-                records,
-                mapping['conflict_columns']
-            )
+            # Reject invalid rows and in-file duplicate keys before paying for the upsert
+            data = self.validator.validate(data, mapping, source_file=filename)
+
+            data, success = self.write_data(mapping, data, filename)
 
             if success:
+                # Tell listeners which slice changed; sent only after the data is committed
+                self.notify_changes(mapping, data, filename)
+
+                if processed_folder is None:
+                    self.logger.info(f"Successfully processed {filename}")
+                    return True
+
                 # Move file to processed folder
                 processed_path = os.path.join(processed_folder, filename)
                 shutil.move(file_path, processed_path)
                 self.logger.info(f"Successfully processed and moved {filename}")
                 return True
             else:
+                self.last_error = self.write_error
+                self.last_error_transient = self.is_outage()
                 return False
 
         except Exception as e:
+            self.last_error = str(e)
+            self.last_error_transient = self.is_outage(e)
             self.logger.error(f"Error processing file {filename}: {str(e)}")
             return False
         finally:
             self.db_manager.disconnect()
+            if claimed:
+                self.claims.release(file_path)
+
+    def combine_data(self, frames, mapping):
+        """Concatenate per-file data in arrival order, keeping the last row for each conflict key"""
+        if all(not isinstance(data, pd.DataFrame) for data in frames):
+            import pyarrow as pa
+
+            # copy_upsert keeps the last duplicate key itself, so only the pandas path deduplicates here
+            return pa.concat_tables(frames, promote_options='default')
+
+        frames = [data if isinstance(data, pd.DataFrame)
+                  else self.process_dates(data.to_pandas(), schema.date_columns(mapping['table']))
+                  for data in frames]
+        combined = pd.concat(frames, ignore_index=True)
+        return combined.drop_duplicates(subset=mapping['conflict_columns'], keep='last')
+
+    def process_batch(self, file_paths, processed_folder):
+        """Load several files for one table in a single write; returns {path: result} as process_file would"""
+        results = {}
+        errors = {}
+        transient = set()
+        loaded = []
+        claimed = []
+        mapping = None
+
+        try:
+            for file_path in file_paths:
+                filename = os.path.basename(file_path)
+                file_type = self.identify_file_type(filename)
+                if not file_type:
+                    results[file_path] = False
+                    errors[file_path] = f"Unknown file type: {filename}"
+                    continue
+
+                if mapping is None:
+                    mapping = self.file_mappings[file_type]
+                elif self.file_mappings[file_type]['table'] != mapping['table']:
+                    raise ValueError("process_batch needs files for a single table")
 
-    def process_folder(self, folder_path, processed_folder):
-        """Process all CSV files in a folder"""
-        processed_count = 0
-        failed_count = 0
+                if self.claims:
+                    if not self.claims.claim(file_path):
+                        results[file_path] = None
+                        continue
+                    claimed.append(file_path)
 
-        if not os.path.exists(folder_path):
-            self.logger.error(f"Folder does not exist: {folder_path}")
-            return processed_count, failed_count
+                # A file that cannot be read fails on its own without holding back the rest
+                try:
+                    data = self.read_data(file_path, mapping)
+                except Exception as e:
+                    results[file_path] = False
+                    errors[file_path] = str(e)
+                    continue
 
-        for filename in os.listdir(folder_path):
-            if filename.lower().endswith('.csv'):
-                file_path = os.path.join(folder_path, filename)
+                if len(data) == 0:
+                    results[file_path] = False
+                    errors[file_path] = f"Empty file: {filename}"
+                    continue
 
-                if self.process_file(file_path, processed_folder):
-                    processed_count += 1
-                else:
-                    failed_count += 1
+                loaded.append((file_path, data))
 
-        return processed_count, failed_count
\ No newline at end of file
+            if not loaded:
+                return results
+
+            if not self.db_manager.connect():
+                for file_path, _ in loaded:
+                    results[file_path] = False
+                    errors[file_path] = "Database connection failed"
+                    transient.add(file_path)
+                return results
+
+            # Validate per file so rejects keep their source file
+            frames = [self.validator.validate(data, mapping, source_file=os.path.basename(file_path))
+                      for file_path, data in loaded]
+            data = self.combine_data(frames, mapping)
+
+            names = [os.path.basename(file_path) for file_path, _ in loaded]
+            label = names[0] if len(names) == 1 else f"{names[0]} +{len(names) - 1} more"
+            self.logger.info(f"Loading {len(data)} rows from {len(names)} coalesced files into {mapping['table']}")
+
+            try:
+                data, success = self.write_data(mapping, data, label[:255])
+                outage = not success and self.is_outage()
+            except Exception as e:
+                success = False
+                outage = self.is_outage(e)
+                self.logger.error(f"Error loading coalesced batch {label}: {str(e)}")
+
+            if not success:
+                for file_path, _ in loaded:
+                    results[file_path] = False
+                    errors[file_path] = self.write_error or f"Upsert into {mapping['table']} failed"
+                    if outage:
+                        transient.add(file_path)
+                return results
+
+            self.notify_changes(mapping, data, label)
+
+            for file_path, _ in loaded:
+                try:
+                    if processed_folder is not None:
+                        shutil.move(file_path, os.path.join(processed_folder, os.path.basename(file_path)))
+                    results[file_path] = True
+                except Exception as e:
+                    # The rows are committed; a failed move only means the (idempotent) file is retried
+                    results[file_path] = False
+                    errors[file_path] = f"Could not move file: {str(e)}"
+
+            self.logger.info(f"Successfully processed {sum(1 for ok in results.values() if ok)} of "
+                             f"{len(file_paths)} coalesced files")
+            return results
+
+        finally:
+            self.db_manager.disconnect()
+            for file_path in claimed:
+                self.claims.release(file_path)
+            self.batch_errors = errors
+            self.batch_transient = transient
@@ -1,18 +1,25 @@
 import os
-import time
 import logging
 from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
 from watchdog.events import FileSystemEventHandler
 from .file_processor import FileProcessor
+from .retry_scheduler import RetryScheduler
+from .ingest_scheduler import IngestScheduler
 from .config import Config
 
 
 class CSVFileHandler(FileSystemEventHandler):
-    def __init__(self, processor, processed_folder):
+    def __init__(self, processor, processed_folder, ingest_scheduler):
         self.processor = processor
         self.processed_folder = processed_folder
+        self.ingest_scheduler = ingest_scheduler
         self.logger = logging.getLogger(__name__)
 
+    def process(self, file_path):
+        """Queue a file with the ingest scheduler, which processes it and records the outcome"""
+        self.ingest_scheduler.submit(file_path, self.processed_folder)
+
     def on_created(self, event):
         if event.is_directory:
             return
@@ -20,14 +27,11 @@ class CSVFileHandler(FileSystemEventHandler):
         file_path = event.src_path
         filename = os.path.basename(file_path)
 
-        if filename.lower().endswith('.csv'):
-            self.logger.info(f"New CSV file detected: {filename}")
-
-            # Wait a moment to ensure file is completely written
-            time.sleep(2)
+        if self.processor.is_supported_file(filename):
+            self.logger.info(f"New file detected: {filename}")
 
-            # Process the file
-            self.processor.process_file(file_path, self.processed_folder)
+            # Queued straight away; the scheduler holds it until it has settled
+            self.process(file_path)
 
     def on_moved(self, event):
         if event.is_directory:
@@ -36,20 +40,19 @@ class CSVFileHandler(FileSystemEventHandler):
         dest_path = event.dest_path
         filename = os.path.basename(dest_path)
 
-        if filename.lower().endswith('.csv'):
-            self.logger.info(f"CSV file moved to watched folder: {filename}")
+        if self.processor.is_supported_file(filename):
+            self.logger.info(f"File moved to watched folder: {filename}")
 
-            # Wait a moment to ensure file is completely written
-            time.sleep(2)
-
-            # Process the file
-            self.processor.process_file(dest_path, self.processed_folder)
+            # Queued straight away; the scheduler holds it until it has settled
+            self.process(dest_path)
 
 
 class FolderWatcher:
     def __init__(self):
         self.config = Config()
         self.processor = FileProcessor()
+        self.retry_scheduler = RetryScheduler()
+        self.ingest_scheduler = IngestScheduler(self.retry_scheduler)
         self.logger = logging.getLogger(__name__)
         self.observers = []
 
@@ -59,6 +62,7 @@ class FolderWatcher:
             self.config.UNPROCESSED_FOLDER,
             self.config.UNDERPROCESSED_FOLDER,
             self.config.PROCESSED_FOLDER,
+            self.config.DEAD_LETTER_FOLDER,
             os.path.dirname(self.config.LOG_FILE)
         ]
 
@@ -68,30 +72,38 @@ class FolderWatcher:
                 self.logger.info(f"Created folder: {folder}")
 
     def process_existing_files(self):
-        """Process any existing files in watched folders"""
+        """Queue any existing files in watched folders"""
         self.logger.info("Processing existing files...")
 
-        # Process unprocessed folder
-        processed, failed = self.processor.process_folder(
-            self.config.UNPROCESSED_FOLDER,
-            self.config.PROCESSED_FOLDER
-        )
-        self.logger.info(f"Unprocessed folder: {processed} processed, {failed} failed")
+        # Files are processed by the ingest scheduler in priority order, not folder order
+        queued = self.ingest_scheduler.submit_folder(self.config.UNPROCESSED_FOLDER, self.config.PROCESSED_FOLDER)
+        self.logger.info(f"Unprocessed folder: {queued} files queued")
 
-        # Process underprocessed folder
-        processed, failed = self.processor.process_folder(
-            self.config.UNDERPROCESSED_FOLDER,
-            self.config.PROCESSED_FOLDER
-        )
-        self.logger.info(f"Underprocessed folder: {processed} processed, {failed} failed")
+        queued = self.ingest_scheduler.submit_folder(self.config.UNDERPROCESSED_FOLDER, self.config.PROCESSED_FOLDER)
+        self.logger.info(f"Underprocessed folder: {queued} files queued")
+
+    def retry_due_files(self):
+        """Queue failed files whose backoff has expired"""
+        for file_path in self.retry_scheduler.due_files():
+            if self.ingest_scheduler.submit(file_path, self.config.PROCESSED_FOLDER):
+                self.logger.info(f"Retrying {os.path.basename(file_path)}")
+
+    def create_observer(self):
+        """Native observer, or a polling one for shared network folders"""
+        if self.config.USE_POLLING_OBSERVER:
+            return PollingObserver(timeout=self.config.POLLING_INTERVAL_SECONDS)
+        return Observer()
 
     def start_watching(self):
         """Start watching folders for new files"""
         self.logger.info("Starting folder watcher...")
 
+        # Workers start on the files queued so far, highest priority first
+        self.ingest_scheduler.start()
+
         # Watch unprocessed folder
-        unprocessed_handler = CSVFileHandler(self.processor, self.config.PROCESSED_FOLDER)
-        unprocessed_observer = Observer()
+        unprocessed_handler = CSVFileHandler(self.processor, self.config.PROCESSED_FOLDER, self.ingest_scheduler)
+        unprocessed_observer = self.create_observer()
         unprocessed_observer.schedule(
             unprocessed_handler,
             self.config.UNPROCESSED_FOLDER,
@@ -101,8 +113,8 @@ class FolderWatcher:
         self.observers.append(unprocessed_observer)
 
         # Watch underprocessed folder
-        underprocessed_handler = CSVFileHandler(self.processor, self.config.PROCESSED_FOLDER)
-        underprocessed_observer = Observer()
+        underprocessed_handler = CSVFileHandler(self.processor, self.config.PROCESSED_FOLDER, self.ingest_scheduler)
+        underprocessed_observer = self.create_observer()
         underprocessed_observer.schedule(
             underprocessed_handler,
             self.config.UNDERPROCESSED_FOLDER,
@@ -122,4 +134,11 @@ class FolderWatcher:
             observer.join()
 
         self.observers.clear()
+
+        # Let workers finish the files they are on; each worker hands its claims back as it exits
+        self.ingest_scheduler.stop()
+
+        if self.processor.claims:
+            self.processor.claims.stop()
+
         self.logger.info("All folder watchers stopped")
\ No newline at end of file
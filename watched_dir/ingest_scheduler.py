@@ -0,0 +1,271 @@
+import os
+import time
+import logging
+import threading
+from .file_processor import FileProcessor
+from .config import Config
+
+# Lower runs first: master data, then the other full-dump tables, then facts
+TABLE_PRIORITY = {
+    'employee_master': 0,
+    'employee_exit_report': 1,
+    'employee_work_profile': 1,
+    'employee_experience_report': 1,
+    'daily_attendance': 2,
+    'timesheets': 2
+}
+
+# Fact tables wait while rows they refer to are still queued or loading
+TABLE_DEPENDENCIES = {
+    'daily_attendance': ('employee_master',),
+    'timesheets': ('employee_master',)
+}
+
+
+class IngestScheduler:
+    # Orders pending files by table priority, then smallest first, with aging so big files still
+    # get their turn; one worker is reserved for small files so they never queue behind a huge one
+
+    def __init__(self, retry_scheduler=None):
+        self.config = Config()
+        self.logger = logging.getLogger(__name__)
+        self.retry_scheduler = retry_scheduler
+        self.type_processor = FileProcessor()
+
+        self.aging_seconds = self.config.INGEST_AGING_SECONDS
+        self.settle_seconds = self.config.FILE_SETTLE_SECONDS
+        self.express_max_bytes = self.config.EXPRESS_LANE_MAX_MB * 1024 * 1024
+        self.coalesce_window = self.config.COALESCE_WINDOW_SECONDS
+        self.coalesce_max_files = self.config.COALESCE_MAX_FILES
+        self.coalesce_max_bytes = self.config.COALESCE_MAX_MB * 1024 * 1024
+
+        self.condition = threading.Condition()
+        self.pending = {}
+        self.in_flight = {}
+        self.stop_event = threading.Event()
+        self.workers = []
+
+    def start(self):
+        """Start the general workers and the express-lane worker"""
+        lanes = ['general'] * max(self.config.INGEST_WORKERS, 1) + ['express']
+        for index, lane in enumerate(lanes):
+            worker = threading.Thread(target=self._work, args=(lane,), name=f"ingest-{lane}-{index}", daemon=True)
+            worker.start()
+            self.workers.append(worker)
+        self.logger.info(f"Ingest scheduler started with {len(lanes) - 1} general workers and 1 express worker")
+
+    def stop(self):
+        """Stop taking new files; workers finish their file, or the current chunk of a chunked load"""
+        self.stop_event.set()
+        with self.condition:
+            self.condition.notify_all()
+        for worker in self.workers:
+            worker.join()
+        self.workers.clear()
+
+        if self.type_processor.claims:
+            self.type_processor.claims.stop()
+
+    def submit(self, file_path, processed_folder, delay=None):
+        """Queue a file to run once it has settled (or after delay seconds); files already queued or running are ignored"""
+        # Watcher events, folder scans and retries may name the same file differently
+        file_path = os.path.abspath(file_path)
+        file_type = self.type_processor.identify_file_type(os.path.basename(file_path))
+        table_name = self.type_processor.file_mappings[file_type]['table'] if file_type else None
+
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            return False
+
+        with self.condition:
+            if file_path in self.pending or file_path in self.in_flight:
+                return False
+
+            queued_at = time.time()
+            self.pending[file_path] = {
+                'path': file_path,
+                'processed_folder': processed_folder,
+                'table': table_name,
+                'priority': TABLE_PRIORITY.get(table_name, max(TABLE_PRIORITY.values())),
+                'size': size,
+                'queued_at': queued_at,
+                # Watcher events arrive as soon as a file appears, possibly before it is fully written
+                'not_before': queued_at + (self.settle_seconds if delay is None else delay)
+            }
+            self.condition.notify_all()
+
+        self.logger.info(f"Queued {os.path.basename(file_path)} ({size:,} bytes, {table_name or 'unknown type'}), "
+                         f"{len(self.pending)} pending")
+        return True
+
+    def submit_folder(self, folder_path, processed_folder):
+        """Queue every supported file in a folder that is not waiting on retry backoff"""
+        if not os.path.exists(folder_path):
+            self.logger.error(f"Folder does not exist: {folder_path}")
+            return 0
+
+        queued = 0
+        for filename in os.listdir(folder_path):
+            file_path = os.path.join(folder_path, filename)
+            if not self.type_processor.is_supported_file(filename):
+                continue
+            if self.retry_scheduler and not self.retry_scheduler.is_due(file_path):
+                self.logger.info(f"Skipping {filename}, waiting for retry backoff")
+                continue
+            if self.submit(file_path, processed_folder):
+                queued += 1
+        return queued
+
+    def _blocked(self, entry):
+        """Check if a file must wait for another file of its table, or for files of a table it depends on"""
+        if entry['table'] is None:
+            return False
+        # One load per table at a time: concurrent loads of overlapping keys can apply out of order or deadlock
+        if any(other['table'] == entry['table'] for other in self.in_flight.values()):
+            return True
+
+        dependencies = TABLE_DEPENDENCIES.get(entry['table'], ())
+        if not dependencies:
+            return False
+        return any(other['table'] in dependencies
+                   for other in list(self.pending.values()) + list(self.in_flight.values()))
+
+    def _sort_key(self, entry, now):
+        # Orders the next file of each table against the other tables; every aging period waited lifts a
+        # file one priority level, and ties go to the smaller, then older file
+        waited_levels = int((now - entry['queued_at']) / self.aging_seconds) if self.aging_seconds else 0
+        return entry['priority'] - waited_levels, entry['size'], entry['queued_at']
+
+    def _coalescible(self, entry):
+        """Check if a file may be merged with others for the same table into one load"""
+        # Full dumps are diffed against stored hashes one file at a time
+        return (self.coalesce_window > 0
+                and entry['table'] is not None
+                and entry['table'] not in self.type_processor.db_manager.hashed_tables
+                and entry['size'] <= self.coalesce_max_bytes)
+
+    def _siblings(self, entry, other):
+        """Check if two coalescible files can share one load"""
+        return (other is not entry
+                and other['table'] == entry['table']
+                and other['processed_folder'] == entry['processed_folder']
+                and self._coalescible(other))
+
+    def _gathering(self, entry, now):
+        """Check if a small file should keep waiting for the rest of its burst"""
+        if not self._coalescible(entry):
+            return False
+        waited = now - entry['queued_at']
+        if waited < self.coalesce_window:
+            return True
+        # Files of the same burst that are still settling may join, for at most one more settle period
+        return waited < self.coalesce_window + self.settle_seconds and any(
+            self._siblings(entry, other) and now < other['not_before'] for other in self.pending.values())
+
+    def _next(self, lane):
+        """Pick and claim the next runnable batch of files for a lane, or None"""
+        now = time.time()
+
+        def runnable(entry):
+            return (now >= entry['not_before']
+                    and not self._blocked(entry)
+                    and (lane != 'express' or entry['size'] <= self.express_max_bytes))
+
+        # Within a table files run strictly in arrival order, so an older dump never lands after a newer one
+        heads = {}
+        for entry in self.pending.values():
+            if now < entry['not_before']:
+                continue
+            key = entry['table'] or entry['path']
+            if key not in heads or entry['queued_at'] < heads[key]['queued_at']:
+                heads[key] = entry
+
+        # Small files sit out the coalescing window so files from the same burst can join them
+        candidates = [entry for entry in heads.values()
+                      if runnable(entry) and not self._gathering(entry, now)]
+        if not candidates:
+            return None
+
+        entry = min(candidates, key=lambda candidate: self._sort_key(candidate, now))
+        batch = [entry]
+        if self._coalescible(entry):
+            siblings = sorted((other for other in self.pending.values()
+                               if self._siblings(entry, other) and runnable(other)),
+                              key=lambda other: other['queued_at'])
+            batch += siblings[:self.coalesce_max_files - 1]
+
+        # Arrival order, so a later file's rows win over an earlier file's for the same key
+        batch.sort(key=lambda item: item['queued_at'])
+        for item in batch:
+            del self.pending[item['path']]
+            self.in_flight[item['path']] = item
+        return batch
+
+    def _work(self, lane):
+        # Each worker has its own FileProcessor, and so its own database connections
+        processor = FileProcessor()
+        # Shutdown reaches chunked loads through the processor's stop event
+        processor.stop_event = self.stop_event
+
+        try:
+            while not self.stop_event.is_set():
+                self._work_once(lane, processor)
+        finally:
+            # Release this worker's claims and stop its heartbeat and connection
+            if processor.claims:
+                processor.claims.stop()
+
+    def _work_once(self, lane, processor):
+        """Claim and process the next batch for a lane, waiting briefly if there is none"""
+        with self.condition:
+            batch = self._next(lane)
+            if batch is None:
+                self.condition.wait(timeout=1)
+                return
+
+        waited = time.time() - batch[0]['queued_at']
+        paths = [entry['path'] for entry in batch]
+        try:
+            if len(batch) == 1:
+                self.logger.info(f"[{lane}] Processing {os.path.basename(paths[0])} after {waited:.1f}s in queue")
+                results = {paths[0]: processor.process_file(paths[0], batch[0]['processed_folder'])}
+                errors = {paths[0]: processor.last_error}
+                transient = {paths[0]} if processor.last_error_transient else set()
+            else:
+                self.logger.info(f"[{lane}] Processing {len(batch)} coalesced {batch[0]['table']} files "
+                                 f"after {waited:.1f}s in queue")
+                results = processor.process_batch(paths, batch[0]['processed_folder'])
+                errors = processor.batch_errors
+                transient = processor.batch_transient
+        except Exception as e:
+            results = {path: False for path in paths}
+            errors = {path: str(e) for path in paths}
+            transient = set(paths) if processor.is_outage(e) else set()
+        finally:
+            with self.condition:
+                for path in paths:
+                    del self.in_flight[path]
+                # Dependent files may now be runnable
+                self.condition.notify_all()
+
+        for path in paths:
+            result = results.get(path)
+            if result is None:
+                if not self.stop_event.is_set():
+                    # Another node holds the claim; look again once its lease could have expired, in case it died
+                    self.submit(path, batch[0]['processed_folder'], delay=self.config.CLAIM_LEASE_SECONDS)
+            elif self.retry_scheduler:
+                if result:
+                    self.retry_scheduler.record_success(path)
+                else:
+                    self.retry_scheduler.record_failure(path, errors.get(path), path in transient)
+
+    def stats(self):
+        """Queue depth and in-flight files for monitoring"""
+        with self.condition:
+            return {
+                'pending': len(self.pending),
+                'pending_bytes': sum(entry['size'] for entry in self.pending.values()),
+                'in_flight': [os.path.basename(path) for path in self.in_flight]
+            }
@@ -62,6 +62,7 @@ def signal_handler(signum, frame):
     logger = logging.getLogger(__name__)
     logger.info("Shutdown signal received, stopping folder watcher...")
 
+    # Waits for in-flight files; chunked loads stop after their current chunk and checkpoint it
     if 'watcher' in globals():
         watcher.stop_watching()
 
@@ -101,9 +102,10 @@ def main():
 
         logger.info("Folder watcher is running. Press Ctrl+C to stop.")
 
-        # Keep the main thread alive
+        # Keep the main thread alive and retry failed files as their backoff expires
         while True:
             time.sleep(1)
+            watcher.retry_due_files()
 
     except KeyboardInterrupt:
         logger.info("Keyboard interrupt received")
@@ -0,0 +1,147 @@
+import os
+import json
+import time
+import shutil
+import logging
+import threading
+from datetime import datetime
+from .config import Config
+
+
+class RetryScheduler:
+    def __init__(self):
+        self.config = Config()
+        self.logger = logging.getLogger(__name__)
+        self.lock = threading.Lock()
+
+        # Per-file retry state, keyed by absolute file path
+        self.state = self._load_state()
+
+    def _load_state(self):
+        """Load persisted retry state so backoff survives restarts"""
+        if not os.path.exists(self.config.RETRY_STATE_FILE):
+            return {}
+
+        try:
+            with open(self.config.RETRY_STATE_FILE) as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.error(f"Could not load retry state, starting fresh: {str(e)}")
+            return {}
+
+    def _save_state(self):
+        """Persist retry state atomically"""
+        try:
+            state_dir = os.path.dirname(self.config.RETRY_STATE_FILE)
+            if state_dir and not os.path.exists(state_dir):
+                os.makedirs(state_dir)
+
+            temp_path = f"{self.config.RETRY_STATE_FILE}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(self.state, f, indent=2)
+            os.replace(temp_path, self.config.RETRY_STATE_FILE)
+        except Exception as e:
+            self.logger.error(f"Could not save retry state: {str(e)}")
+
+    def backoff_delay(self, attempts):
+        """Exponential backoff delay in seconds after the given number of failures"""
+        delay = self.config.RETRY_BASE_DELAY_SECONDS * (2 ** max(attempts - 1, 0))
+        return min(delay, self.config.RETRY_MAX_DELAY_SECONDS)
+
+    def is_due(self, file_path):
+        """Check whether a file may be processed now"""
+        with self.lock:
+            entry = self.state.get(os.path.abspath(file_path))
+            return entry is None or entry['next_attempt'] <= time.time()
+
+    def due_files(self):
+        """Return files waiting for a retry whose backoff has expired"""
+        now = time.time()
+        due = []
+
+        with self.lock:
+            for file_path in list(self.state.keys()):
+                if not os.path.exists(file_path):
+                    # File was removed or reprocessed elsewhere - forget it
+                    del self.state[file_path]
+                elif self.state[file_path]['next_attempt'] <= now:
+                    due.append(file_path)
+
+        return due
+
+    def record_success(self, file_path):
+        """Clear retry state for a file that was processed successfully"""
+        with self.lock:
+            if self.state.pop(os.path.abspath(file_path), None) is not None:
+                self._save_state()
+
+    def record_failure(self, file_path, error, transient=False):
+        """Record a failed attempt and schedule a retry or dead-letter the file"""
+        key = os.path.abspath(file_path)
+
+        with self.lock:
+            entry = self.state.setdefault(key, {'attempts': 0, 'errors': []})
+            if transient:
+                # A database outage says nothing about the file: back off, but never dead-letter for it
+                entry['outages'] = entry.get('outages', 0) + 1
+            else:
+                entry['attempts'] += 1
+            entry['errors'].append({
+                'time': datetime.now().isoformat(),
+                'error': error or 'Unknown error',
+                'transient': transient
+            })
+            # A long outage must not grow the state file without bound
+            entry['errors'] = entry['errors'][-20:]
+
+            if not transient and entry['attempts'] >= self.config.MAX_RETRY_ATTEMPTS:
+                del self.state[key]
+                self._save_state()
+                dead_letter = True
+            else:
+                delay = self.backoff_delay(entry['attempts'] + entry.get('outages', 0))
+                entry['next_attempt'] = time.time() + delay
+                self._save_state()
+                dead_letter = False
+
+        if dead_letter:
+            self.move_to_dead_letter(key, entry)
+        elif transient:
+            self.logger.warning(
+                f"Database unavailable while processing {os.path.basename(key)}, retrying in {delay}s "
+                f"(not counted towards the retry limit)"
+            )
+        else:
+            self.logger.warning(
+                f"Attempt {entry['attempts']}/{self.config.MAX_RETRY_ATTEMPTS} failed for "
+                f"{os.path.basename(key)}, retrying in {delay}s"
+            )
+
+    def move_to_dead_letter(self, file_path, entry):
+        """Move a file to the dead-letter folder with an error sidecar"""
+        filename = os.path.basename(file_path)
+
+        try:
+            if not os.path.exists(self.config.DEAD_LETTER_FOLDER):
+                os.makedirs(self.config.DEAD_LETTER_FOLDER)
+
+            # Timestamped so an earlier dead-lettered file of the same name and its sidecar are kept
+            stem, dot, extension = filename.partition('.')
+            dead_letter_name = f"{stem}_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}{dot}{extension}"
+            dead_letter_path = os.path.join(self.config.DEAD_LETTER_FOLDER, dead_letter_name)
+            if os.path.exists(file_path):
+                shutil.move(file_path, dead_letter_path)
+
+            sidecar_path = f"{dead_letter_path}.error.json"
+            with open(sidecar_path, 'w') as f:
+                json.dump({
+                    'file': filename,
+                    'original_path': file_path,
+                    'attempts': entry['attempts'],
+                    'dead_lettered_at': datetime.now().isoformat(),
+                    'errors': entry['errors']
+                }, f, indent=2)
+
+            self.logger.error(f"Moved {filename} to dead-letter folder after {entry['attempts']} failed attempts")
+        except Exception as e:
+            self.logger.error(f"Failed to dead-letter file {filename}: {str(e)}")
@@ -0,0 +1,215 @@
+# Single definition of every ingested table. The Postgres DDL, the pandas and Arrow parse types,
+# the bulk-load column order and the DuckDB dashboard types are all generated from it.
+
+# Parse and load types per column kind: (pandas dtype, Arrow type, DuckDB type)
+KIND_TYPES = {
+    'text': (object, 'string', 'VARCHAR'),
+    # Few distinct values repeated on every row; pandas stores each value once
+    'category': ('category', 'string', 'VARCHAR'),
+    # pandas reads dates as text and converts them with process_dates; init_db falls back to
+    # inferred types if an export's dates are not ISO
+    'date': (object, 'date32', 'DATE'),
+    # Clock times vary in format between exports ('09:05:00', '9:05 AM'), so they stay text
+    # until Postgres parses them, and the dashboard only displays them
+    'time': (object, 'string', 'VARCHAR'),
+    'number': ('float64', 'float64', 'DOUBLE')
+}
+
+# Per table: the watcher file type, load columns as (name, Postgres type, kind), the conflict key,
+# the monthly partition key (if any) and whether rows carry a content hash
+TABLES = {
+    'employee_exit_report': {
+        'file_type': 'employee_exit_report',
+        'columns': [
+            ('employee_code', 'VARCHAR(50) NOT NULL', 'text'),
+            ('employee_name', 'VARCHAR(255)', 'text'),
+            ('business_unit', 'VARCHAR(255)', 'category'),
+            ('designation', 'VARCHAR(255)', 'category'),
+            ('date_of_joining', 'DATE', 'date'),
+            ('exit_date', 'DATE', 'date'),
+            ('expected_resignation_date', 'DATE', 'date')
+        ],
+        'conflict_columns': ['employee_code'],
+        'partition_key': None,
+        'row_hash': False
+    },
+    'employee_master': {
+        'file_type': 'employee_master',
+        'columns': [
+            ('employee_code', 'VARCHAR(50) NOT NULL', 'text'),
+            ('employee_name', 'VARCHAR(255)', 'text'),
+            ('email', 'VARCHAR(255)', 'text'),
+            ('additional_email', 'VARCHAR(255)', 'text'),
+            ('mobile_number', 'VARCHAR(20)', 'text'),
+            ('secondary_mobile_number', 'VARCHAR(20)', 'text'),
+            ('gender', 'VARCHAR(10)', 'category'),
+            ('date_of_joining', 'DATE', 'date'),
+            ('date_of_birth', 'DATE', 'date'),
+            ('fax', 'VARCHAR(50)', 'text'),
+            ('marital_status', 'VARCHAR(50)', 'category'),
+            ('self_service', 'VARCHAR(10)', 'category'),
+            ('employee_type', 'VARCHAR(100)', 'category'),
+            ('office_location', 'VARCHAR(255)', 'category'),
+            ('business_unit', 'VARCHAR(255)', 'category'),
+            ('designation', 'VARCHAR(255)', 'category'),
+            ('department', 'VARCHAR(255)', 'category'),
+            ('grade', 'VARCHAR(50)', 'category'),
+            ('parent_department', 'VARCHAR(255)', 'category'),
+            ('primary_manager', 'VARCHAR(255)', 'text'),
+            ('primary_manager_email', 'VARCHAR(255)', 'text'),
+            ('bank_name', 'VARCHAR(255)', 'category'),
+            ('branch_name', 'VARCHAR(255)', 'text'),
+            ('account_holder_name', 'VARCHAR(255)', 'text'),
+            ('account_number', 'VARCHAR(100)', 'text'),
+            ('account_type', 'VARCHAR(50)', 'category'),
+            ('ifsc_code', 'VARCHAR(20)', 'text'),
+            ('swift_code', 'VARCHAR(20)', 'text'),
+            ('pan_number', 'VARCHAR(20)', 'text'),
+            ('aadhaar_enrollment_number', 'VARCHAR(50)', 'text'),
+            ('aadhaar_number', 'VARCHAR(20)', 'text'),
+            ('present_address', 'TEXT', 'text'),
+            ('present_state', 'VARCHAR(100)', 'category'),
+            ('present_city', 'VARCHAR(100)', 'category'),
+            ('present_pincode', 'VARCHAR(10)', 'text'),
+            ('present_country', 'VARCHAR(100)', 'category'),
+            ('permanent_address', 'TEXT', 'text'),
+            ('permanent_state', 'VARCHAR(100)', 'category'),
+            ('permanent_city', 'VARCHAR(100)', 'category'),
+            ('permanent_pincode', 'VARCHAR(10)', 'text'),
+            ('permanent_country', 'VARCHAR(100)', 'category'),
+            ('status', 'VARCHAR(50)', 'category')
+        ],
+        'conflict_columns': ['employee_code'],
+        'partition_key': None,
+        'row_hash': True
+    },
+    'employee_work_profile': {
+        'file_type': 'employee_work_profile',
+        'columns': [
+            ('employee_code', 'VARCHAR(50) NOT NULL', 'text'),
+            ('employee_name', 'VARCHAR(255)', 'text'),
+            ('business_unit', 'VARCHAR(255)', 'category'),
+            ('parent_designation', 'VARCHAR(255)', 'category'),
+            ('assigned_department', 'VARCHAR(255)', 'category'),
+            ('designation', 'VARCHAR(255)', 'category'),
+            ('office_location_name', 'VARCHAR(255)', 'category')
+        ],
+        'conflict_columns': ['employee_code'],
+        'partition_key': None,
+        'row_hash': True
+    },
+    'employee_experience_report': {
+        'file_type': 'experience_report',
+        'columns': [
+            ('employee_code', 'VARCHAR(50) NOT NULL', 'text'),
+            ('employee_name', 'VARCHAR(255)', 'text'),
+            ('business_unit', 'VARCHAR(255)', 'category'),
+            ('department', 'VARCHAR(255)', 'category'),
+            ('designation', 'VARCHAR(255)', 'category'),
+            ('date_of_joining', 'DATE', 'date'),
+            # Exports give years as decimals; Postgres keeps them as text, the dashboard compares them as numbers
+            ('current_experience', 'VARCHAR(50)', 'number'),
+            ('past_experience', 'VARCHAR(50)', 'number'),
+            ('total_experience', 'VARCHAR(50)', 'number')
+        ],
+        'conflict_columns': ['employee_code'],
+        'partition_key': None,
+        'row_hash': True
+    },
+    'timesheets': {
+        'file_type': 'timesheet_report',
+        'columns': [
+            ('date', 'DATE NOT NULL', 'date'),
+            ('employee_code', 'VARCHAR(50) NOT NULL', 'text'),
+            ('project_id', 'VARCHAR(50) NOT NULL', 'category'),
+            ('project_name', 'VARCHAR(255)', 'category'),
+            ('hours_worked', 'DECIMAL(5,2)', 'number')
+        ],
+        'conflict_columns': ['date', 'employee_code', 'project_id'],
+        'partition_key': 'date',
+        'row_hash': False
+    },
+    'daily_attendance': {
+        'file_type': 'attendance_report_dailycopy',
+        'columns': [
+            ('date', 'DATE NOT NULL', 'date'),
+            ('employee_code', 'VARCHAR(50) NOT NULL', 'text'),
+            ('employee_name', 'VARCHAR(255)', 'text'),
+            ('clock_in_time', 'TIME', 'time'),
+            ('clock_out_time', 'TIME', 'time'),
+            ('total_hours', 'DECIMAL(5,2)', 'number')
+        ],
+        'conflict_columns': ['date', 'employee_code'],
+        'partition_key': 'date',
+        'row_hash': False
+    }
+}
+
+
+def clean_column_name(column):
+    """Clean a source header to match database schema"""
+    return column.lower().replace(' ', '_').replace('-', '_')
+
+
+def load_columns(table_name):
+    """Column names of a table in bulk-load order"""
+    return [name for name, _, _ in TABLES[table_name]['columns']]
+
+
+def column_kinds(table_name):
+    """Map each load column of a table to its kind"""
+    return {name: kind for name, _, kind in TABLES[table_name]['columns']}
+
+
+def date_columns(table_name):
+    """Load columns of a table that hold dates"""
+    return [name for name, _, kind in TABLES[table_name]['columns'] if kind == 'date']
+
+
+def create_table_sql(table_name):
+    """Generate the CREATE TABLE statement for a table"""
+    spec = TABLES[table_name]
+    partition_key = spec['partition_key']
+
+    # A partitioned table's primary key has to include its partition key
+    lines = ['id SERIAL' if partition_key else 'id SERIAL PRIMARY KEY']
+    lines += [f"{name} {pg_type}" for name, pg_type, _ in spec['columns']]
+    if spec['row_hash']:
+        lines.append('row_hash BIGINT')
+    lines += ['created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP',
+              'updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP']
+    if partition_key:
+        lines.append(f"PRIMARY KEY (id, {partition_key})")
+    lines.append(f"UNIQUE({', '.join(spec['conflict_columns'])})")
+
+    body = ',\n    '.join(lines)
+    partition_clause = f" PARTITION BY RANGE ({partition_key})" if partition_key else ''
+    return f"CREATE TABLE IF NOT EXISTS {table_name} (\n    {body}\n){partition_clause}"
+
+
+def source_columns(table_name, headers):
+    """Map the source headers of a file to the load columns they feed; other headers are left out"""
+    kinds = column_kinds(table_name)
+    return {header: clean_column_name(header) for header in headers if clean_column_name(header) in kinds}
+
+
+def pandas_dtypes(table_name, headers):
+    """read_csv dtypes for the mapped source headers of a file"""
+    kinds = column_kinds(table_name)
+    return {header: KIND_TYPES[kinds[column]][0] for header, column in source_columns(table_name, headers).items()}
+
+
+def arrow_types(table_name, headers):
+    """Arrow CSV column types for the mapped source headers of a file"""
+    import pyarrow as pa
+
+    kinds = column_kinds(table_name)
+    return {header: getattr(pa, KIND_TYPES[kinds[column]][1])()
+            for header, column in source_columns(table_name, headers).items()}
+
+
+def duckdb_types(table_name, headers):
+    """DuckDB types for every source header of a file; headers outside the schema load as VARCHAR"""
+    kinds = column_kinds(table_name)
+    return {header: KIND_TYPES[kinds[clean_column_name(header)]][2] if clean_column_name(header) in kinds
+            else 'VARCHAR' for header in headers}
@@ -0,0 +1,164 @@
+import logging
+import pandas as pd
+from .config import Config
+
+# Clock time formats seen in attendance exports, tried in order
+TIME_FORMATS = ('%H:%M:%S', '%H:%M', '%H:%M:%S.%f', '%I:%M %p', '%I:%M:%S %p', '%I:%M%p', '%I:%M:%S%p',
+                '%Y-%m-%d %H:%M:%S')
+
+
+class RowValidator:
+    # Rejects bad rows with vectorised column rules before they reach the database
+
+    def __init__(self, db_manager):
+        self.config = Config()
+        self.db_manager = db_manager
+        self.logger = logging.getLogger(__name__)
+
+        # Known employee codes, extended incrementally from employee_master.updated_at
+        self.employee_codes = set()
+        self.codes_loaded_through = None
+
+        # Per-table rules: (error message, columns used, function returning a boolean "invalid" mask)
+        self.table_rules = {
+            'timesheets': [
+                ("hours_worked outside 0-24", ['hours_worked'],
+                 lambda df: self.out_of_range(df['hours_worked'], 0, 24))
+            ],
+            'daily_attendance': [
+                ("total_hours outside 0-24", ['total_hours'],
+                 lambda df: self.out_of_range(df['total_hours'], 0, 24)),
+                ("unparseable clock_in_time or clock_out_time", ['clock_in_time', 'clock_out_time'],
+                 lambda df: self.unparseable_time(df['clock_in_time']) | self.unparseable_time(df['clock_out_time'])),
+                ("clock_out_time before clock_in_time", ['clock_in_time', 'clock_out_time'],
+                 lambda df: self.as_time(df['clock_out_time']) < self.as_time(df['clock_in_time']))
+            ]
+        }
+
+        # Fact tables whose employee_code must exist in employee_master
+        self.referencing_tables = ('timesheets', 'daily_attendance')
+
+    def out_of_range(self, series, low, high):
+        """Mask of values that are present but outside [low, high]"""
+        values = pd.to_numeric(series, errors='coerce')
+        return (values < low) | (values > high)
+
+    def as_time(self, series):
+        """Parse clock times (time objects, 24-hour or AM/PM strings) into time since midnight; unparseable become NaT"""
+        text = series.astype('string').str.strip().str.upper()
+        parsed = pd.Series(pd.NaT, index=series.index, dtype='datetime64[ns]')
+        for time_format in TIME_FORMATS:
+            missing = parsed.isna() & text.notna()
+            if not missing.any():
+                break
+            parsed[missing] = pd.to_datetime(text[missing], format=time_format, errors='coerce')
+        return parsed - parsed.dt.normalize()
+
+    def unparseable_time(self, series):
+        """Mask of clock times that are present but in no known format"""
+        return series.notna() & self.as_time(series).isna()
+
+    def refresh_employee_codes(self):
+        """Add employee codes created or updated since the last refresh"""
+        if not self.db_manager.table_exists('employee_master'):
+            return
+
+        if self.codes_loaded_through is None:
+            rows = self.db_manager.execute_query("SELECT employee_code, updated_at FROM employee_master")
+        else:
+            rows = self.db_manager.execute_query(
+                "SELECT employee_code, updated_at FROM employee_master WHERE updated_at > %s",
+                (self.codes_loaded_through,)
+            )
+
+        for row in rows:
+            self.employee_codes.add(row['employee_code'])
+            if row['updated_at'] and (self.codes_loaded_through is None
+                                      or row['updated_at'] > self.codes_loaded_through):
+                self.codes_loaded_through = row['updated_at']
+
+        if rows:
+            self.logger.info(f"Employee code cache refreshed: {len(rows)} new or updated, "
+                             f"{len(self.employee_codes)} known")
+
+    def lookup_employee_codes(self, codes):
+        """Add any of the given codes that exist in employee_master but were missed by the incremental refresh"""
+        # A master transaction that commits after a refresh can carry an updated_at older than the watermark
+        rows = self.db_manager.execute_query(
+            "SELECT employee_code FROM employee_master WHERE employee_code = ANY(%s)",
+            (list(codes),)
+        )
+        self.employee_codes.update(row['employee_code'] for row in rows)
+
+    def check_frame(self, df, mapping):
+        """Return (keep mask, per-row error or None) for a DataFrame of the rule columns"""
+        errors = pd.Series(None, index=df.index, dtype=object)
+
+        def flag(mask, message):
+            mask = mask.fillna(False).astype(bool) & errors.isna()
+            errors[mask] = message
+
+        conflict_columns = mapping['conflict_columns']
+        flag(df[conflict_columns].isna().any(axis=1), f"missing {' / '.join(conflict_columns)}")
+
+        for message, columns, rule in self.table_rules.get(mapping['table'], []):
+            if all(col in df.columns for col in columns):
+                flag(rule(df), message)
+
+        if mapping['table'] in self.referencing_tables and self.config.VALIDATE_EMPLOYEE_CODES:
+            self.refresh_employee_codes()
+            if self.employee_codes:
+                unknown = ~df['employee_code'].isin(self.employee_codes) & df['employee_code'].notna()
+                if unknown.any():
+                    self.lookup_employee_codes(df.loc[unknown, 'employee_code'].unique().tolist())
+                    unknown = ~df['employee_code'].isin(self.employee_codes) & df['employee_code'].notna()
+                flag(unknown, "employee_code not in employee_master")
+            else:
+                self.logger.warning("employee_master is empty, skipping employee code check")
+
+        valid = errors.isna()
+
+        # The last occurrence of a conflict key wins, as it would under ON CONFLICT
+        superseded = df.loc[valid, conflict_columns].duplicated(keep='last').reindex(df.index, fill_value=False)
+        keep = valid & ~superseded
+        return keep.to_numpy(), errors
+
+    def validate(self, data, mapping, source_file=None):
+        """Drop invalid rows and in-file duplicate keys, recording rejects; returns the rows to load"""
+        is_frame = isinstance(data, pd.DataFrame)
+        rule_columns = set(mapping['conflict_columns']) | {'employee_code'}
+        for _, columns, _ in self.table_rules.get(mapping['table'], []):
+            rule_columns.update(columns)
+
+        present = data.columns if is_frame else data.column_names
+        selected = [col for col in present if col in rule_columns]
+        frame = data[selected].reset_index(drop=True) if is_frame else data.select(selected).to_pandas()
+
+        keep, errors = self.check_frame(frame, mapping)
+        rejected = errors.notna().to_numpy()
+        duplicate_count = int((~keep & ~rejected).sum())
+
+        if rejected.any():
+            if is_frame:
+                bad_rows = data[rejected]
+                rejects = list(zip(bad_rows.itertuples(index=False, name=None), errors[rejected]))
+                columns = list(data.columns)
+            else:
+                import pyarrow as pa
+
+                bad_rows = data.filter(pa.array(rejected))
+                rejects = list(zip(zip(*[bad_rows[col].to_pylist() for col in bad_rows.column_names]),
+                                   errors[rejected]))
+                columns = data.column_names
+            self.db_manager.record_rejects(mapping['table'], columns, rejects, source_file)
+
+        if duplicate_count:
+            self.logger.info(f"{source_file}: dropped {duplicate_count} rows superseded by a later duplicate key")
+
+        if keep.all():
+            return data
+        if is_frame:
+            return data[keep]
+
+        import pyarrow as pa
+        return data.filter(pa.array(keep))